@@ -0,0 +1,315 @@
+"""Benchmarks for the todo.txt parse, filter, sort, view, projection and write paths.
+
+Run from the repository root with pytodotxt installed. Like the tests, this
+mocks the Home Assistant modules when they are not installed:
+
+    python -m benchmarks.bench
+    python -m benchmarks.bench --sizes 1000 10000 --repeat 50 --json > bench_output.txt
+
+Every stage is timed on its own, on a synthetic file generated from a fixed
+seed, and reported as latency percentiles plus the peak memory allocated
+while running it once under tracemalloc. The memory held by a loaded store
+(cold and from the parse cache) is reported next to a plain pytodotxt parse.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+try:
+    import homeassistant  # noqa: F401
+except ImportError:
+    class _TodoListEntity:
+        pass
+
+    class _TodoItem:
+        def __init__(self, **kwargs):
+            self.__dict__.update(kwargs)
+
+    _todo = MagicMock(TodoListEntity=_TodoListEntity, TodoItem=_TodoItem)
+    for _name in (
+        "homeassistant", "homeassistant.components", "homeassistant.config_entries",
+        "homeassistant.const", "homeassistant.exceptions", "homeassistant.helpers",
+        "homeassistant.helpers.entity_platform", "homeassistant.helpers.event", "homeassistant.helpers.storage",
+    ):
+        sys.modules[_name] = MagicMock()
+    sys.modules["homeassistant.components.todo"] = _todo
+    sys.modules["homeassistant.core"] = MagicMock(callback=lambda func: func)
+    # Due dates are compared with the local date
+    sys.modules["homeassistant.util"] = MagicMock(dt=MagicMock(now=datetime.datetime.now))
+
+try:
+    import voluptuous  # noqa: F401
+except ImportError:
+    sys.modules["voluptuous"] = MagicMock()
+
+import pytodotxt
+
+sys.path.insert(0, os.getcwd())
+from custom_components.todo_txt.cache import ParseCache
+from custom_components.todo_txt.filters import TaskFilter
+from custom_components.todo_txt.model import LazyTask
+from custom_components.todo_txt.store import TodoTxtFileStore
+from custom_components.todo_txt.todo import TodoTxtListEntity
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_FILTER = "+project3 -@errands"
+
+PROJECTS = [f"+project{i}" for i in range(20)]
+CONTEXTS = ["@home", "@work", "@phone", "@computer", "@errands", "@garden", "@car", "@kids"]
+WORDS = (
+    "buy call email fix plan book pay clean review update water order check "
+    "write read send schedule replace renew cancel pick sort milk bills report "
+    "tickets dentist filter tyres invoice taxes garage paint lamp"
+).split()
+
+
+def generate_lines(count: int, seed: int = 0, today: datetime.date | None = None) -> list[str]:
+    """A reproducible todo.txt with a realistic mix of tasks.
+
+    About a third is completed; open tasks get a priority 40% of the time and a
+    due date 35% of the time. Projects follow a skewed distribution so some
+    filters match many tasks and others few.
+    """
+    rng = random.Random(seed)
+    today = today or datetime.date(2026, 1, 1)
+    project_weights = [1 / (rank + 1) for rank in range(len(PROJECTS))]
+    lines = []
+    for _ in range(count):
+        parts = []
+        created = today - datetime.timedelta(days=rng.randint(0, 720))
+        if rng.random() < 0.33:
+            done = created + datetime.timedelta(days=rng.randint(0, 60))
+            parts += ["x", done.isoformat()]
+        elif rng.random() < 0.4:
+            parts.append(f"({rng.choice('ABCD')})")
+        if rng.random() < 0.8 or parts[:1] == ["x"]:
+            parts.append(created.isoformat())
+        parts += rng.sample(WORDS, rng.randint(2, 6))
+        if rng.random() < 0.7:
+            parts.append(rng.choices(PROJECTS, project_weights)[0])
+        if rng.random() < 0.6:
+            parts.append(rng.choice(CONTEXTS))
+        if rng.random() < 0.35:
+            due = today + datetime.timedelta(days=rng.randint(-60, 120))
+            parts.append(f"due:{due.isoformat()}")
+        if rng.random() < 0.02:
+            parts.append(f"id:t{rng.getrandbits(32):08x}")
+        lines.append(" ".join(parts))
+    return lines
+
+
+def write_file(path: str, lines: list[str]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(stage, repeat: int) -> dict:
+    """Time stage() repeat times and trace its peak allocation once.
+
+    stage may return a callable, which is run untimed before the next
+    iteration to restore whatever the stage changed.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        reset = stage()
+        samples.append((time.perf_counter() - start) * 1000)
+        if callable(reset):
+            reset()
+
+    tracemalloc.start()
+    try:
+        reset = stage()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if callable(reset):
+        reset()
+
+    return {
+        "p50_ms": statistics.median(samples),
+        "p90_ms": percentile(samples, 0.9),
+        "p99_ms": percentile(samples, 0.99),
+        "max_ms": max(samples),
+        "peak_kib": peak / 1024,
+    }
+
+
+def retained(load) -> float:
+    """KiB still allocated for what load() returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = load()
+        gc.collect()
+        current, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return current / 1024
+
+
+def make_entity(store: TodoTxtFileStore, filter_tag: str) -> TodoTxtListEntity:
+    entity = TodoTxtListEntity("Bench", store.file_path, "bench", filter_tag, store)
+    entity._refresh_view()
+    return entity
+
+
+def bench_size(directory: str, count: int, repeat: int, seed: int, filter_tag: str) -> dict:
+    path = os.path.join(directory, f"todo-{count}.txt")
+    lines = generate_lines(count, seed)
+    write_file(path, lines)
+    results = {}
+
+    # Parsing: a cold load of the whole file, and picking up one external append
+    results["parse_full"] = measure(lambda: TodoTxtFileStore(path).read(), repeat)
+
+    store = TodoTxtFileStore(path)
+    store.read()
+
+    # The same file loaded from the parse cache, as after a restart
+    cache = ParseCache(os.path.join(directory, f"cache-{count}"))
+    store.cache = cache
+    store._save_cache(list(store.tasks), [store.info(task) for task in store.tasks])
+
+    def parse_cached():
+        cached = TodoTxtFileStore(path)
+        cached.cache = cache
+        cached.read()
+        assert cached.restored_from_cache
+    results["parse_cached"] = measure(parse_cached, repeat)
+
+    def load_store(use_cache: bool) -> TodoTxtFileStore:
+        loaded = TodoTxtFileStore(path)
+        loaded.cache = cache if use_cache else None
+        loaded.read()
+        return loaded
+
+    def load_pytodotxt() -> pytodotxt.TodoTxt:
+        todotxt = pytodotxt.TodoTxt(path)
+        todotxt.parse()
+        return todotxt
+    results["memory"] = {
+        "store_kib": retained(lambda: load_store(False)),
+        "cached_kib": retained(lambda: load_store(True)),
+        "pytodotxt_kib": retained(load_pytodotxt),
+    }
+    store = TodoTxtFileStore(path)
+    store.read()
+
+    def parse_append():
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("(B) benchmark external append +project1 @home\n")
+        store.read()
+    results["parse_append"] = measure(parse_append, repeat)
+    write_file(path, lines)
+    store = TodoTxtFileStore(path)
+    store.read()
+
+    # Filtering and sorting against the shared index, as an entity refresh does
+    task_filter = TaskFilter(filter_tag)
+    results["filter"] = measure(lambda: task_filter.select(store.index, store.info), repeat)
+
+    matching = task_filter.select(store.index, store.info)
+    filtered = [task for task in store.tasks if task in matching]
+    info = store.info
+    results["sort"] = measure(lambda: sorted(filtered, key=lambda task: info(task).sort_key), repeat)
+
+    entity = make_entity(store, filter_tag)
+
+    def refresh_view():
+        entity._journal_position = None
+        entity._refresh_view()
+    results["view"] = measure(refresh_view, repeat)
+
+    # One checkbox tick: a single task changes and the view catches up
+    ticked = sorted(matching, key=lambda task: info(task).sort_key)[0] if matching else store.tasks[0]
+
+    def view_update():
+        current = store.get_task(uid)
+        line = str(current)
+        store.replace_task(current, LazyTask(line[2:] if line.startswith("x ") else "x " + line))
+        entity._refresh_view()
+    uid = info(ticked).uid
+    results["view_update"] = measure(view_update, repeat)
+
+    # Projection: building every TodoItem from scratch, as after a restart
+    def project():
+        entity._item_cache = {}
+        entity._items_version = -1
+        return entity.todo_items
+    results["projection"] = measure(project, repeat)
+
+    # Writes: an append, a same-length edit in place and a delete (full rewrite)
+    def write_append():
+        task = LazyTask("(C) benchmark append +project2 @work")
+        store.append_task(task)
+        store.write()
+        return lambda: (store.remove_tasks([task]), store.write())
+    results["write_append"] = measure(write_append, repeat)
+
+    target = store.tasks[len(store.tasks) // 2]
+    original = str(target)
+    swapped = original.swapcase()
+
+    def write_edit():
+        current = store.tasks[target_position[0]]
+        store.replace_task(current, LazyTask(swapped if str(current) == original else original))
+        store.write()
+    target_position = [store.tasks.index(target)]
+    results["write_edit"] = measure(write_edit, repeat)
+
+    def write_delete():
+        task = store.tasks[len(store.tasks) // 3]
+        store.remove_tasks([task])
+        store.write()
+        return lambda: (store.append_task(LazyTask(str(task))), store.write())
+    results["write_delete"] = measure(write_delete, repeat)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--filter", default=DEFAULT_FILTER, help="filter used for the filter/view stages")
+    parser.add_argument("--json", action="store_true", help="one JSON object per stage, for diffing runs")
+    args = parser.parse_args()
+
+    if not args.json:
+        print(f"{'lines':>7} {'stage':<13} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'peak KiB':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.sizes:
+            for stage, result in bench_size(directory, count, args.repeat, args.seed, args.filter).items():
+                if args.json:
+                    print(json.dumps({"lines": count, "stage": stage, **result}))
+                elif stage == "memory":
+                    print(
+                        f"{count:>7} {stage:<13} store {result['store_kib']:.0f} KiB,"
+                        f" from cache {result['cached_kib']:.0f} KiB, pytodotxt {result['pytodotxt_kib']:.0f} KiB"
+                    )
+                else:
+                    print(
+                        f"{count:>7} {stage:<13} {result['p50_ms']:>9.3f} {result['p90_ms']:>9.3f}"
+                        f" {result['p99_ms']:>9.3f} {result['max_ms']:>9.3f} {result['peak_kib']:>10.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
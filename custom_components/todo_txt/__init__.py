@@ -1,8 +1,10 @@
+import os
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from .const import DOMAIN
+from .const import DATA_ENTITIES, DATA_WORKERS, DOMAIN
 
-PLATFORMS = ["todo"]
+PLATFORMS = ["todo", "sensor"]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
@@ -19,8 +21,39 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].get(DATA_ENTITIES, {}).pop(entry.entry_id, None)
     return True
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
+    await hass.config_entries.async_reload(entry.entry_id)
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the list's snapshot, and the cache and worker of files no other list reads."""
+    # Imported here so that loading the package does not pull in the todo platform
+    from .aggregate import resolve_paths
+    from .cache import ParseCache
+    from .snapshot import snapshot_store
+    from .store import cache_path
+
+    await snapshot_store(hass, entry.entry_id).async_remove()
+
+    others = [other.data for other in hass.config_entries.async_entries(DOMAIN) if other.entry_id != entry.entry_id]
+
+    def _unused_files() -> set[str]:
+        def files(data) -> set[str]:
+            paths = [data["file_path"], *resolve_paths(data.get("extra_files"), data["file_path"])]
+            return {os.path.realpath(path) for path in paths}
+
+        return files(entry.data) - set().union(*(files(data) for data in others))
+
+    workers = hass.data.get(DOMAIN, {}).get(DATA_WORKERS, {})
+    for key in await hass.async_add_executor_job(_unused_files):
+        cache = ParseCache(cache_path(hass, key))
+        worker = workers.pop(key, None)
+        if worker is None:
+            await hass.async_add_executor_job(cache.remove)
+            continue
+        # Queued behind the cache save of the unloaded list, so it is not written back
+        await worker.async_run(cache.remove)
+        worker.shutdown()
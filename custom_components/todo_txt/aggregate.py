@@ -0,0 +1,236 @@
+"""One list over several todo.txt files.
+
+An AggregateStore stands in for a TodoTxtFileStore in TodoTxtListEntity: it
+reads from the shared stores of all its files and routes every edit back to
+the store of the file the task came from. New tasks go to the first (primary)
+file. Each file keeps its own parse, watcher, journal and write queue, so a
+change to one file costs what it costs on its own list.
+"""
+import asyncio
+import glob
+import hashlib
+import os
+import re
+from typing import Callable
+
+from pytodotxt import Task
+
+from .archive import ARCHIVE_FILENAME
+from .model import TaskInfo
+
+_SEPARATOR_RE = re.compile(r'[,\n]')
+
+
+def split_paths(spec: str | None) -> list[str]:
+    """The paths or globs of a comma or newline separated option."""
+    return [part.strip() for part in _SEPARATOR_RE.split(spec or "") if part.strip()]
+
+
+def resolve_paths(spec: str | None, primary: str) -> list[str]:
+    """Expand the extra files option into file paths, without primary or duplicates.
+
+    Globs only match files that exist now, and never the done.txt archives
+    next to them; plain paths are kept as given. Does I/O, so it runs in the
+    executor.
+    """
+    seen = {os.path.realpath(primary)}
+    paths = []
+    for part in split_paths(spec):
+        part = os.path.expanduser(part)
+        if glob.has_magic(part):
+            matches = sorted(
+                path for path in glob.glob(part)
+                if os.path.isfile(path) and os.path.basename(path) != ARCHIVE_FILENAME
+            )
+        else:
+            matches = [part]
+        for path in matches:
+            key = os.path.realpath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+class CombinedIndex:
+    """The token indexes of several stores, read as one."""
+
+    def __init__(self, indexes) -> None:
+        self._indexes = indexes
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self._indexes)
+
+    def tasks_with(self, token: str) -> set[Task]:
+        return set().union(*(index.tasks_with(token) for index in self._indexes))
+
+    def indexed_tasks(self) -> set[Task]:
+        return set().union(*(index.indexed_tasks() for index in self._indexes))
+
+
+class AggregateStore:
+    """The shared stores of several files, merged for one list."""
+
+    def __init__(self, stores: list) -> None:
+        # stores[0] is the primary file; its uids are used as they are, so
+        # adding files to a list does not change the uids of its items
+        self.stores = stores
+        self._prefixes = {
+            store: hashlib.blake2b(os.path.realpath(store.file_path).encode(), digest_size=3).hexdigest()
+            for store in stores[1:]
+        }
+        self._by_prefix = {prefix: store for store, prefix in self._prefixes.items()}
+        # Stores edited since the last save, and the store of each task edited
+        # away (recur is called with the task as it was before completion)
+        self._touched: list = []
+        self._origin: dict[Task, object] = {}
+
+    @property
+    def primary(self):
+        return self.stores[0]
+
+    @property
+    def loaded(self) -> bool:
+        return all(store.loaded for store in self.stores)
+
+    @property
+    def index(self) -> CombinedIndex:
+        return CombinedIndex([store.index for store in self.stores])
+
+    @property
+    def tasks(self) -> list[Task]:
+        return [task for store in self.stores for task in store.tasks]
+
+    def _owner(self, task: Task):
+        """The store whose file task is in, else None."""
+        for store in self.stores:
+            if store.tracked_info(task) is not None:
+                return store
+        return self._origin.get(task)
+
+    def _touch(self, store) -> None:
+        if store not in self._touched:
+            self._touched.append(store)
+
+    def info(self, task: Task) -> TaskInfo:
+        return (self._owner(task) or self.primary).info(task)
+
+    def tracked_info(self, task: Task) -> TaskInfo | None:
+        for store in self.stores:
+            info = store.tracked_info(task)
+            if info is not None:
+                return info
+        return None
+
+    def uid(self, task: Task) -> str:
+        store = self._owner(task) or self.primary
+        uid = store.info(task).uid
+        prefix = self._prefixes.get(store)
+        return f"{prefix}:{uid}" if prefix else uid
+
+    def source(self, task: Task) -> str | None:
+        """The name of the file task is in."""
+        store = self._owner(task)
+        return os.path.basename(store.file_path) if store is not None else None
+
+    def get_task(self, uid: str) -> Task | None:
+        prefix, _, file_uid = uid.partition(":")
+        store = self._by_prefix.get(prefix)
+        if store is None:
+            return self.primary.get_task(uid)
+        return store.get_task(file_uid)
+
+    @property
+    def journal_position(self) -> tuple[int, ...]:
+        return tuple(store.journal_position for store in self.stores)
+
+    def changes_since(self, position: tuple[int, ...] | None) -> list[tuple[bool, Task]] | None:
+        """The changes of every file since position; None if any file lost track."""
+        if position is None:
+            return None
+        changes = []
+        for store, store_position in zip(self.stores, position):
+            store_changes = store.changes_since(store_position)
+            if store_changes is None:
+                return None
+            changes.extend(store_changes)
+        return changes
+
+    def append_task(self, task: Task) -> None:
+        self.primary.append_task(task)
+        self._touch(self.primary)
+
+    def replace_task(self, old_task: Task, task: Task) -> None:
+        store = self._owner(old_task) or self.primary
+        store.replace_task(old_task, task)
+        self._origin[old_task] = store
+        self._touch(store)
+
+    def remove_tasks(self, tasks: list[Task]) -> None:
+        self.update_tasks(dict.fromkeys(tasks))
+
+    def update_tasks(self, changes: dict[Task, Task | None]) -> None:
+        by_store: dict = {}
+        for old_task, task in changes.items():
+            store = self._owner(old_task)
+            if store is not None:
+                by_store.setdefault(store, {})[old_task] = task
+        for store, store_changes in by_store.items():
+            store.update_tasks(store_changes)
+            self._origin.update(dict.fromkeys(store_changes, store))
+            self._touch(store)
+
+    def recur(self, completed: list[Task], today=None) -> int:
+        by_store: dict = {}
+        for task in completed:
+            by_store.setdefault(self._owner(task) or self.primary, []).append(task)
+        count = 0
+        for store, tasks in by_store.items():
+            added = store.recur(tasks, today)
+            if added:
+                self._touch(store)
+            count += added
+        return count
+
+    async def async_save(self) -> None:
+        """Save the files edited since the last save, together."""
+        touched, self._touched = self._touched, []
+        self._origin = {}
+        await asyncio.gather(*(store.async_save() for store in touched))
+
+    async def async_flush(self) -> None:
+        await asyncio.gather(*(store.async_flush() for store in self.stores))
+
+    async def async_load(self) -> bool:
+        deltas = await asyncio.gather(*(store.async_load() for store in self.stores))
+        return any(deltas)
+
+    async def async_reload(self) -> None:
+        await asyncio.gather(*(store.async_reload() for store in self.stores))
+
+    def async_start_load(self) -> list[asyncio.Task]:
+        """Parse all files in the background, each on its own worker thread."""
+        return [store.async_start_load() for store in self.stores]
+
+    async def async_ready(self) -> None:
+        await asyncio.gather(*(store.async_ready() for store in self.stores))
+
+    async def async_load_archive(self) -> list[Task]:
+        # Files in one folder share its done.txt; read each archive once
+        archives = {}
+        for store in self.stores:
+            archives.setdefault(os.path.realpath(store.archive.file_path), store)
+        archives = await asyncio.gather(*(store.async_load_archive() for store in archives.values()))
+        return [task for archived in archives for task in archived]
+
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        removers = [store.async_add_listener(update_callback) for store in self.stores]
+
+        def remove_listener() -> None:
+            for remove in removers:
+                remove()
+
+        return remove_listener
+
+    def diagnostics(self) -> dict:
+        return {store.file_path: store.diagnostics() for store in self.stores}
@@ -0,0 +1,64 @@
+import datetime
+import os
+
+from pytodotxt import Task
+
+from .model import LazyTask
+from .writer import append_bytes
+from .watcher import stat_signature
+
+# todo.txt convention: completed tasks are archived next to todo.txt
+ARCHIVE_FILENAME = "done.txt"
+
+
+def archive_path(file_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), ARCHIVE_FILENAME)
+
+
+def is_archivable(task: Task, cutoff: datetime.date) -> bool:
+    """Completed on or before cutoff.
+
+    Tasks without a completion date are kept: pytodotxt only writes one when
+    the task also has a creation date, so their age is unknown.
+    """
+    if not task.is_completed or task.completion_date is None:
+        return False
+    return task.completion_date <= cutoff
+
+
+class ArchiveFile:
+    """done.txt for a todo.txt file.
+
+    Written with append-only commits; only read (and then cached until it
+    changes) when someone asks for the completed history.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = archive_path(file_path)
+        self._signature = None
+        self._tasks: list[Task] = []
+
+    def append(self, lines: list[bytes], linesep: str) -> None:
+        """Durably append lines, so they are safe before they leave todo.txt."""
+        sep = linesep.encode()
+        prefix = b""
+        try:
+            with open(self.file_path, 'rb') as f:
+                f.seek(-len(sep), os.SEEK_END)
+                if f.read() != sep:
+                    prefix = sep
+        except OSError:
+            # Missing or shorter than a line separator
+            pass
+        append_bytes(self.file_path, prefix + b"".join(line + sep for line in lines), sync=True)
+
+    def load(self) -> list[Task]:
+        """Parsed archive, oldest first. Re-parsed only if done.txt changed."""
+        signature = stat_signature(self.file_path)
+        if signature is None:
+            return []
+        if signature != self._signature:
+            with open(self.file_path, 'rt', encoding='utf-8') as f:
+                self._tasks = [LazyTask(line) for line in f.read().splitlines() if line.strip()]
+            self._signature = signature
+        return self._tasks
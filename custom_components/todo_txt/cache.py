@@ -0,0 +1,154 @@
+"""On-disk cache of parsed files, so an unchanged file is never parsed twice.
+
+After a restart, or when a list is reloaded after its options changed, the
+store finds the file here: its tasks, their derived attributes and uids, and
+the token index come back from one read of the cache, without parsing or
+tokenizing a single line.
+
+An entry is keyed by the file's path, size, mtime and a hash of its lines.
+It is stored with marshal, a compact binary format for plain values whose
+layout depends on the Python version, so that is part of the key too.
+"""
+import hashlib
+import logging
+import marshal
+import os
+import sys
+from array import array
+
+from pytodotxt import Task
+
+from .model import LazyTask, TaskInfo
+from .writer import write_atomic
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_FORMAT = 2
+_VERSION = (CACHE_FORMAT, tuple(sys.version_info[:2]))
+_FIELDS = 13
+# Per-line numbers are stored column by column as packed arrays: completed,
+# completion, creation, body offset, due and sort key
+_COLUMNS = ("b", "i", "i", "i", "i", "q")
+
+
+def lines_hash(lines: list[bytes]) -> bytes:
+    return hashlib.blake2b(b"\n".join(lines), digest_size=16).digest()
+
+
+class CachedModel:
+    """Everything the store derives from the lines of a file."""
+
+    def __init__(self, tasks, info, index_postings, uids, recurring) -> None:
+        self.tasks: list[Task] = tasks
+        self.info: dict[Task, TaskInfo] = info
+        self.postings: dict[str, set[Task]] = index_postings
+        self.uids: dict[str, Task] = uids
+        self.recurring: set[Task] = recurring
+
+
+class ParseCache:
+    """The cache entry of one todo.txt file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def _read(self, file_path: str, signature) -> tuple | None:
+        try:
+            with open(self.path, "rb") as f:
+                payload = marshal.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError) as err:
+            _LOGGER.debug("Ignoring unreadable parse cache %s: %s", self.path, err)
+            return None
+        if not isinstance(payload, tuple) or len(payload) != _FIELDS or payload[0] != _VERSION:
+            return None
+        _version, path, size, mtime_ns, *rest = payload
+        if signature is None or (path, size, mtime_ns) != (file_path, signature[1], signature[0]):
+            return None
+        return tuple(rest)
+
+    def load(self, file_path: str, signature, lines: list[bytes], encoding: str) -> CachedModel | None:
+        """The model of lines, if the cache holds exactly this version of the file."""
+        entry = self._read(file_path, signature)
+        if entry is None:
+            return None
+        digest, count, columns, priorities, task_ids, recurrences, uids, token_table, postings = entry
+        if count != len(lines) or digest != lines_hash(lines):
+            return None
+        try:
+            completed, completion, creation, body, due, sort_keys = (
+                array(code, column) for code, column in zip(_COLUMNS, columns)
+            )
+            texts = [line.decode(encoding) for line in lines]
+            tasks = list(map(LazyTask.restore, texts, range(count), map(bool, completed), priorities, completion, creation, body))
+            info = dict(zip(tasks, map(
+                TaskInfo.restore,
+                texts,
+                uids,
+                range(count),
+                map(task_ids.get, range(count)),
+                due,
+                map(bool, completed),
+                map(recurrences.get, range(count)),
+                sort_keys,
+            )))
+            index = {
+                token_table[token]: set(map(tasks.__getitem__, array("I", positions)))
+                for token, positions in postings
+            }
+        except (ValueError, TypeError, IndexError) as err:
+            _LOGGER.debug("Ignoring corrupt parse cache %s: %s", self.path, err)
+            return None
+        recurring = {tasks[linenr] for linenr in recurrences}
+        return CachedModel(tasks, info, index, dict(zip(uids, tasks)), recurring)
+
+    def save(self, file_path: str, signature, lines: list[bytes], tasks: list[Task], infos: list[TaskInfo]) -> None:
+        columns = [array(code) for code in _COLUMNS]
+        completed, completion, creation, body, due, sort_keys = columns
+        priorities = []
+        task_ids = {}
+        recurrences = {}
+        token_table: dict[str, int] = {}
+        postings: dict[int, array] = {}
+        for linenr, (task, info) in enumerate(zip(tasks, infos)):
+            for token in info.tokens:
+                token_id = token_table.setdefault(token, len(token_table))
+                postings.setdefault(token_id, array("I")).append(linenr)
+            # Tasks edited in Home Assistant may be plain pytodotxt Tasks
+            lazy = task if isinstance(task, LazyTask) else LazyTask(info.line)
+            is_completed, priority, completion_ordinal, creation_ordinal, body_start = lazy.fields()
+            completed.append(is_completed)
+            priorities.append(priority)
+            completion.append(completion_ordinal)
+            creation.append(creation_ordinal)
+            body.append(body_start)
+            due.append(info.due_ordinal)
+            sort_keys.append(info.sort_key)
+            if info.task_id:
+                task_ids[linenr] = info.task_id
+            if info.recurrence:
+                recurrences[linenr] = info.recurrence
+        payload = (
+            _VERSION,
+            file_path,
+            signature[1],
+            signature[0],
+            lines_hash(lines),
+            len(tasks),
+            [column.tobytes() for column in columns],
+            priorities,
+            task_ids,
+            recurrences,
+            [info.uid for info in infos],
+            list(token_table),
+            [(token_id, positions.tobytes()) for token_id, positions in postings.items()],
+        )
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_atomic(self.path, marshal.dumps(payload))
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
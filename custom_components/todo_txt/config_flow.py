@@ -3,7 +3,27 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 import os
 
-from .const import DOMAIN
+from .const import DOMAIN, DEFAULT_PARSE_BUDGET, DEFAULT_WRITE_DELAY
+from .query import QueryError, parse_query
+
+# Milliseconds; 0 writes every change to disk immediately
+WRITE_DELAY_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=0, max=10000))
+
+# Days after completion before a task moves to done.txt; leave empty to never archive
+ARCHIVE_DAYS_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=0))
+
+# Most completed tasks to show; leave empty to show all
+COMPLETED_LIMIT_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=0))
+
+# Milliseconds a parse may take before a warning is logged
+PARSE_BUDGET_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=1))
+
+def _filter_error(user_input) -> str | None:
+    try:
+        parse_query(user_input.get("filter") or None)
+    except QueryError:
+        return "invalid_filter"
+    return None
 
 class TodoTxtConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
@@ -16,8 +36,11 @@ class TodoTxtConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(self, user_input=None):
         errors = {}
         if user_input is not None:
+            filter_error = _filter_error(user_input)
             if not user_input.get("file_path"):
                 errors["base"] = "invalid_path"
+            elif filter_error:
+                errors["filter"] = filter_error
             else:
                 return self.async_create_entry(
                     title=f"{user_input['name']} ({user_input.get('filter', 'All')})", 
@@ -30,6 +53,13 @@ class TodoTxtConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required("name", default="My Tasks"): str,
                 vol.Required("file_path"): str,
                 vol.Optional("filter"): str,
+                # Paths or globs separated by commas or new lines; new tasks still go to file_path
+                vol.Optional("extra_files"): str,
+                vol.Optional("write_delay", default=DEFAULT_WRITE_DELAY): WRITE_DELAY_SCHEMA,
+                vol.Optional("archive_days"): ARCHIVE_DAYS_SCHEMA,
+                vol.Optional("completed_limit"): COMPLETED_LIMIT_SCHEMA,
+                vol.Optional("parse_budget", default=DEFAULT_PARSE_BUDGET): PARSE_BUDGET_SCHEMA,
+                vol.Optional("diagnostic_sensors", default=False): bool,
             }),
             errors=errors,
         )
@@ -39,7 +69,11 @@ class TodoTxtOptionsFlowHandler(config_entries.OptionsFlow):
         self.entry = config_entry
 
     async def async_step_init(self, user_input=None):
-        if user_input is not None:
+        errors = {}
+        filter_error = _filter_error(user_input) if user_input is not None else None
+        if filter_error:
+            errors["filter"] = filter_error
+        elif user_input is not None:
             # Update the entry's data directly since we want these to be the new "truth"
             self.hass.config_entries.async_update_entry(
                 self.entry, 
@@ -54,5 +88,27 @@ class TodoTxtOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Required("name", default=self.entry.data.get("name", "My Tasks")): str,
                 vol.Required("file_path", default=self.entry.data.get("file_path")): str,
                 vol.Optional("filter", default=self.entry.data.get("filter", "")): str,
+                vol.Optional(
+                    "extra_files",
+                    description={"suggested_value": self.entry.data.get("extra_files")},
+                ): str,
+                vol.Optional(
+                    "write_delay", default=self.entry.data.get("write_delay", DEFAULT_WRITE_DELAY)
+                ): WRITE_DELAY_SCHEMA,
+                vol.Optional(
+                    "archive_days",
+                    description={"suggested_value": self.entry.data.get("archive_days")},
+                ): ARCHIVE_DAYS_SCHEMA,
+                vol.Optional(
+                    "completed_limit",
+                    description={"suggested_value": self.entry.data.get("completed_limit")},
+                ): COMPLETED_LIMIT_SCHEMA,
+                vol.Optional(
+                    "parse_budget", default=self.entry.data.get("parse_budget", DEFAULT_PARSE_BUDGET)
+                ): PARSE_BUDGET_SCHEMA,
+                vol.Optional(
+                    "diagnostic_sensors", default=self.entry.data.get("diagnostic_sensors", False)
+                ): bool,
             }),
+            errors=errors,
         )
@@ -1 +1,45 @@
+import datetime
+
 DOMAIN = "todo_txt"
+
+# Key in hass.data[DOMAIN] holding the shared per-file stores
+DATA_STORES = "stores"
+
+# Key in hass.data[DOMAIN] holding the I/O worker of each file, kept across reloads
+# and shut down when the last config entry reading the file is removed
+DATA_WORKERS = "workers"
+
+# Key in hass.data[DOMAIN] holding the list entity of each config entry, by entry id
+DATA_ENTITIES = "entities"
+
+# Seconds between stat() checks when inotify is not available
+FALLBACK_SCAN_INTERVAL = 30
+
+# Seconds between stat() checks alongside inotify, for network mounts that do not deliver its events
+SAFETY_SCAN_INTERVAL = 300
+
+# Seconds to wait for a burst of inotify events to settle before re-reading
+WATCH_DEBOUNCE = 0.5
+
+# Milliseconds to collect edits before committing them to disk in one write
+DEFAULT_WRITE_DELAY = 250
+
+# How often old completed tasks are moved to done.txt (when archiving is enabled)
+ARCHIVE_INTERVAL = datetime.timedelta(hours=6)
+
+# Also archive as soon as todo.txt grows beyond this many bytes
+ARCHIVE_SIZE_THRESHOLD = 256 * 1024
+
+# Log a warning when parsing the file takes longer than this many milliseconds
+DEFAULT_PARSE_BUDGET = 200
+
+# Task changes kept for entities to catch up on; beyond that they re-filter in full
+JOURNAL_LIMIT = 4096
+
+# Version of the per-list snapshot in .storage, and seconds to batch its saves
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30
+
+# Fired for each open task of a list when its due date starts, and the day after
+EVENT_TASK_DUE = "todo_txt_task_due"
+EVENT_TASK_OVERDUE = "todo_txt_task_overdue"
@@ -0,0 +1,21 @@
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_ENTITIES, DOMAIN
+from .store import get_store
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Settings, file statistics and hot-path timings of a list."""
+    diagnostics: dict[str, Any] = {"entry": dict(entry.data)}
+
+    store = get_store(hass, entry.data["file_path"])
+    if store is not None:
+        diagnostics["file"] = store.diagnostics()
+
+    entity = hass.data[DOMAIN].get(DATA_ENTITIES, {}).get(entry.entry_id)
+    if entity is not None:
+        diagnostics["list"] = entity.diagnostics()
+    return diagnostics
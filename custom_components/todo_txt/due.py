@@ -0,0 +1,91 @@
+import heapq
+import itertools
+
+from pytodotxt import Task
+
+# Stages of an open task with a due date, in the order they are reached
+UPCOMING, DUE, OVERDUE = range(3)
+
+
+class DueIndex:
+    """The open tasks of a list with a due date, by the day they next change stage.
+
+    A task is due on its due date and overdue from the day after. The heap
+    holds (day, stage, tiebreak, task) for the next stage of every task that
+    has one, so finding what becomes due at midnight is a pop per task
+    instead of a scan of the list. Removed and edited tasks are left in the
+    heap and skipped when they come up.
+    """
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def clear(self) -> None:
+        self._heap: list[tuple[int, int, int, Task]] = []
+        # Due date ordinal of every task in the index, and its current stage
+        self._dates: dict[Task, int] = {}
+        self._stages: dict[Task, int] = {}
+        self.due_today = 0
+        self.overdue = 0
+
+    def _is_current(self, entry: tuple[int, int, int, Task]) -> bool:
+        # False for entries of removed tasks, and of tasks added again with another date
+        day, stage, _tiebreak, task = entry
+        due = self._dates.get(task)
+        return due is not None and self._stages[task] == stage - 1 and day == due + (stage == OVERDUE)
+
+    def _count(self, stage: int, delta: int) -> None:
+        if stage == DUE:
+            self.due_today += delta
+        elif stage == OVERDUE:
+            self.overdue += delta
+
+    def _set_stage(self, task: Task, stage: int) -> None:
+        self._count(self._stages.get(task, UPCOMING), -1)
+        self._stages[task] = stage
+        self._count(stage, 1)
+        if stage != OVERDUE:
+            # The next stage starts on the due date, or the day after it
+            day = self._dates[task] + (stage == DUE)
+            heapq.heappush(self._heap, (day, stage + 1, next(self._counter), task))
+
+    def add(self, task: Task, due: int, today: int) -> None:
+        """Track an open task due on ordinal due; no events for stages it is already in."""
+        self.discard(task)
+        self._dates[task] = due
+        self._stages[task] = UPCOMING
+        self._set_stage(task, UPCOMING if due > today else DUE if due == today else OVERDUE)
+        if len(self._heap) > 2 * len(self._dates) + 64:
+            # Mostly stale entries after many edits; keep the heap in proportion
+            self._heap = [entry for entry in self._heap if self._is_current(entry)]
+            heapq.heapify(self._heap)
+
+    def discard(self, task: Task) -> None:
+        if self._dates.pop(task, None) is not None:
+            self._count(self._stages.pop(task), -1)
+
+    def advance(self, today: int) -> list[tuple[int, Task]]:
+        """Move tasks into the stage they reach by today; returns the (stage, task) changes."""
+        changes = []
+        heap = self._heap
+        while heap and heap[0][0] <= today:
+            entry = heapq.heappop(heap)
+            if not self._is_current(entry):
+                continue
+            _day, stage, _tiebreak, task = entry
+            self._set_stage(task, stage)
+            changes.append((stage, task))
+        return changes
+
+    def next_day(self) -> int | None:
+        """Ordinal of the next day a task changes stage."""
+        heap = self._heap
+        while heap:
+            if self._is_current(heap[0]):
+                return heap[0][0]
+            heapq.heappop(heap)
+        return None
@@ -0,0 +1,143 @@
+import datetime
+from typing import Callable
+
+from pytodotxt import Task
+
+from .query import AndNode, Context, Node, NotNode, TokenNode, parse_query
+
+# Trailing/leading punctuation ignored when matching filter tokens, so that
+# "call mum @phone." still matches a "@phone" filter.
+TOKEN_PUNCTUATION = ".,;:?!()"
+
+
+def line_tokens(line: str) -> frozenset[str]:
+    """All whitespace separated tokens of a line, raw and punctuation-stripped."""
+    tokens = line.split()
+    tokens += [token.strip(TOKEN_PUNCTUATION) for token in tokens]
+    return frozenset(tokens)
+
+
+def task_tokens(task: Task) -> frozenset[str]:
+    return line_tokens(str(task))
+
+
+class TokenIndex:
+    """Inverted index from token (+Project, @context, key:value, word) to tasks.
+
+    Maintained by the shared store as tasks are parsed or changed, so every
+    entity on the file can filter with set operations instead of scanning text.
+    The tokens of each task are not kept: one string per distinct token lives
+    in the postings, and a task's own tokens are cheap to get from its line.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, set[Task]] = {}
+        self._nonblank: set[Task] = set()
+        self._blank: set[Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._nonblank) + len(self._blank)
+
+    def add(self, task: Task, tokens: frozenset[str] | None = None) -> None:
+        if tokens is None:
+            tokens = task_tokens(task)
+        if not tokens:
+            self._blank.add(task)
+            return
+        self._nonblank.add(task)
+        postings = self._postings
+        for token in tokens:
+            tasks = postings.get(token)
+            if tasks is None:
+                tasks = postings[token] = set()
+            tasks.add(task)
+
+    def remove(self, task: Task, tokens: frozenset[str] | None = None) -> None:
+        """Drop task, whose tokens are those of its line unless given."""
+        self._blank.discard(task)
+        if task not in self._nonblank:
+            return
+        self._nonblank.discard(task)
+        for token in task_tokens(task) if tokens is None else tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(task)
+                if not postings:
+                    del self._postings[token]
+
+    def rebuild(self, tasks: list[Task]) -> None:
+        self._postings = {}
+        self._nonblank = set()
+        self._blank = set()
+        for task in tasks:
+            self.add(task)
+
+    def restore(self, postings: dict[str, set[Task]], tasks: list[Task]) -> None:
+        """Take over postings built elsewhere (the parse cache) for tasks."""
+        self._postings = postings
+        self._nonblank = set().union(*postings.values())
+        self._blank = set(tasks) - self._nonblank
+
+    def tasks_with(self, token: str) -> set[Task]:
+        return self._postings.get(token, set())
+
+    def indexed_tasks(self) -> set[Task]:
+        """Every indexed task that is not blank."""
+        return set(self._nonblank)
+
+
+def literal_query(filter_tag: str) -> Node | None:
+    """The filter read as plain tokens, -token to exclude, as before there were queries."""
+    terms: list[Node] = []
+    for token in filter_tag.split():
+        if not token.startswith("-"):
+            terms.append(TokenNode(token))
+        elif token[1:]:
+            terms.append(NotNode(TokenNode(token[1:])))
+    if not terms:
+        return None
+    return terms[0] if len(terms) == 1 else AndNode(terms)
+
+
+class TaskFilter:
+    """A filter query (see query.py) compiled once and run against the token index.
+
+    include/exclude are the plain tokens the query requires at its top level,
+    e.g. "+Work -@weekend"; new tasks created in the list get the included ones.
+    """
+
+    def __init__(self, filter_tag: str | None = None, literal: bool = False) -> None:
+        # Raises QueryError for invalid queries; the config flow validates them first
+        if literal:
+            self.query = literal_query(filter_tag or "")
+        else:
+            self.query = parse_query(filter_tag.strip() if filter_tag else None)
+        self.include: list[str] = []
+        self.exclude: list[str] = []
+        terms = self.query.children if isinstance(self.query, AndNode) else [self.query]
+        for term in terms:
+            if isinstance(term, TokenNode):
+                self.include.append(term.token)
+            elif isinstance(term, NotNode) and isinstance(term.child, TokenNode):
+                self.exclude.append(term.child.token)
+
+    @property
+    def uses_today(self) -> bool:
+        """Whether matches change with the date (relative due/created terms)."""
+        return self.query is not None and self.query.uses_today
+
+    def matches(self, task: Task, info, today: datetime.date | None = None) -> bool:
+        """Evaluate the query for one task and its TaskInfo, without an index."""
+        if not info.tokens:
+            return False
+        return self.query is None or self.query.matches(task, info, today or datetime.date.today())
+
+    def select(self, index: TokenIndex, info: Callable | None = None, today: datetime.date | None = None) -> set[Task]:
+        """Tasks of the index matching this filter.
+
+        info looks up a task's TaskInfo; it is needed by queries on status,
+        priority or dates.
+        """
+        if self.query is None:
+            return index.indexed_tasks()
+        return self.query.select(Context(index, info, today))
@@ -0,0 +1,72 @@
+from difflib import SequenceMatcher
+
+
+def _hunks(base: list[bytes], other: list[bytes], side: int) -> list[tuple[int, int, list[bytes], int]]:
+    """Changed regions of base as (start, end, replacement, side)."""
+    matcher = SequenceMatcher(None, base, other, autojunk=False)
+    return [
+        (i1, i2, other[j1:j2], side)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _apply(base: list[bytes], start: int, end: int, hunks) -> list[bytes]:
+    """Apply one side's hunks to the base region [start, end)."""
+    result = []
+    pos = start
+    for h_start, h_end, replacement, _side in hunks:
+        result.extend(base[pos:h_start])
+        result.extend(replacement)
+        pos = h_end
+    result.extend(base[pos:end])
+    return result
+
+
+def merge_lines(base: list[bytes], ours: list[bytes], theirs: list[bytes]) -> tuple[list[bytes], int]:
+    """Three-way merge of todo.txt lines.
+
+    Changes that touch different lines are combined. Where both sides
+    changed the same lines differently, their version is kept and our lines
+    that are not already in it are added right after, so a conflict can
+    duplicate a task but never lose one. Returns (merged lines, conflicts).
+    """
+    hunks = sorted(_hunks(base, ours, 0) + _hunks(base, theirs, 1), key=lambda h: (h[0], h[1]))
+
+    merged: list[bytes] = []
+    conflicts = 0
+    pos = 0
+    i = 0
+    while i < len(hunks):
+        # Gather every hunk overlapping this one into a cluster
+        start, end = hunks[i][0], hunks[i][1]
+        cluster = [hunks[i]]
+        i += 1
+        while i < len(hunks) and (hunks[i][0] < end or hunks[i][0] == start == end == hunks[i][1]):
+            end = max(end, hunks[i][1])
+            cluster.append(hunks[i])
+            i += 1
+
+        merged.extend(base[pos:start])
+        pos = end
+        ours_hunks = [h for h in cluster if h[3] == 0]
+        theirs_hunks = [h for h in cluster if h[3] == 1]
+        ours_region = _apply(base, start, end, ours_hunks)
+        theirs_region = _apply(base, start, end, theirs_hunks)
+        if not ours_hunks:
+            merged.extend(theirs_region)
+        elif not theirs_hunks or ours_region == theirs_region:
+            merged.extend(ours_region)
+        elif start == end:
+            # Both sides only added lines at the same spot, e.g. both appended
+            theirs_set = set(theirs_region)
+            merged.extend(theirs_region)
+            merged.extend(line for line in ours_region if line not in theirs_set)
+        else:
+            conflicts += 1
+            keep = set(theirs_region) | set(base[start:end])
+            merged.extend(theirs_region)
+            merged.extend(line for line in ours_region if line not in keep)
+
+    merged.extend(base[pos:])
+    return merged, conflicts
@@ -0,0 +1,242 @@
+import datetime
+import re
+import sys
+from difflib import SequenceMatcher
+
+from pytodotxt import Task
+
+from .filters import line_tokens
+
+DUE_RE = re.compile(r'due:(\d{4}-\d{2}-\d{2})')
+ID_RE = re.compile(r'(?:^|\s)id:(\S+)')
+REC_RE = re.compile(r'(?:^|\s)rec:(\S+)')
+
+# The same rules pytodotxt applies to the start of a line, anchored at a position
+COMPLETED_RE = re.compile(r'x\s+')
+PRIORITY_RE = re.compile(r'\s*\(([A-Z]+)\)')
+DATE_RE = re.compile(r'\s*([\d]{4}-[\d]{2}-[\d]{2})', re.ASCII)
+PROJECT_RE = re.compile(r'(?:\s+|^)\+(\S+)')
+CONTEXT_RE = re.compile(r'(?:\s+|^)@(\S+)')
+
+# Completion mark, priority and dates at the start of a line, and date tags,
+# which an edit of a task (ticking it off, rescheduling it) changes
+_EDITABLE_HEAD_RE = re.compile(r'^(?:(?:x|\([A-Z]\)|\d{4}-\d{2}-\d{2})\s+)*')
+_DATE_TAG_RE = re.compile(r'\S+:\d{4}-\d{2}-\d{2}')
+# How alike the rest of two lines must be for one to be an edit of the other
+SAME_TASK_RATIO = 0.6
+
+# Sort placeholders so tasks without a value go last (due) or first (created)
+NO_PRIORITY = ord("Z")
+NO_DUE = datetime.date.max.toordinal()
+NO_CREATION = 0
+
+# Date ordinals fit in 22 bits, which lets sort_key pack every field in one int
+_ORDINAL_RANGE = 1 << 22
+
+
+def _ordinal(date: datetime.date | None) -> int:
+    return date.toordinal() if date else 0
+
+
+def _date(ordinal: int) -> datetime.date | None:
+    return datetime.date.fromordinal(ordinal) if ordinal else None
+
+
+def _match_date(line: str, pos: int, end: int) -> tuple[int, int]:
+    """(position after the date, its ordinal or 0) for a date at pos."""
+    match = DATE_RE.match(line, pos, end)
+    if not match:
+        return pos, 0
+    try:
+        return match.end(), datetime.date.fromisoformat(match.group(1)).toordinal()
+    except ValueError:
+        return match.end(), 0
+
+
+class LazyTask:
+    """Compact record of one todo.txt line read from the file.
+
+    Completion, priority and dates are read from the start of the line with
+    pytodotxt's own rules and kept as a flag, a one-letter string and date
+    ordinals. The description is a slice of the line. Everything the
+    integration needs comes from these, so the full pytodotxt Task is only
+    built if something else (e.g. key:value attributes) is asked for.
+    str() returns the line exactly as it is on disk.
+    """
+
+    __slots__ = ("line", "linenr", "is_completed", "priority", "_completion", "_creation", "_body", "_task")
+
+    def __init__(self, line: str, linenr: int | None = None) -> None:
+        self.line = line
+        self.linenr = linenr
+        self._task = None
+
+        # Like pytodotxt, look at the line without surrounding whitespace
+        pos = len(line) - len(line.lstrip())
+        end = len(line.rstrip())
+        self._completion = 0
+        match = COMPLETED_RE.match(line, pos, end)
+        self.is_completed = match is not None
+        if match:
+            pos, self._completion = _match_date(line, match.end(), end)
+        self.priority = None
+        match = PRIORITY_RE.match(line, pos, end)
+        if match:
+            self.priority = match.group(1)
+            pos = match.end()
+        self._body, self._creation = _match_date(line, pos, end)
+
+    @classmethod
+    def restore(
+        cls, line: str, linenr: int, is_completed: bool, priority: str | None, completion: int, creation: int, body: int
+    ) -> "LazyTask":
+        """Rebuild a task from fields saved by the parse cache, skipping the parse."""
+        task = cls.__new__(cls)
+        task.line = line
+        task.linenr = linenr
+        task.is_completed = is_completed
+        task.priority = priority
+        task._completion = completion
+        task._creation = creation
+        task._body = body
+        task._task = None
+        return task
+
+    def fields(self) -> tuple:
+        """What restore() needs besides the line and line number."""
+        return (self.is_completed, self.priority, self._completion, self._creation, self._body)
+
+    @property
+    def task(self) -> Task:
+        if self._task is None:
+            self._task = Task(self.line)
+        return self._task
+
+    @property
+    def completion_date(self) -> datetime.date | None:
+        return _date(self._completion)
+
+    @property
+    def creation_date(self) -> datetime.date | None:
+        return _date(self._creation)
+
+    @property
+    def description(self) -> str | None:
+        return self.line[self._body:].strip() or None
+
+    @property
+    def projects(self) -> list[str]:
+        return [sys.intern(name) for name in PROJECT_RE.findall(self.line, self._body)]
+
+    @property
+    def contexts(self) -> list[str]:
+        return [sys.intern(name) for name in CONTEXT_RE.findall(self.line, self._body)]
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes not defined above
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.task, name)
+
+    def __str__(self) -> str:
+        return self.line
+
+    def __repr__(self) -> str:
+        return f"LazyTask({self.line!r})"
+
+
+def completed_line(task: Task, today: datetime.date) -> str:
+    """The line of task once marked done today.
+
+    Like pytodotxt, the priority is dropped; the completion date is always set.
+    """
+    parts = ["x", today.isoformat()]
+    if task.creation_date:
+        parts.append(task.creation_date.isoformat())
+    if task.description:
+        parts.append(task.description)
+    return " ".join(parts)
+
+
+class TaskInfo:
+    """Attributes derived from a task, computed once when it is parsed or replaced.
+
+    Sorting, filtering and building TodoItems only read these, so the hot
+    paths never re-serialize a task or run a regex over it.
+    """
+
+    __slots__ = ("uid", "seq", "task_id", "line", "due_ordinal", "is_completed", "recurrence", "sort_key")
+
+    def __init__(self, task: Task) -> None:
+        self.line = str(task)
+        # Assigned by the store, which guarantees uniqueness within a file
+        self.uid = None
+        # When the store started tracking the task; breaks sort_key ties
+        self.seq = 0
+        match = ID_RE.search(self.line)
+        self.task_id = match.group(1) if match else None
+        match = REC_RE.search(self.line)
+        # The raw rec: value, see recurrence.py
+        self.recurrence = match.group(1) if match else None
+        self.is_completed = bool(task.is_completed)
+
+        # Ordinal of the due: date, 0 without one; due gives it as a date
+        self.due_ordinal = 0
+        match = DUE_RE.search(self.line)
+        if match:
+            try:
+                self.due_ordinal = datetime.date.fromisoformat(match.group(1)).toordinal()
+            except ValueError:
+                pass
+
+        # (status, priority, due, created) packed into one int, so sorting
+        # compares single ints instead of tuples of strings
+        priority = ord(task.priority[0]) if task.priority else NO_PRIORITY
+        key = (1 if self.is_completed else 0) << 8 | priority
+        key = key * _ORDINAL_RANGE + (self.due_ordinal or NO_DUE)
+        self.sort_key = key * _ORDINAL_RANGE + (_ordinal(task.creation_date) or NO_CREATION)
+
+    @classmethod
+    def restore(
+        cls,
+        line: str,
+        uid: str,
+        seq: int,
+        task_id: str | None,
+        due: int,
+        is_completed: bool,
+        recurrence: str | None,
+        sort_key: int,
+    ) -> "TaskInfo":
+        """Rebuild the attributes saved by the parse cache, skipping their regexes."""
+        info = cls.__new__(cls)
+        info.line = line
+        info.uid = uid
+        info.seq = seq
+        info.task_id = task_id
+        info.due_ordinal = due
+        info.is_completed = is_completed
+        info.recurrence = recurrence
+        info.sort_key = sort_key
+        return info
+
+    @property
+    def due(self) -> datetime.date | None:
+        return _date(self.due_ordinal)
+
+    @property
+    def tokens(self) -> frozenset[str]:
+        # Not kept: the token index holds one copy of every token for the whole file
+        return line_tokens(self.line)
+
+
+def _task_text(line: str) -> str:
+    return " ".join(_DATE_TAG_RE.sub("", _EDITABLE_HEAD_RE.sub("", line.strip())).split())
+
+
+def is_same_task(old_line: str, new_line: str) -> bool:
+    """Whether new_line looks like an edit of old_line, rather than another task in its place."""
+    old_id, new_id = ID_RE.search(old_line), ID_RE.search(new_line)
+    if old_id or new_id:
+        return bool(old_id and new_id) and old_id.group(1) == new_id.group(1)
+    return SequenceMatcher(None, _task_text(old_line), _task_text(new_line)).ratio() >= SAME_TASK_RATIO
@@ -0,0 +1,182 @@
+import os
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable
+
+from pytodotxt import Task
+
+from .model import LazyTask
+
+
+@dataclass
+class ParseDelta:
+    """What changed between two parses of the same file."""
+
+    added: list[Task] = field(default_factory=list)
+    removed: list[Task] = field(default_factory=list)
+    # (old task, new task) pairs for lines edited in place
+    modified: list[tuple[Task, Task]] = field(default_factory=list)
+    # Unchanged lines changed position, which shifts their line numbers
+    reordered: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified or self.reordered)
+
+
+def detect_linesep(data: bytes) -> str:
+    for linesep in ("\r\n", "\n", "\r"):
+        if linesep.encode() in data:
+            return linesep
+    return os.linesep
+
+
+class IncrementalParser:
+    """Parses a todo.txt file, re-using the Task objects of unchanged lines.
+
+    Only lines that were added or edited since the previous call are decoded,
+    so appending one task to a large file costs one parse, and those become
+    LazyTasks that defer the pytodotxt parse until it is needed. Alongside the
+    tasks it keeps the raw bytes and byte offset of every line as they are on
+    disk, which the write path uses to patch the file.
+    """
+
+    def __init__(self, encoding: str = "utf-8") -> None:
+        self.encoding = encoding
+        self.lines: list[bytes] = []
+        # Compact line-offset index: 8 bytes per line instead of an int object each
+        self.offsets = array("q")
+        self.tasks: list[Task] = []
+        self.linesep = os.linesep
+        # Length of the file as last parsed or written, and whether it ends in a newline
+        self.size = 0
+        self.ends_with_linesep = True
+
+    def split_lines(self, data: bytes) -> list[bytes]:
+        return [line for line in data.split(detect_linesep(data).encode()) if line.strip()]
+
+    def same_content(self, data: bytes) -> bool:
+        """Whether data holds exactly the lines we last parsed or wrote."""
+        return self.split_lines(data) == self.lines
+
+    def _split(self, data: bytes) -> tuple[list[bytes], array]:
+        sep = self.linesep.encode()
+        lines, offsets = [], array("q")
+        offset = 0
+        for line in data.split(sep):
+            if line.strip():
+                lines.append(line)
+                offsets.append(offset)
+            offset += len(line) + len(sep)
+        return lines, offsets
+
+    def parse(self, data: bytes) -> ParseDelta:
+        self.linesep = detect_linesep(data)
+        new_lines, new_offsets = self._split(data)
+        old_lines, old_tasks = self.lines, self.tasks
+
+        # Skip the common head and tail; syncs usually touch a few lines at one spot
+        start = 0
+        limit = min(len(old_lines), len(new_lines))
+        while start < limit and old_lines[start] == new_lines[start]:
+            start += 1
+        old_end, new_end = len(old_lines), len(new_lines)
+        while old_end > start and new_end > start and old_lines[old_end - 1] == new_lines[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+
+        # Lines in the changed region that merely moved keep their Task
+        pool: dict[bytes, list[Task]] = {}
+        for i in range(start, old_end):
+            pool.setdefault(old_lines[i], []).append(old_tasks[i])
+
+        middle = []
+        fresh = []
+        for line in new_lines[start:new_end]:
+            reusable = pool.get(line)
+            if reusable:
+                middle.append(reusable.pop(0))
+            else:
+                task = LazyTask(line.decode(self.encoding))
+                middle.append(task)
+                fresh.append(task)
+
+        leftover = {id(task) for tasks in pool.values() for task in tasks}
+        gone = [task for task in old_tasks[start:old_end] if id(task) in leftover]
+
+        # Pair up replaced lines in order; whatever is left over was added or removed
+        paired = min(len(gone), len(fresh))
+        delta = ParseDelta(
+            added=fresh[paired:],
+            removed=gone[paired:],
+            modified=list(zip(gone[:paired], fresh[:paired])),
+            reordered=len(middle) > len(fresh),
+        )
+
+        self.tasks = old_tasks[:start] + middle + old_tasks[old_end:]
+        self.lines = new_lines
+        self.offsets = new_offsets
+        self.size = len(data)
+        self.ends_with_linesep = not data or data.endswith(self.linesep.encode())
+        for linenr in range(start, len(self.tasks)):
+            self.tasks[linenr].linenr = linenr
+        return delta
+
+    def restore(self, data: bytes, build: Callable[[list[bytes]], list[Task] | None]) -> bool:
+        """Adopt tasks made by build(lines) for the lines of data, without parsing them.
+
+        Used to load a file from the parse cache; build returns None if it
+        cannot account for the lines, and nothing changes.
+        """
+        linesep = self.linesep
+        self.linesep = detect_linesep(data)
+        lines, offsets = self._split(data)
+        tasks = build(lines)
+        if tasks is None:
+            self.linesep = linesep
+            return False
+        self.tasks = tasks
+        self.lines = lines
+        self.offsets = offsets
+        self.size = len(data)
+        self.ends_with_linesep = not data or data.endswith(self.linesep.encode())
+        return True
+
+    def encode(self, task: Task) -> bytes:
+        return str(task).encode(self.encoding)
+
+    def sync(self, tasks: list[Task]) -> bytes:
+        """Adopt an in-memory task list and return the file content for it."""
+        sep = self.linesep.encode()
+        self.tasks = list(tasks)
+        self.lines = [self.encode(task) for task in tasks]
+        self.offsets = array("q")
+        offset = 0
+        for line in self.lines:
+            self.offsets.append(offset)
+            offset += len(line) + len(sep)
+        self.size = offset
+        self.ends_with_linesep = True
+        return b"".join(line + sep for line in self.lines)
+
+    def replace_line(self, linenr: int, task: Task, line: bytes) -> None:
+        """Record a same-length edit that was written in place."""
+        self.tasks[linenr] = task
+        self.lines[linenr] = line
+
+    def append_payload(self, lines: list[bytes]) -> bytes:
+        """The bytes to append to the file to add lines at its end."""
+        sep = self.linesep.encode()
+        prefix = b"" if self.ends_with_linesep else sep
+        return prefix + b"".join(line + sep for line in lines)
+
+    def append_lines(self, tasks: list[Task], lines: list[bytes]) -> None:
+        """Record lines that were appended to the file."""
+        sep = self.linesep.encode()
+        offset = self.size if self.ends_with_linesep else self.size + len(sep)
+        for task, line in zip(tasks, lines):
+            self.tasks.append(task)
+            self.lines.append(line)
+            self.offsets.append(offset)
+            offset += len(line) + len(sep)
+        self.size = offset
+        self.ends_with_linesep = True
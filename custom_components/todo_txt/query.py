@@ -0,0 +1,281 @@
+"""The filter query language.
+
+A query is a list of terms that must all match:
+
+    +Work @office                 both tokens present
+    -@weekend  /  not @weekend    token absent
+    +Work or +Oncall              either side (binds looser than and)
+    (+Work or +Oncall) pri:A-B    grouping
+    pri:A  /  pri:A-C             priority, or a range of priorities
+    due<7d  due<=today  due>=2026-01-01  due=tomorrow
+    created>-30d                  creation date, same comparisons
+    is:open  /  is:done           completion status
+    key:value  word               any other token, matched literally
+
+Relative dates are today, tomorrow, yesterday or a signed number of days or
+weeks (7d, -2w), counted from the day the query runs. Tasks without the date
+never match a date comparison.
+
+A query is compiled once into a tree of nodes that select tasks from the
+shared token index: token lookups are set operations on postings, and a
+conjunction starts from its rarest lookup so that predicates such as pri:
+or due< only test the few remaining candidates.
+"""
+import datetime
+import functools
+import re
+from typing import Callable
+
+from pytodotxt import Task
+
+TOKEN_RE = re.compile(r'[()]|[^\s()]+')
+PRIORITY_RANGE_RE = re.compile(r'^pri:([A-Za-z])(?:-([A-Za-z]))?$')
+COMPARISON_RE = re.compile(r'^(due|created)(<=|>=|<|>|=)(.+)$')
+RELATIVE_RE = re.compile(r'^([+-]?\d+)([dw])$')
+NAMED_DAYS = {"yesterday": -1, "today": 0, "tomorrow": 1}
+OPERATORS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "=": lambda a, b: a == b,
+}
+
+
+class QueryError(ValueError):
+    """The filter text is not a valid query."""
+
+
+class Context:
+    """What a query runs against: the index, task attributes and today's date."""
+
+    def __init__(self, index, info: Callable | None = None, today: datetime.date | None = None) -> None:
+        self.index = index
+        self.info = info
+        self.today = today or datetime.date.today()
+        self._universe = None
+
+    def universe(self) -> set[Task]:
+        if self._universe is None:
+            self._universe = self.index.indexed_tasks()
+        return self._universe
+
+
+class Node:
+    # Whether the node is answered from postings alone
+    indexed = False
+    # Whether the result depends on today's date
+    uses_today = False
+
+    def cost(self, ctx: Context) -> int:
+        """Rough size of the candidate set, to order conjunctions by."""
+        return len(ctx.universe()) + 1
+
+    def select(self, ctx: Context, candidates: set[Task] | None = None) -> set[Task]:
+        """Tasks matching this node, out of candidates (all tasks if None)."""
+        pool = ctx.universe() if candidates is None else candidates
+        return {task for task in pool if self.matches(task, ctx.info(task), ctx.today)}
+
+    def matches(self, task: Task, info, today: datetime.date) -> bool:
+        raise NotImplementedError
+
+
+class TokenNode(Node):
+    indexed = True
+
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+    def cost(self, ctx: Context) -> int:
+        return len(ctx.index.tasks_with(self.token))
+
+    def select(self, ctx: Context, candidates: set[Task] | None = None) -> set[Task]:
+        postings = ctx.index.tasks_with(self.token)
+        return set(postings) if candidates is None else candidates & postings
+
+    def matches(self, task: Task, info, today: datetime.date) -> bool:
+        return self.token in info.tokens
+
+
+class NotNode(Node):
+    def __init__(self, child: Node) -> None:
+        self.child = child
+        self.uses_today = child.uses_today
+
+    def select(self, ctx: Context, candidates: set[Task] | None = None) -> set[Task]:
+        pool = ctx.universe() if candidates is None else candidates
+        return pool - self.child.select(ctx, pool)
+
+    def matches(self, task: Task, info, today: datetime.date) -> bool:
+        return not self.child.matches(task, info, today)
+
+
+class AndNode(Node):
+    def __init__(self, children: list[Node]) -> None:
+        self.children = children
+        self.indexed = any(child.indexed for child in children)
+        self.uses_today = any(child.uses_today for child in children)
+
+    def cost(self, ctx: Context) -> int:
+        return min(child.cost(ctx) for child in self.children)
+
+    def select(self, ctx: Context, candidates: set[Task] | None = None) -> set[Task]:
+        # Cheapest, most selective lookups first; predicates then scan what is left
+        selected = candidates
+        for child in sorted(self.children, key=lambda child: (not child.indexed, child.cost(ctx))):
+            selected = child.select(ctx, selected)
+            if not selected:
+                break
+        return selected
+
+    def matches(self, task: Task, info, today: datetime.date) -> bool:
+        return all(child.matches(task, info, today) for child in self.children)
+
+
+class OrNode(Node):
+    def __init__(self, children: list[Node]) -> None:
+        self.children = children
+        self.indexed = all(child.indexed for child in children)
+        self.uses_today = any(child.uses_today for child in children)
+
+    def cost(self, ctx: Context) -> int:
+        return sum(child.cost(ctx) for child in self.children)
+
+    def select(self, ctx: Context, candidates: set[Task] | None = None) -> set[Task]:
+        selected = set()
+        for child in self.children:
+            selected |= child.select(ctx, candidates)
+        return selected
+
+    def matches(self, task: Task, info, today: datetime.date) -> bool:
+        return any(child.matches(task, info, today) for child in self.children)
+
+
+class PriorityNode(Node):
+    def __init__(self, low: str, high: str) -> None:
+        self.low, self.high = sorted((low, high))
+
+    def matches(self, task: Task, info, today: datetime.date) -> bool:
+        priority = task.priority
+        return bool(priority) and self.low <= priority[0] <= self.high
+
+
+class StatusNode(Node):
+    def __init__(self, done: bool) -> None:
+        self.done = done
+
+    def matches(self, task: Task, info, today: datetime.date) -> bool:
+        return info.is_completed == self.done
+
+
+class DateNode(Node):
+    def __init__(self, field: str, operator: str, date: datetime.date | None, days: int | None) -> None:
+        self.field = field
+        self.compare = OPERATORS[operator]
+        # Either a fixed date or an offset in days from today
+        self.date = date
+        self.days = days
+        self.uses_today = days is not None
+
+    def matches(self, task: Task, info, today: datetime.date) -> bool:
+        value = info.due if self.field == "due" else task.creation_date
+        if value is None:
+            return False
+        target = self.date if self.days is None else today + datetime.timedelta(days=self.days)
+        return self.compare(value, target)
+
+
+def _parse_date(text: str, term: str) -> tuple[datetime.date | None, int | None]:
+    text = text.lower()
+    if text in NAMED_DAYS:
+        return None, NAMED_DAYS[text]
+    match = RELATIVE_RE.match(text)
+    if match:
+        return None, int(match.group(1)) * (7 if match.group(2) == "w" else 1)
+    try:
+        return datetime.date.fromisoformat(text), None
+    except ValueError:
+        raise QueryError(f"'{term}': expected a date, today, tomorrow, yesterday or e.g. 7d / -2w") from None
+
+
+def _term(word: str) -> Node:
+    if word.startswith("-") and len(word) > 1:
+        return NotNode(_term(word[1:]))
+    match = PRIORITY_RANGE_RE.match(word)
+    if match:
+        low = match.group(1).upper()
+        return PriorityNode(low, (match.group(2) or low).upper())
+    if word.startswith("pri:"):
+        raise QueryError(f"'{word}': expected a priority like pri:A or pri:A-C")
+    match = COMPARISON_RE.match(word)
+    if match:
+        date, days = _parse_date(match.group(3), word)
+        return DateNode(match.group(1), match.group(2), date, days)
+    if word.lower() in ("is:open", "is:done"):
+        return StatusNode(word.lower() == "is:done")
+    return TokenNode(word)
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.words = TOKEN_RE.findall(text)
+        self.pos = 0
+
+    def peek(self) -> str | None:
+        return self.words[self.pos] if self.pos < len(self.words) else None
+
+    def take(self) -> str:
+        word = self.words[self.pos]
+        self.pos += 1
+        return word
+
+    def parse(self) -> Node | None:
+        if not self.words:
+            return None
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QueryError(f"unexpected '{self.peek()}'")
+        return node
+
+    def parse_or(self) -> Node:
+        children = [self.parse_and()]
+        while self.peek() is not None and self.peek().lower() in ("or", "|"):
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else OrNode(children)
+
+    def parse_and(self) -> Node:
+        children = []
+        while True:
+            word = self.peek()
+            if word is None or word == ")" or word.lower() in ("or", "|"):
+                break
+            if word.lower() == "and":
+                self.take()
+                continue
+            children.append(self.parse_unary())
+        if not children:
+            raise QueryError("expected a term" + (f" before '{self.peek()}'" if self.peek() else " at the end"))
+        return children[0] if len(children) == 1 else AndNode(children)
+
+    def parse_unary(self) -> Node:
+        word = self.peek()
+        if word is not None and word.lower() == "not" or word == "-":
+            self.take()
+            if self.peek() is None:
+                raise QueryError(f"'{word}' needs something to negate")
+            return NotNode(self.parse_unary())
+        if word == "(":
+            self.take()
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise QueryError("missing ')'")
+            self.take()
+            return node
+        return _term(self.take())
+
+
+@functools.lru_cache(maxsize=64)
+def parse_query(text: str | None) -> Node | None:
+    """Compile a query; None matches every non-blank task. Raises QueryError."""
+    return _Parser(text or "").parse()
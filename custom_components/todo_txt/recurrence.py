@@ -0,0 +1,79 @@
+"""Recurring tasks, written with the common rec: extension.
+
+rec:<n><unit> repeats a task every n days (d), business days (b), weeks (w),
+months (m) or years (y). When it is completed, the next occurrence is due n
+units after the completion day; with a leading + (rec:+1w, strict) it is due
+n units after the old due date instead, so finishing late does not shift the
+schedule. A t: threshold date moves along with the due date.
+"""
+import calendar
+import datetime
+import re
+
+from pytodotxt import Task
+
+from .model import DUE_RE
+
+RULE_RE = re.compile(r'^(\+?)(\d+)([dbwmy])$')
+THRESHOLD_RE = re.compile(r'\bt:(\d{4}-\d{2}-\d{2})')
+# Tags that differ between occurrences of the same recurring task
+_DATE_TAGS_RE = re.compile(r'\s*\b(?:due|t):\d{4}-\d{2}-\d{2}')
+
+
+def parse_rule(value: str | None) -> tuple[bool, int, str] | None:
+    """(strict, amount, unit) of a rec: value, or None if it is not valid."""
+    match = RULE_RE.match(value or "")
+    if not match or int(match.group(2)) == 0:
+        return None
+    return bool(match.group(1)), int(match.group(2)), match.group(3)
+
+
+def add_interval(date: datetime.date, amount: int, unit: str) -> datetime.date:
+    if unit == "d":
+        return date + datetime.timedelta(days=amount)
+    if unit == "w":
+        return date + datetime.timedelta(weeks=amount)
+    if unit == "b":
+        while amount:
+            date += datetime.timedelta(days=1)
+            if date.weekday() < 5:
+                amount -= 1
+        return date
+    # Months and years keep the day of the month where it exists (Jan 31 -> Feb 28)
+    months = date.month - 1 + amount * (12 if unit == "y" else 1)
+    year, month = date.year + months // 12, months % 12 + 1
+    return date.replace(year=year, month=month, day=min(date.day, calendar.monthrange(year, month)[1]))
+
+
+def next_line(task: Task, rule: tuple[bool, int, str], due: datetime.date | None, today: datetime.date) -> str:
+    """The line of the occurrence after task, created today."""
+    strict, amount, unit = rule
+    body = task.description or ""
+    threshold = None
+    match = THRESHOLD_RE.search(body)
+    if match:
+        try:
+            threshold = datetime.date.fromisoformat(match.group(1))
+        except ValueError:
+            pass
+    if due is not None:
+        new_due = add_interval(due if strict else today, amount, unit)
+        body = DUE_RE.sub(f"due:{new_due.isoformat()}", body, count=1)
+        if threshold is not None:
+            # Keep the threshold the same distance before the due date
+            threshold += new_due - due
+    elif threshold is not None:
+        threshold = add_interval(threshold if strict else today, amount, unit)
+    if threshold is not None:
+        body = THRESHOLD_RE.sub(f"t:{threshold.isoformat()}", body, count=1)
+
+    parts = [f"({task.priority})"] if task.priority else []
+    parts.append(today.isoformat())
+    if body:
+        parts.append(body)
+    return " ".join(parts)
+
+
+def series_key(task: Task) -> str:
+    """What all occurrences of a recurring task have in common."""
+    return " ".join(_DATE_TAGS_RE.sub("", task.description or "").split())
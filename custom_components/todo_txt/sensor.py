@@ -0,0 +1,100 @@
+import datetime
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DATA_ENTITIES, DOMAIN
+from .store import TodoTxtFileStore, get_store
+
+# The values are cheap counters; writes/min is time based, so poll
+SCAN_INTERVAL = datetime.timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class TodoTxtSensorEntityDescription(SensorEntityDescription):
+    # Called with the file's shared store and the list entity of the config entry
+    value_fn: Callable[[TodoTxtFileStore, Any], Any]
+
+
+SENSORS = (
+    TodoTxtSensorEntityDescription(
+        key="last_parse",
+        name="Last parse",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda store, entity: store.stats.last_parse_ms,
+    ),
+    TodoTxtSensorEntityDescription(
+        key="task_count",
+        name="Tasks in file",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda store, entity: len(store.tasks),
+    ),
+    TodoTxtSensorEntityDescription(
+        key="filtered_count",
+        name="Tasks in list",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda store, entity: entity.filtered_count if entity is not None else None,
+    ),
+    TodoTxtSensorEntityDescription(
+        key="writes_per_minute",
+        name="Writes per minute",
+        native_unit_of_measurement="writes/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda store, entity: store.stats.writes_per_minute,
+    ),
+    TodoTxtSensorEntityDescription(
+        key="bytes_written",
+        name="Bytes written",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda store, entity: store.stats.bytes_written,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    if not entry.data.get("diagnostic_sensors"):
+        return
+    async_add_entities(TodoTxtStatsSensor(entry, description) for description in SENSORS)
+
+
+class TodoTxtStatsSensor(SensorEntity):
+    """One instrumentation value of a list and its file."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: TodoTxtSensorEntityDescription
+
+    def __init__(self, entry: ConfigEntry, description: TodoTxtSensorEntityDescription) -> None:
+        self.entity_description = description
+        self._entry_id = entry.entry_id
+        self._file_path = entry.data["file_path"]
+        self._attr_name = f"{entry.data['name']} {description.name}"
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        return get_store(self.hass, self._file_path) is not None
+
+    @property
+    def native_value(self) -> Any:
+        store = get_store(self.hass, self._file_path)
+        if store is None:
+            return None
+        entity = self.hass.data[DOMAIN].get(DATA_ENTITIES, {}).get(self._entry_id)
+        return self.entity_description.value_fn(store, entity)
@@ -0,0 +1,49 @@
+"""Last-known items of each list, kept in .storage.
+
+Restoring them lets a list show its items as soon as Home Assistant starts,
+while the file itself is parsed in the background. Items are stored as
+[uid, summary, completed, due] rows rather than dicts to keep the file small.
+"""
+import datetime
+
+from homeassistant.components.todo import TodoItem, TodoItemStatus
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_VERSION
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def items_to_snapshot(items: list[TodoItem]) -> dict:
+    return {
+        "items": [
+            [
+                item.uid,
+                item.summary,
+                1 if item.status == TodoItemStatus.COMPLETED else 0,
+                item.due.isoformat() if item.due else None,
+            ]
+            for item in items
+        ]
+    }
+
+
+def items_from_snapshot(data: dict | None) -> list[TodoItem] | None:
+    """The items of a snapshot, or None if there is none or it cannot be read."""
+    if not data:
+        return None
+    try:
+        return [
+            TodoItem(
+                uid=uid,
+                summary=summary,
+                status=TodoItemStatus.COMPLETED if completed else TodoItemStatus.NEEDS_ACTION,
+                due=datetime.date.fromisoformat(due) if due else None,
+            )
+            for uid, summary, completed, due in data["items"]
+        ]
+    except (KeyError, TypeError, ValueError):
+        return None
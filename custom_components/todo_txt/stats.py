@@ -0,0 +1,62 @@
+import time
+from collections import deque
+
+# Window for the writes-per-minute rate
+RATE_WINDOW = 60
+
+
+class StoreStats:
+    """Timings and counters of one shared store, for diagnostics and sensors.
+
+    Parses and cache restores are recorded on the event loop, writes on the
+    file's I/O worker while the store lock is held. Every field is replaced
+    with a single assignment, so readers never see a half-made update.
+    """
+
+    def __init__(self) -> None:
+        self.parses = 0
+        self.last_parse_ms: float | None = None
+        # Lines that were actually (re)parsed, as opposed to reused, last time
+        self.last_parse_lines = 0
+        # Loads of the whole file from the parse cache, which parse nothing
+        self.restores = 0
+        self.last_restore_ms: float | None = None
+        self.writes = 0
+        self.last_write_ms: float | None = None
+        self.bytes_written = 0
+        self._write_times: deque[float] = deque()
+
+    def record_parse(self, seconds: float, lines: int) -> None:
+        self.parses += 1
+        self.last_parse_ms = seconds * 1000
+        self.last_parse_lines = lines
+
+    def record_restore(self, seconds: float) -> None:
+        self.restores += 1
+        self.last_restore_ms = seconds * 1000
+
+    def record_write(self, seconds: float, size: int) -> None:
+        self.writes += 1
+        self.last_write_ms = seconds * 1000
+        self.bytes_written += size
+        self._write_times.append(time.monotonic())
+
+    @property
+    def writes_per_minute(self) -> int:
+        cutoff = time.monotonic() - RATE_WINDOW
+        while self._write_times and self._write_times[0] < cutoff:
+            self._write_times.popleft()
+        return len(self._write_times)
+
+    def as_dict(self) -> dict:
+        return {
+            "parses": self.parses,
+            "last_parse_ms": self.last_parse_ms,
+            "last_parse_lines": self.last_parse_lines,
+            "restores": self.restores,
+            "last_restore_ms": self.last_restore_ms,
+            "writes": self.writes,
+            "writes_per_minute": self.writes_per_minute,
+            "last_write_ms": self.last_write_ms,
+            "bytes_written": self.bytes_written,
+        }
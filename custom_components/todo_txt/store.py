@@ -0,0 +1,796 @@
+import asyncio
+import datetime
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+from pytodotxt import Task
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .archive import ArchiveFile, is_archivable
+from .cache import CachedModel, ParseCache
+from .const import (
+    ARCHIVE_INTERVAL,
+    ARCHIVE_SIZE_THRESHOLD,
+    DATA_STORES,
+    DATA_WORKERS,
+    DEFAULT_PARSE_BUDGET,
+    DEFAULT_WRITE_DELAY,
+    DOMAIN,
+    JOURNAL_LIMIT,
+)
+from .filters import TokenIndex
+from .model import LazyTask, TaskInfo, is_same_task
+from .parser import IncrementalParser, ParseDelta
+from .recurrence import next_line, parse_rule, series_key
+from .stats import StoreStats
+from .watcher import TodoTxtFileWatcher, stat_signature
+from .worker import FileWorker
+from .merge import merge_lines
+from .writer import StaleOffsetError, append_bytes, file_lock, write_at, write_atomic
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TodoTxtFileStore:
+    """Parsed tasks of one todo.txt file, shared by every entity that points at it."""
+
+    def __init__(self, file_path: str, hass: HomeAssistant = None, worker: FileWorker | None = None) -> None:
+        self.hass = hass
+        self.file_path = file_path
+        self.tasks: list[Task] = []
+        # Mirrors what is on disk, so writes can patch the file instead of rewriting it
+        self._parser = IncrementalParser()
+        # What the most recent read changed, for consumers that can update incrementally
+        self.last_delta = ParseDelta()
+        # Shared by all entities on this file to answer their filters
+        self.index = TokenIndex()
+        self._info: dict[Task, TaskInfo] = {}
+        # Stable ids handed out as TodoItem uids
+        self._uids: dict[str, Task] = {}
+        # Tasks with a rec: tag, so recurrences never need a pass over the whole file
+        self.recurring: set[Task] = set()
+        # Bumped whenever the in-memory tasks change (parse or local write)
+        self.version = 0
+        # Tasks tracked (True) and untracked (False) since journal_start, for
+        # entities that update their views incrementally
+        self._journal: list[tuple[bool, Task]] = []
+        self._journal_start = 0
+        self._signature = None
+        # Bumped on the worker whenever a parse or merge changes what the parser
+        # mirrors, and the last of those the tasks on the event loop caught up with
+        self._generation = 0
+        self._applied_generation = 0
+        # Whether the file has been parsed at least once, and the background parse doing so
+        self.loaded = False
+        self._load_task: asyncio.Task | None = None
+        # Positions of on-disk tasks edited in memory, and whether only a full rewrite will do
+        self._dirty: set[int] = set()
+        self._needs_rewrite = False
+        # Completed tasks removed from the list that still have to reach done.txt
+        self._archived: list[Task] = []
+        self.archive = ArchiveFile(file_path)
+        # Days after completion to archive a task; None disables archiving
+        self.archive_days: int | None = None
+        self._cancel_archive_timer = None
+        self._lock = threading.Lock()
+        # Serializes this file's disk I/O off the shared executor
+        self.worker = worker or FileWorker(file_path)
+        # Parsed model of the file as of the last restart or reload, if enabled
+        self.cache: ParseCache | None = None
+        self._cached_version: int | None = None
+        self.restored_from_cache = False
+        # Seconds to collect changes before committing them in one write
+        self.write_delay = DEFAULT_WRITE_DELAY / 1000
+        self._cancel_commit = None
+        self.stats = StoreStats()
+        # Milliseconds a parse may take before we warn about it
+        self.parse_budget = DEFAULT_PARSE_BUDGET
+        self._listeners: list[Callable[[], None]] = []
+        self._watcher: TodoTxtFileWatcher | None = None
+        self.cancel_stop_listener = None
+
+    def _stat_signature(self):
+        return stat_signature(self.file_path)
+
+    def _read_bytes(self) -> bytes:
+        with open(self.file_path, 'rb') as f:
+            return f.read()
+
+    def read(self) -> ParseDelta | None:
+        """Parse the lines that changed since the last read or write.
+
+        Returns the delta, which is falsy if the tasks did not change.
+        """
+        return self._apply_parse(list(self.tasks), self._parse_file())
+
+    def _parse_file(self) -> tuple[ParseDelta, list[Task], float, CachedModel | None, int] | None:
+        """I/O half of read(): returns the delta, the parsed tasks, the time taken, any cached model and the parser generation."""
+        with self._lock:
+            if not os.path.exists(self.file_path):
+                with open(self.file_path, 'w') as f:
+                    pass
+            with file_lock(self.file_path, exclusive=False):
+                signature = self._stat_signature()
+                if signature is not None and signature == self._signature:
+                    return None
+                data = self._read_bytes()
+            start = time.perf_counter()
+            model = None
+            if self.cache is not None and not self._parser.lines:
+                model = self._restore(data, signature)
+            delta = ParseDelta(added=list(model.tasks)) if model else self._parser.parse(data)
+            self._signature = signature
+            self._generation += 1
+            return delta, list(self._parser.tasks), time.perf_counter() - start, model, self._generation
+
+    def _restore(self, data: bytes, signature) -> CachedModel | None:
+        """Load the parser from the cache if it holds this version of the file."""
+        model = None
+
+        def build(lines: list[bytes]) -> list[Task] | None:
+            nonlocal model
+            model = self.cache.load(self.file_path, signature, lines, self._parser.encoding)
+            return model.tasks if model else None
+
+        self._parser.restore(data, build)
+        return model
+
+    def _apply_parse(self, tasks: list[Task], parsed) -> ParseDelta | None:
+        """Event loop half of read(); tasks is what the list held when the parse started."""
+        self.loaded = True
+        if parsed is None:
+            return None
+        delta, parsed_tasks, seconds, model, generation = parsed
+        # Folded or not, the tasks now account for everything this parse saw
+        self._applied_generation = generation
+        if model is not None and not self._info:
+            self._adopt(model)
+            self.last_delta = delta
+            self.version += 1
+            self._cached_version = self.version
+            self.restored_from_cache = True
+            self._record_restore(seconds)
+            return delta
+        if self.tasks == tasks:
+            self.tasks = parsed_tasks
+            self._dirty.clear()
+            self._needs_rewrite = False
+        else:
+            self._fold_delta(delta)
+        self._apply_delta(delta)
+        self._record_parse(seconds, delta)
+        return delta
+
+    def _adopt(self, model: CachedModel) -> None:
+        """Take over the tasks, attributes, uids and index of a cached file."""
+        self.tasks = model.tasks
+        self._info = model.info
+        self._uids = model.uids
+        self.recurring = model.recurring
+        self.index = TokenIndex()
+        self.index.restore(model.postings, model.tasks)
+        self._dirty.clear()
+        self._needs_rewrite = False
+        # Cached tasks use their line numbers as seq; later tasks must sort after them
+        self._journal_start = max(self.journal_position, len(model.tasks)) + 1
+        self._journal = []
+
+    def queue_cache_save(self) -> None:
+        """Save the parsed file to the cache once the queued I/O is done, if it changed."""
+        if self.cache is None or not self.loaded or self.version == self._cached_version:
+            return
+        if self.has_pending_write or self._dirty or self._needs_rewrite:
+            # Only what is on disk can be cached
+            return
+        tasks = list(self.tasks)
+        infos = [self._info[task] for task in tasks]
+        self._cached_version = self.version
+        self.worker.submit(self._save_cache, tasks, infos)
+
+    def _save_cache(self, tasks: list[Task], infos: list[TaskInfo]) -> None:
+        with self._lock:
+            if self._parser.tasks != tasks or self._signature is None:
+                # Another write got in first; it is cached next time
+                return
+            lines = list(self._parser.lines)
+            signature = self._signature
+        try:
+            self.cache.save(self.file_path, signature, lines, tasks, infos)
+        except OSError as err:
+            _LOGGER.warning("Could not save the parse cache of %s: %s", self.file_path, err)
+
+    def _record_parse(self, seconds: float, delta: ParseDelta) -> None:
+        lines = len(delta.added) + len(delta.modified)
+        self.stats.record_parse(seconds, lines)
+        if seconds * 1000 > self.parse_budget:
+            _LOGGER.warning(
+                "Parsing %s took %.0f ms for %d changed line(s) of %d, over the %d ms budget",
+                self.file_path,
+                seconds * 1000,
+                lines,
+                len(self.tasks),
+                self.parse_budget,
+            )
+
+    def _record_restore(self, seconds: float) -> None:
+        self.stats.record_restore(seconds)
+        if seconds * 1000 > self.parse_budget:
+            _LOGGER.warning(
+                "Loading %s (%d lines) from the parse cache took %.0f ms, over the %d ms budget",
+                self.file_path,
+                len(self.tasks),
+                seconds * 1000,
+                self.parse_budget,
+            )
+        else:
+            _LOGGER.debug("Loaded %s (%d lines) from the parse cache", self.file_path, len(self.tasks))
+
+    def _apply_delta(self, delta: ParseDelta) -> None:
+        if not delta:
+            return
+        for task in delta.removed:
+            self._untrack(task)
+        for old_task, new_task in delta.modified:
+            # A line edited in place keeps its uid, unless it is really another
+            # task that took the place of a deleted one
+            old_info = self._info.get(old_task)
+            uid = self._untrack(old_task)
+            if old_info is not None and not is_same_task(old_info.line, str(new_task)):
+                uid = None
+            self._track(new_task, uid)
+        for task in delta.added:
+            self._track(task)
+        self.last_delta = delta
+        self.version += 1
+
+    def set_tasks(self, tasks: list[Task]) -> None:
+        """Replace the in-memory tasks wholesale and re-index them."""
+        self.tasks = tasks
+        self._parser.sync(tasks)
+        # The file on disk has not seen these tasks, so the next write is a full one
+        self._needs_rewrite = True
+        self.index = TokenIndex()
+        self._info = {}
+        self._uids = {}
+        self.recurring = set()
+        for linenr, task in enumerate(tasks):
+            task.linenr = linenr
+            self._track(task)
+        self._reset_journal()
+        self.loaded = True
+        self.version += 1
+
+    @property
+    def journal_position(self) -> int:
+        return self._journal_start + len(self._journal)
+
+    def changes_since(self, position: int | None) -> list[tuple[bool, Task]] | None:
+        """(tracked, task) changes after position, or None if they are no longer known."""
+        if position is None or position < self._journal_start:
+            return None
+        return self._journal[position - self._journal_start:]
+
+    def _reset_journal(self) -> None:
+        # Everyone behind the current position has to start over
+        self._journal_start = self.journal_position + 1
+        self._journal = []
+
+    def _record(self, tracked: bool, task: Task) -> None:
+        self._journal.append((tracked, task))
+        if len(self._journal) > JOURNAL_LIMIT:
+            self._reset_journal()
+
+    def _track(self, task: Task, uid: str | None = None) -> None:
+        info = self._info[task] = TaskInfo(task)
+        info.seq = self.journal_position
+        self._record(True, task)
+        if uid is None or uid in self._uids:
+            uid = self._new_uid(info)
+        info.uid = uid
+        self._uids[uid] = task
+        self.index.add(task, info.tokens)
+        if info.recurrence:
+            self.recurring.add(task)
+
+    def _untrack(self, task: Task) -> str | None:
+        """Forget a task; returns its uid so a replacement can inherit it."""
+        self.recurring.discard(task)
+        info = self._info.pop(task, None)
+        if info is None:
+            return None
+        self.index.remove(task, info.tokens)
+        self._record(False, task)
+        if self._uids.get(info.uid) is task:
+            del self._uids[info.uid]
+        return info.uid
+
+    def _new_uid(self, info: TaskInfo) -> str:
+        # An explicit id: tag wins; otherwise hash the line, numbering duplicates
+        base = info.task_id or hashlib.blake2b(info.line.encode(), digest_size=6).hexdigest()
+        uid = base
+        suffix = 1
+        while uid in self._uids:
+            uid = f"{base}-{suffix}"
+            suffix += 1
+        return uid
+
+    def get_task(self, uid: str) -> Task | None:
+        return self._uids.get(uid)
+
+    def _position(self, task: Task) -> int:
+        # linenr is kept in step with the list, so this is O(1) unless it went stale
+        linenr = getattr(task, "linenr", None)
+        if linenr is not None and linenr < len(self.tasks) and self.tasks[linenr] is task:
+            return linenr
+        return self.tasks.index(task)
+
+    def info(self, task: Task) -> TaskInfo:
+        """Cached derived attributes (due date, sort key, ...) of a task."""
+        info = self._info.get(task)
+        if info is None:
+            info = self._info[task] = TaskInfo(task)
+        return info
+
+    def tracked_info(self, task: Task) -> TaskInfo | None:
+        """The TaskInfo of a task currently in the list, else None."""
+        return self._info.get(task)
+
+    def uid(self, task: Task) -> str:
+        return self.info(task).uid
+
+    def source(self, task: Task) -> str | None:
+        # Only lists over several files (AggregateStore) name the file of each item
+        return None
+
+    def append_task(self, task: Task) -> None:
+        task.linenr = len(self.tasks)
+        self.tasks.append(task)
+        self._track(task)
+
+    def replace_task(self, old_task: Task, task: Task) -> None:
+        """Swap in an edited task at the same position and with the same uid."""
+        linenr = self._position(old_task)
+        task.linenr = linenr
+        self.tasks[linenr] = task
+        self._track(task, self._untrack(old_task))
+        if linenr < len(self._parser.lines):
+            self._dirty.add(linenr)
+
+    def remove_tasks(self, tasks: list[Task]) -> None:
+        self.update_tasks(dict.fromkeys(tasks))
+
+    def update_tasks(self, changes: dict[Task, Task | None]) -> None:
+        """Replace or delete many tasks in one pass over the list.
+
+        changes maps each task to its replacement, or to None to delete it.
+        Replacements keep their position and uid. Costs O(n + k) however many
+        tasks change, and like the single-task methods it only stages the
+        changes for the next write.
+        """
+        changes = {task: new for task, new in changes.items() if task in self._info}
+        if not changes:
+            return
+        if len(changes) == 1:
+            # The common single edit does not need to walk the list
+            (task, new), = changes.items()
+            if new is not None:
+                self.replace_task(task, new)
+                return
+
+        kept = []
+        for task in self.tasks:
+            if task not in changes:
+                task.linenr = len(kept)
+                kept.append(task)
+                continue
+            new = changes[task]
+            uid = self._untrack(task)
+            if new is None:
+                self._needs_rewrite = True
+                continue
+            new.linenr = len(kept)
+            kept.append(new)
+            self._track(new, uid)
+            if new.linenr < len(self._parser.lines):
+                self._dirty.add(new.linenr)
+        self.tasks = kept
+
+    @property
+    def has_pending_write(self) -> bool:
+        return self._cancel_commit is not None
+
+    def _take_pending(self) -> tuple[list[Task], set[int], bool, list[Task], int]:
+        """Snapshot the changes to commit and start collecting a new batch."""
+        pending = (list(self.tasks), self._dirty, self._needs_rewrite, self._archived, self._applied_generation)
+        self._dirty = set()
+        self._needs_rewrite = False
+        self._archived = []
+        return pending
+
+    def write(self, pending: tuple[list[Task], set[int], bool, list[Task], int] | None = None) -> ParseDelta | None:
+        """Persist in-memory changes with the smallest write that will do.
+
+        New tasks are appended with one O_APPEND write and same-length edits
+        are patched in place. Deletes and edits that change a line's length
+        rewrite the file atomically via a temp file and rename.
+
+        If the file changed since we last parsed it (Syncthing, a phone app),
+        our changes are three-way merged into the new content instead of
+        overwriting it. Returns the delta the merge brought in, if any.
+
+        Archived tasks are appended (and fsync'ed) to done.txt before they are
+        removed from todo.txt, so a crash in between can at worst leave a task
+        in both files, never in neither.
+        """
+        tasks, dirty, needs_rewrite, archived, generation = pending if pending is not None else self._take_pending()
+        return self._apply_merge(tasks, self._commit(tasks, dirty, needs_rewrite, archived, generation), archived)
+
+    def _commit(
+        self, tasks: list[Task], dirty: set[int], needs_rewrite: bool, archived: list[Task], generation: int
+    ) -> tuple[ParseDelta, list[Task], int] | bool | None:
+        """I/O half of write(); returns the merge delta, merged tasks and generation if it merged.
+
+        Returns False without writing if a parse or merge the tasks have not
+        caught up with ran in between: line numbers and dirty positions refer
+        to the file before it, and the folded changes are committed next.
+        """
+        with self._lock, file_lock(self.file_path):
+            if generation != self._generation:
+                return False
+            start = time.perf_counter()
+            if archived:
+                self.archive.append([self._parser.encode(task) for task in archived], self._parser.linesep)
+            current = self._stat_signature()
+            in_sync = self._signature is not None and current == self._signature
+            if not in_sync and self._signature is not None and current is not None:
+                data = self._read_bytes()
+                if self._parser.same_content(data):
+                    # Touched, but not changed (e.g. a sync tool restoring the mtime)
+                    in_sync = True
+                else:
+                    return self._write_merged(tasks, data, start)
+            written = self._write_incremental(tasks, dirty) if in_sync and not needs_rewrite else None
+            if written is None:
+                payload = self._parser.sync(tasks)
+                write_atomic(self.file_path, payload)
+                written = len(payload)
+                for linenr, task in enumerate(tasks):
+                    task.linenr = linenr
+            # Our own write must not trigger a re-parse
+            self._signature = self._stat_signature()
+            self.stats.record_write(time.perf_counter() - start, written)
+            return None
+
+    def _write_merged(self, tasks: list[Task], data: bytes, start: float) -> tuple[ParseDelta, list[Task]]:
+        parser = self._parser
+        theirs = parser.split_lines(data)
+        merged, conflicts = merge_lines(parser.lines, [parser.encode(task) for task in tasks], theirs)
+        if conflicts:
+            _LOGGER.warning(
+                "%s was changed on disk while we were editing it; kept both versions of %d conflicting edit(s)",
+                self.file_path,
+                conflicts,
+            )
+        else:
+            _LOGGER.debug("Merged our changes into externally modified %s", self.file_path)
+
+        # Diff the merged content against our tasks so ours keep their objects and uids
+        parser.sync(tasks)
+        sep = parser.linesep.encode()
+        payload = b"".join(line + sep for line in merged)
+        write_atomic(self.file_path, payload)
+        self.stats.record_write(time.perf_counter() - start, len(payload))
+        delta = parser.parse(payload)
+        self._signature = self._stat_signature()
+        self._generation += 1
+        return delta, list(parser.tasks), self._generation
+
+    def _apply_merge(self, tasks: list[Task], merged, archived: list[Task] = ()) -> ParseDelta | None:
+        """Event loop half of write(): take in what a merge brought in."""
+        if merged is False:
+            # Nothing was written; stage it all again on top of the folded changes
+            self._needs_rewrite = True
+            self._archived[:0] = archived
+            return None
+        if merged is None:
+            return None
+        delta, merged_tasks, generation = merged
+        self._applied_generation = generation
+        if self.tasks == tasks:
+            self.tasks = merged_tasks
+        else:
+            self._fold_delta(delta)
+        self._apply_delta(delta)
+        return delta
+
+    def _fold_delta(self, delta: ParseDelta) -> None:
+        """Edits raced with a disk read: fold its changes into ours and rewrite next time."""
+        for task in delta.removed:
+            if task in self._info:
+                self.tasks.pop(self._position(task))
+        for old_task, new_task in delta.modified:
+            if old_task in self._info:
+                self.tasks[self._position(old_task)] = new_task
+        self.tasks.extend(delta.added)
+        self._needs_rewrite = True
+
+    def _write_incremental(self, tasks: list[Task], dirty: set[int]) -> int | None:
+        """Patch edits in place and append new tasks; returns the bytes written, or None if that is not possible."""
+        parser = self._parser
+        edits = []
+        for linenr in sorted(dirty):
+            line = parser.encode(tasks[linenr])
+            if len(line) != len(parser.lines[linenr]):
+                return None
+            edits.append((linenr, line))
+
+        written = 0
+        for linenr, line in edits:
+            try:
+                write_at(self.file_path, parser.offsets[linenr], parser.lines[linenr], line)
+            except StaleOffsetError:
+                return None
+            parser.replace_line(linenr, tasks[linenr], line)
+            written += len(line)
+
+        appended = tasks[len(parser.lines):]
+        if appended:
+            lines = [parser.encode(task) for task in appended]
+            payload = parser.append_payload(lines)
+            append_bytes(self.file_path, payload)
+            parser.append_lines(appended, lines)
+            written += len(payload)
+        return written
+
+    async def async_save(self) -> None:
+        """Refresh every entity using this file and schedule the disk commit.
+
+        Entities see the change immediately. Changes made within write_delay
+        of each other (e.g. ticking off ten items in a row, or an automation
+        adding items in a loop) are committed to disk together.
+        """
+        self.version += 1
+        self.async_notify()
+        if self.write_delay <= 0:
+            await self._async_commit()
+        elif self._cancel_commit is None:
+            self._cancel_commit = async_call_later(self.hass, self.write_delay, self._async_commit)
+
+    async def _async_commit(self, _now=None) -> None:
+        self._cancel_commit = None
+        tasks, dirty, needs_rewrite, archived, generation = self._take_pending()
+        merged = await self.worker.async_run(self._commit, tasks, dirty, needs_rewrite, archived, generation)
+        if self._apply_merge(tasks, merged, archived):
+            # The merge pulled in external edits; show them everywhere
+            self.async_notify()
+        await self._async_commit_folded()
+
+    async def _async_commit_folded(self) -> None:
+        # Local edits that raced a parse or merge were folded into its result,
+        # or a commit was turned back; either way they still have to reach the
+        # disk, and a later parse must not find them staged but unwritten
+        if self._needs_rewrite and not self.has_pending_write:
+            await self._async_commit()
+
+    def recur(self, completed: list[Task], today: datetime.date | None = None) -> int:
+        """Append the next occurrence of each recurring task in completed.
+
+        completed holds the tasks as they were before being marked done. A
+        series that already has an open occurrence (e.g. one a phone app
+        created) is skipped; finding those only walks the recurring tasks.
+        Like the other edits, this is staged for the next write, so the new
+        occurrence lands on disk together with the completion.
+        """
+        today = today or dt_util.now().date()
+        due = []
+        for task in completed:
+            info = self._info.get(task) or TaskInfo(task)
+            rule = parse_rule(info.recurrence)
+            if rule is not None:
+                due.append((task, rule, info.due))
+        if not due:
+            return 0
+        open_series = {series_key(task) for task in self.recurring if not self._info[task].is_completed}
+        count = 0
+        for task, rule, due_date in due:
+            key = series_key(task)
+            if key in open_series:
+                continue
+            open_series.add(key)
+            self.append_task(LazyTask(next_line(task, rule, due_date, today)))
+            count += 1
+        return count
+
+    def archive_completed(self, max_age_days: int, today: datetime.date | None = None) -> int:
+        """Move completed tasks older than max_age_days out of the list, towards done.txt."""
+        cutoff = (today or dt_util.now().date()) - datetime.timedelta(days=max_age_days)
+        done = [task for task in self.tasks if self.info(task).is_completed and is_archivable(task, cutoff)]
+        if done:
+            self.remove_tasks(done)
+            self._archived.extend(done)
+        return len(done)
+
+    async def async_archive(self, _now=None) -> int:
+        """Archive old completed tasks if enabled, committing both files together."""
+        if self.archive_days is None:
+            return 0
+        count = self.archive_completed(self.archive_days)
+        if count:
+            _LOGGER.info("Archiving %d completed task(s) from %s to %s", count, self.file_path, self.archive.file_path)
+            await self.async_save()
+        return count
+
+    async def async_flush(self) -> None:
+        """Commit a pending batch right away."""
+        if self._cancel_commit is not None:
+            self._cancel_commit()
+            await self._async_commit()
+
+    async def async_load(self) -> ParseDelta | None:
+        """Bring the in-memory tasks up to date with the file."""
+        # Local changes go to disk first so re-reading cannot drop them
+        await self.async_flush()
+        tasks = list(self.tasks)
+        delta = self._apply_parse(tasks, await self.worker.async_run(self._parse_file))
+        await self._async_commit_folded()
+        return delta
+
+    def async_start_load(self) -> asyncio.Task:
+        """Parse the file in the background, once however many lists are waiting for it."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_background_task(
+                self._async_initial_load(), f"todo_txt initial load of {self.file_path}"
+            )
+        return self._load_task
+
+    async def _async_initial_load(self) -> None:
+        try:
+            await self.async_load()
+        except Exception:
+            # Let the next async_ready try again instead of re-raising this error
+            self._load_task = None
+            raise
+        self.async_notify()
+        # Next time, start from the cache instead of parsing again
+        self.queue_cache_save()
+
+    async def async_ready(self) -> None:
+        """Wait for the first parse; edits must not be made against a snapshot."""
+        if not self.loaded:
+            await asyncio.shield(self.async_start_load())
+
+    async def async_load_archive(self) -> list[Task]:
+        """Tasks in done.txt, read in order with our own appends to it."""
+        return await self.worker.async_run(self.archive.load)
+
+    def async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    async def async_reload(self) -> None:
+        """Pick up changes made elsewhere; only re-parses if the file really changed.
+
+        Called by the watcher and by homeassistant.update_entity. Every list
+        on the file is told, and tasks completed elsewhere recur.
+        """
+        delta = await self.async_load()
+        if delta:
+            self.async_notify()
+            # Tasks ticked off in another app still recur, unless that app took care of it
+            done = [
+                old for old, new in delta.modified
+                if new in self.recurring and new.is_completed and not old.is_completed
+            ]
+            if done and self.recur(done):
+                await self.async_save()
+            if self.archive_days is not None and self._parser.size > ARCHIVE_SIZE_THRESHOLD:
+                await self.async_archive()
+
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        self._listeners.append(update_callback)
+        if self.hass is not None and self._watcher is None:
+            self._watcher = TodoTxtFileWatcher(self.hass, self.file_path, self.async_reload)
+            self._watcher.async_start()
+            self._cancel_archive_timer = async_track_time_interval(
+                self.hass, self.async_archive, ARCHIVE_INTERVAL
+            )
+
+        def remove_listener() -> None:
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+            if not self._listeners and self._watcher is not None:
+                self._watcher.async_stop()
+                self._watcher = None
+                self._cancel_archive_timer()
+                self._cancel_archive_timer = None
+
+        return remove_listener
+
+    @property
+    def has_listeners(self) -> bool:
+        return bool(self._listeners)
+
+    def diagnostics(self) -> dict:
+        return {
+            "tasks": len(self.tasks),
+            "size": self._parser.size,
+            "uses_inotify": self._watcher.uses_inotify if self._watcher is not None else None,
+            "write_delay_ms": self.write_delay * 1000,
+            "parse_budget_ms": self.parse_budget,
+            "pending_write": self.has_pending_write,
+            "archive_days": self.archive_days,
+            "restored_from_cache": self.restored_from_cache,
+            "recurring_tasks": len(self.recurring),
+            **self.stats.as_dict(),
+        }
+
+
+def async_get_store(
+    hass: HomeAssistant,
+    file_path: str,
+    write_delay: int = DEFAULT_WRITE_DELAY,
+    archive_days: int | None = None,
+    parse_budget: int = DEFAULT_PARSE_BUDGET,
+) -> TodoTxtFileStore:
+    """Return the shared store for file_path, creating it on first use."""
+    stores = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_STORES, {})
+    key = os.path.realpath(file_path)
+    store = stores.get(key)
+    if store is None:
+        _LOGGER.debug("Creating shared store for %s", key)
+        # The worker outlives reloads, so a reloaded list queues behind the cache save of the old one
+        workers = hass.data[DOMAIN].setdefault(DATA_WORKERS, {})
+        if key not in workers:
+            workers[key] = FileWorker(file_path)
+        store = stores[key] = TodoTxtFileStore(file_path, hass, workers[key])
+        store.cache = ParseCache(cache_path(hass, key))
+        store.write_delay = write_delay / 1000
+        store.parse_budget = parse_budget
+
+        async def _async_flush_on_stop(event: Event) -> None:
+            await store.async_flush()
+            store.queue_cache_save()
+
+        store.cancel_stop_listener = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, _async_flush_on_stop
+        )
+    else:
+        # Lists sharing a file share its write queue; the most eager one wins
+        store.write_delay = min(store.write_delay, write_delay / 1000)
+        store.parse_budget = min(store.parse_budget, parse_budget)
+    if archive_days is not None:
+        # Archiving is per file; if several lists enable it, the shortest age wins
+        store.archive_days = archive_days if store.archive_days is None else min(store.archive_days, archive_days)
+    return store
+
+
+def cache_path(hass: HomeAssistant, key: str) -> str:
+    """Where the parse cache of the file at real path key is kept."""
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return hass.config.path(".storage", f"{DOMAIN}.cache.{digest}")
+
+
+def async_release_store(hass: HomeAssistant, store: TodoTxtFileStore) -> None:
+    """Drop the shared store once no entity is using it anymore."""
+    if store.has_listeners:
+        return
+    stores = hass.data.get(DOMAIN, {}).get(DATA_STORES, {})
+    key = os.path.realpath(store.file_path)
+    if stores.get(key) is store:
+        stores.pop(key)
+        store.queue_cache_save()
+        if store.cancel_stop_listener is not None:
+            store.cancel_stop_listener()
+            store.cancel_stop_listener = None
+
+
+def get_store(hass: HomeAssistant, file_path: str) -> TodoTxtFileStore | None:
+    """The shared store for file_path if one is open, without creating it."""
+    return hass.data.get(DOMAIN, {}).get(DATA_STORES, {}).get(os.path.realpath(file_path))
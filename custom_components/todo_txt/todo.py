@@ -1,10 +1,11 @@
 import datetime
-import os
 import logging
 import re
+import time
 from typing import Any
 
-from pytodotxt import TodoTxt, Task
+import voluptuous as vol
+from pytodotxt import Task
 from homeassistant.components.todo import (
     TodoItem,
     TodoItemStatus,
@@ -12,20 +13,110 @@ from homeassistant.components.todo import (
     TodoListEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_time, async_track_time_change
+from homeassistant.util import dt as dt_util
+
+from .aggregate import AggregateStore, resolve_paths
+from .const import (
+    DATA_ENTITIES,
+    DEFAULT_PARSE_BUDGET,
+    DEFAULT_WRITE_DELAY,
+    DOMAIN,
+    EVENT_TASK_DUE,
+    EVENT_TASK_OVERDUE,
+    SNAPSHOT_SAVE_DELAY,
+)
+from .due import DUE, DueIndex
+from .filters import TaskFilter
+from .model import LazyTask, TaskInfo, completed_line
+from .query import QueryError, parse_query
+from .snapshot import items_from_snapshot, items_to_snapshot, snapshot_store
+from .store import TodoTxtFileStore, async_get_store, async_release_store
+from .view import SortedView
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def valid_query(value: str) -> str:
+    try:
+        parse_query(value)
+    except QueryError as err:
+        raise vol.Invalid(f"Invalid filter: {err}") from err
+    return value
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     file_path = entry.data["file_path"]
     name = entry.data["name"]
     filter_tag = entry.data.get("filter")
-    async_add_entities([TodoTxtListEntity(name, file_path, entry.entry_id, filter_tag)], update_before_add=True)
+    extra_paths = []
+    if entry.data.get("extra_files"):
+        extra_paths = await hass.async_add_executor_job(resolve_paths, entry.data["extra_files"], file_path)
+    stores = [
+        async_get_store(
+            hass,
+            path,
+            entry.data.get("write_delay", DEFAULT_WRITE_DELAY),
+            entry.data.get("archive_days"),
+            entry.data.get("parse_budget", DEFAULT_PARSE_BUDGET),
+        )
+        for path in [file_path, *extra_paths]
+    ]
+    # Several files are merged into one list; each keeps its own shared store
+    store = AggregateStore(stores) if extra_paths else stores[0]
+    entity = TodoTxtListEntity(
+        name, file_path, entry.entry_id, filter_tag, store, entry.data.get("completed_limit")
+    )
+    # Found by entry id by the diagnostics and the optional sensors
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ENTITIES, {})[entry.entry_id] = entity
+    # Not update_before_add: the entity shows its snapshot and the file is parsed in the background
+    async_add_entities([entity])
+
+    # done.txt is only read when someone asks for the completed history
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        "get_archive",
+        {vol.Optional("limit"): cv.positive_int},
+        "async_get_archive",
+        supports_response=SupportsResponse.ONLY,
+    )
+    platform.async_register_entity_service(
+        "add_items",
+        {
+            vol.Required("items"): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional("due_date"): cv.date,
+        },
+        "async_add_items",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    platform.async_register_entity_service(
+        "import_lines",
+        {vol.Required("lines"): vol.All(cv.ensure_list, [cv.string])},
+        "async_import_lines",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    platform.async_register_entity_service(
+        "complete_matching",
+        {vol.Required("filter"): vol.All(cv.string, vol.Length(min=1), valid_query)},
+        "async_complete_matching",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    platform.async_register_entity_service(
+        "remove_completed",
+        {},
+        "async_remove_completed",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
 
 class TodoTxtListEntity(TodoListEntity):
+    # The shared store pushes updates from its file watcher, no need to poll
+    _attr_should_poll = False
     _attr_supported_features = (
         TodoListEntityFeature.CREATE_TODO_ITEM
         | TodoListEntityFeature.DELETE_TODO_ITEM
@@ -33,51 +124,187 @@ class TodoTxtListEntity(TodoListEntity):
         | TodoListEntityFeature.SET_DUE_DATE_ON_ITEM
     )
 
-    def __init__(self, name: str, file_path: str, entry_id: str, filter_tag: str = None) -> None:
+    def __init__(
+        self,
+        name: str,
+        file_path: str,
+        entry_id: str,
+        filter_tag: str = None,
+        store: TodoTxtFileStore | AggregateStore = None,
+        completed_limit: int | None = None,
+    ) -> None:
         self._attr_name = name
         self._file_path = file_path
+        self._entry_id = entry_id
         self._attr_unique_id = f"{entry_id}_{filter_tag}" if filter_tag else entry_id
         
-        # Parse filters
-        self._include_filters = []
-        self._exclude_filters = []
-        if filter_tag:
-            for token in filter_tag.split():
-                token = token.strip()
-                if not token:
-                    continue
-                if token.startswith("-"):
-                    # Exclude filter (remove the leading '-')
-                    exclude_val = token[1:]
-                    if exclude_val:
-                        self._exclude_filters.append(exclude_val)
-                else:
-                    self._include_filters.append(token)
-                    
-        self._todotxt = TodoTxt(self._file_path)
-        # We store pairs of (original_index, task) to handle filtering properly
-        self._filtered_tasks: list[tuple[int, Task]] = []
+        # Compiled once; matching is answered from the store's shared token index
+        try:
+            self._filter = TaskFilter(filter_tag)
+        except QueryError as err:
+            # Saved before filters were queries, and never validated as one
+            _LOGGER.warning(
+                "The filter %r of %s is not a valid query (%s); matching its words literally", filter_tag, name, err
+            )
+            self._filter = TaskFilter(filter_tag, literal=True)
+        # Show at most this many completed tasks (None shows all)
+        self._completed_limit = completed_limit
+
+        # Entities on the same file share one store, so the file is parsed once per change
+        self._store = store if store is not None else TodoTxtFileStore(self._file_path)
+        self._remove_listener = None
+        self._remove_date_listener = None
+        # Filtered and sorted tasks; each is addressed by its stable uid from the store
+        self._filtered_tasks: list[Task] = []
+        # Every matching task in display order, and how far into the store's
+        # journal of changes it is up to date (None forces a full rebuild)
+        self._view = SortedView()
+        self._journal_position: int | tuple[int, ...] | None = None
+        # Open tasks in the view with a due date, and the one timer for the
+        # next day one of them becomes due or overdue
+        self._due = DueIndex()
+        self._due_timer_day: int | None = None
+        self._cancel_due_timer = None
+        # todo_items is read on every state write and websocket push, so the
+        # projected list is cached until the view version moves on
+        self._view_version = 0
+        self._items_version = -1
+        self._items: list[TodoItem] = []
+        self._item_cache: dict[Task, TodoItem] = {}
+        # The items last shown, by uid, to check edits against
+        self._shown_items: list[TodoItem] | None = None
+        self._shown_by_uid: dict[str, TodoItem] = {}
+        # Duration of the last filter and sort, for diagnostics
+        self.last_refresh_ms: float | None = None
+        # Items saved at the last run, shown until the file has been parsed
+        self._snapshot_items: list[TodoItem] | None = None
+        self._snapshot_store = None
+
+    async def async_added_to_hass(self) -> None:
+        self._snapshot_store = snapshot_store(self.hass, self._entry_id)
+        self._remove_listener = self._store.async_add_listener(self._handle_store_update)
+        if not self._store.loaded:
+            snapshot_items = items_from_snapshot(await self._snapshot_store.async_load())
+        if self._store.loaded:
+            # Another list on the same file got there first, possibly while the snapshot loaded
+            self._refresh_view()
+        else:
+            self._snapshot_items = snapshot_items
+            self._store.async_start_load()
+        if self._filter.uses_today:
+            # Relative dates (due<7d) move on at midnight even if the file does not
+            self._remove_date_listener = async_track_time_change(
+                self.hass, self._handle_date_change, hour=0, minute=0, second=1
+            )
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._remove_listener:
+            self._remove_listener()
+            self._remove_listener = None
+        if self._remove_date_listener:
+            self._remove_date_listener()
+            self._remove_date_listener = None
+        if self._cancel_due_timer:
+            self._cancel_due_timer()
+            self._cancel_due_timer = None
+        await self._store.async_flush()
+        stores = self._store.stores if isinstance(self._store, AggregateStore) else [self._store]
+        for store in stores:
+            async_release_store(self.hass, store)
+
+    def _handle_store_update(self) -> None:
+        """Rebuild our view after the shared file changed or was written."""
+        changed = self._refresh_view()
+        if self._snapshot_items is not None:
+            # The real items replace the snapshot, even if the view is empty
+            self._snapshot_items = None
+            changed = True
+        if changed:
+            self.async_write_ha_state()
+            if self._snapshot_store is not None:
+                self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot_data(self) -> dict:
+        return items_to_snapshot(self.todo_items)
+
+    @callback
+    def _handle_date_change(self, _now) -> None:
+        # Which tasks match changed with the date, not with the tasks
+        self._journal_position = None
+        self._handle_store_update()
+
+    def _schedule_due_timer(self) -> None:
+        day = self._due.next_day()
+        if day == self._due_timer_day or self.hass is None:
+            return
+        if self._cancel_due_timer:
+            self._cancel_due_timer()
+            self._cancel_due_timer = None
+        self._due_timer_day = day
+        if day is not None:
+            self._cancel_due_timer = async_track_point_in_time(
+                self.hass, self._handle_due_timer, dt_util.start_of_local_day(datetime.date.fromordinal(day))
+            )
+
+    @callback
+    def _handle_due_timer(self, _now) -> None:
+        """Fire the events of the tasks that became due or overdue today."""
+        self._cancel_due_timer = None
+        self._due_timer_day = None
+        for stage, task in self._due.advance(dt_util.now().date().toordinal()):
+            info = self._store.info(task)
+            self.hass.bus.async_fire(
+                EVENT_TASK_DUE if stage == DUE else EVENT_TASK_OVERDUE,
+                {
+                    "entity_id": self.entity_id,
+                    "uid": self._store.uid(task),
+                    "summary": self._get_summary(task),
+                    "due": info.due.isoformat(),
+                },
+            )
+        self._schedule_due_timer()
+        # The counts in the attributes changed
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"due_today": self._due.due_today, "overdue": self._due.overdue}
 
     @property
     def todo_items(self) -> list[TodoItem] | None:
-        return [
-            TodoItem(
-                uid=str(idx),
-                summary=self._get_summary(task),
-                status=TodoItemStatus.COMPLETED if task.is_completed else TodoItemStatus.NEEDS_ACTION,
-                due=self._get_due_date(task),
-            )
-            for idx, task in self._filtered_tasks
-        ]
-
-    def _get_due_date(self, task: Task):
-        match = re.search(r'due:(\d{4}-\d{2}-\d{2})', str(task))
-        if match:
-            try:
-                return datetime.date.fromisoformat(match.group(1))
-            except ValueError:
-                pass
-        return None
+        if self._snapshot_items is not None:
+            return self._snapshot_items
+        if self._items_version != self._view_version:
+            # Reuse the TodoItem of every task that did not change
+            cache = {}
+            for task in self._filtered_tasks:
+                item = self._item_cache.get(task)
+                if item is None:
+                    item = self._build_item(task)
+                cache[task] = item
+            self._item_cache = cache
+            self._items = list(cache.values())
+            self._items_version = self._view_version
+        return self._items
+
+    def _shown_item(self, uid: str) -> TodoItem | None:
+        items = self.todo_items or []
+        # todo_items hands out the same list until the view changes
+        if items is not self._shown_items:
+            self._shown_items = items
+            self._shown_by_uid = {item.uid: item for item in items}
+        return self._shown_by_uid.get(uid)
+
+    def _build_item(self, task: Task) -> TodoItem:
+        info = self._store.info(task)
+        return TodoItem(
+            uid=self._store.uid(task),
+            summary=self._get_summary(task),
+            status=TodoItemStatus.COMPLETED if info.is_completed else TodoItemStatus.NEEDS_ACTION,
+            due=info.due,
+            # The file an item is in, in lists over several files
+            description=self._store.source(task),
+        )
 
     def _get_summary(self, task: Task):
         summary = task.description
@@ -87,102 +314,173 @@ class TodoTxtListEntity(TodoListEntity):
             summary = f"{task.creation_date.isoformat()} {summary}"
         return summary
 
-    def _read_file(self):
-        if not os.path.exists(self._file_path):
-            with open(self._file_path, 'w') as f:
-                pass
-        self._todotxt.parse()
-        
-        all_tasks = list(enumerate(self._todotxt.tasks))
-        
-        # 1. Filter
-        filtered_list = []
-        for i, t in all_tasks:
-            task_str = str(t)
-            if not task_str or not task_str.strip():
-                continue
-            
-            # Helper to check if a specific word exists in the task string
-            # We use regex \b to match word boundaries, allowing for punctuation
-            # Escaping the token is crucial to handle +, @, etc.
-            def has_token(token, text):
-                # We want +Project to match +Project but NOT +Project2
-                # \b works well for words, but + and @ are non-word chars in regex usually
-                # So \b+Project\b might not work as expected because + isn't a word char.
-                # Instead, we split by whitespace and check exact matches,
-                # removing common trailing punctuation if needed.
-                tokens = text.split()
-                clean_tokens = [tok.strip(".,;:?!()") for tok in tokens]
-                return token in tokens or token in clean_tokens
-
-            # Check inclusions (must match ALL)
-            matches_all_includes = True
-            for inc in self._include_filters:
-                if not has_token(inc, task_str):
-                    matches_all_includes = False
-                    break
-            if not matches_all_includes:
-                continue
+    @property
+    def filtered_count(self) -> int:
+        return len(self._filtered_tasks)
 
-            # Check exclusions (must match NONE)
-            matches_any_exclude = False
-            for exc in self._exclude_filters:
-                if has_token(exc, task_str):
-                    matches_any_exclude = True
-                    break
-            if matches_any_exclude:
-                continue
-                
-            filtered_list.append((i, t))
-
-        # 2. Sort
-        def sort_key(item):
-            idx, task = item
-            is_done = 1 if task.is_completed else 0
-            priority = task.priority if task.priority else "Z"
-            
-            due_str = "9999-12-31"
-            match = re.search(r'due:(\d{4}-\d{2}-\d{2})', str(task))
-            if match:
-                due_str = match.group(1)
-            
-            created = task.creation_date.isoformat() if task.creation_date else "0000-01-01"
-            return (is_done, priority, due_str, created)
+    def diagnostics(self) -> dict:
+        diagnostics = {
+            "filter": {"include": self._filter.include, "exclude": self._filter.exclude},
+            "completed_limit": self._completed_limit,
+            "filtered_tasks": self.filtered_count,
+            "last_refresh_ms": self.last_refresh_ms,
+        }
+        if isinstance(self._store, AggregateStore):
+            diagnostics["files"] = self._store.diagnostics()
+        return diagnostics
 
-        filtered_list.sort(key=sort_key)
+    def _refresh_view(self) -> bool:
+        """Bring the filtered, sorted view up to date. Returns True if it changed."""
+        start = time.perf_counter()
+        store = self._store
+        changes = store.changes_since(self._journal_position)
+        if changes is None:
+            self._rebuild_view()
+            changed = True
+        else:
+            changed = self._apply_changes(changes)
+        self._journal_position = store.journal_position
+        self._schedule_due_timer()
+        if changed:
+            filtered_list = self._view.tasks(self._completed_limit)
+            changed = filtered_list != self._filtered_tasks
+        self.last_refresh_ms = (time.perf_counter() - start) * 1000
+        if not changed:
+            return False
         self._filtered_tasks = filtered_list
+        self._view_version += 1
+        return True
+
+    def _rebuild_view(self) -> None:
+        """Filter all tasks through the index and sort them on their cached keys."""
+        info = self._store.info
+        today = dt_util.now().date()
+        self._due.clear()
+        entries = []
+        for task in self._filter.select(self._store.index, info, today):
+            task_info = info(task)
+            entries.append(((task_info.sort_key, task_info.seq), task, not task_info.is_completed))
+            if task_info.due_ordinal and not task_info.is_completed:
+                self._due.add(task, task_info.due_ordinal, today.toordinal())
+        self._view.rebuild(entries)
 
-    def _write_file(self):
-        self._todotxt.save()
+    def _apply_changes(self, changes: list[tuple[bool, Task]]) -> bool:
+        """Insert and remove the tasks the store tracked or dropped since our last refresh."""
+        view = self._view
+        store = self._store
+        today = dt_util.now().date()
+        changed = False
+        for tracked, task in changes:
+            if not tracked:
+                self._due.discard(task)
+                changed = view.discard(task) or changed
+                continue
+            # A task tracked again later in the batch, or already dropped, is skipped
+            task_info = store.tracked_info(task)
+            if task_info is None or task in view or not self._filter.matches(task, task_info, today):
+                continue
+            view.add((task_info.sort_key, task_info.seq), task, not task_info.is_completed)
+            if task_info.due_ordinal and not task_info.is_completed:
+                self._due.add(task, task_info.due_ordinal, today.toordinal())
+            changed = True
+        return changed
 
     async def async_update(self) -> None:
-        await self.hass.async_add_executor_job(self._read_file)
+        # Through the store, so the other lists on the file see the change too
+        await self._store.async_reload()
+        self._refresh_view()
+        self._snapshot_items = None
 
-    async def async_create_todo_item(self, item: TodoItem) -> None:
-        creation_date = datetime.date.today().isoformat()
-        line = f"{creation_date} {item.summary}"
+    async def async_get_archive(self, limit: int | None = None) -> dict[str, Any]:
+        """Archived tasks matching our filter, most recently archived first."""
+        archived = await self._store.async_load_archive()
+        today = dt_util.now().date()
+        items = []
+        for task in reversed(archived):
+            info = TaskInfo(task)
+            if not self._filter.matches(task, info, today):
+                continue
+            items.append({
+                "summary": self._get_summary(task),
+                "completed": task.completion_date.isoformat() if task.completion_date else None,
+                "due": info.due.isoformat() if info.due else None,
+            })
+            if limit is not None and len(items) >= limit:
+                break
+        return {"items": items}
+
+    def _new_line(self, summary: str, due: datetime.date | None = None) -> str:
+        """The todo.txt line for a task created in this list."""
+        creation_date = dt_util.now().date().isoformat()
+        line = f"{creation_date} {summary}"
         
         # Auto-append only INCLUSION filters
         current_tokens = line.split()
-        for inc in self._include_filters:
+        for inc in self._filter.include:
             if inc not in current_tokens:
                 line += f" {inc}"
             
-        if item.due:
-            if f"due:{item.due.isoformat()}" not in line:
-                line += f" due:{item.due.isoformat()}"
-        
+        if due:
+            if f"due:{due.isoformat()}" not in line:
+                line += f" due:{due.isoformat()}"
+        return line
+
+    async def async_create_todo_item(self, item: TodoItem) -> None:
+        await self._store.async_ready()
         task = Task()
-        task.parse(line)
-        self._todotxt.tasks.append(task)
-        await self.hass.async_add_executor_job(self._write_file)
-        await self.async_update()
+        task.parse(self._new_line(item.summary, item.due))
+        self._store.append_task(task)
+        await self._store.async_save()
+
+    async def async_add_items(self, items: list[str], due_date: datetime.date | None = None) -> dict[str, Any]:
+        """Create many tasks (with this list's tags) in one write."""
+        await self._store.async_ready()
+        summaries = [summary.strip() for summary in items if summary.strip()]
+        for summary in summaries:
+            self._store.append_task(LazyTask(self._new_line(summary, due_date)))
+        if summaries:
+            await self._store.async_save()
+        return {"added": len(summaries)}
+
+    async def async_import_lines(self, lines: list[str]) -> dict[str, Any]:
+        """Append raw todo.txt lines as they are, in one write."""
+        await self._store.async_ready()
+        # A single multi-line string is accepted as well as a list
+        raw = [line.strip() for text in lines for line in text.splitlines() if line.strip()]
+        for line in raw:
+            self._store.append_task(LazyTask(line))
+        if raw:
+            await self._store.async_save()
+        return {"imported": len(raw)}
+
+    async def async_complete_matching(self, filter: str) -> dict[str, Any]:
+        """Complete every open task in this list that also matches filter, in one write."""
+        await self._store.async_ready()
+        info = self._store.info
+        index = self._store.index
+        today = dt_util.now().date()
+        matching = TaskFilter(filter).select(index, info, today) & self._filter.select(index, info, today)
+        changes = {
+            task: LazyTask(completed_line(task, today))
+            for task in matching
+            if not info(task).is_completed
+        }
+        if changes:
+            self._store.update_tasks(changes)
+            self._store.recur(list(changes), today)
+            await self._store.async_save()
+        return {"completed": len(changes)}
 
     async def async_update_todo_item(self, item: TodoItem) -> None:
-        idx = int(item.uid)
-        if 0 <= idx < len(self._todotxt.tasks):
-            original_task = self._todotxt.tasks[idx]
-            
+        # What the list showed when the edit was made, before the file can change under it
+        shown = self._shown_item(item.uid)
+        await self._store.async_ready()
+        original_task = self._store.get_task(item.uid)
+        if original_task is not None and shown is not None and shown.summary != self._get_summary(original_task):
+            raise HomeAssistantError(
+                f"'{shown.summary}' was changed elsewhere in the meantime; reload the list and try again"
+            )
+        if original_task is not None:
             new_line = item.summary
             new_line = re.sub(r'\bdue:\d{4}-\d{2}-\d{2}\b', '', new_line).strip()
             if item.due:
@@ -190,7 +488,7 @@ class TodoTxtListEntity(TodoListEntity):
             
             # Ensure inclusion filters are preserved if forced
             new_tokens = new_line.split()
-            for inc in self._include_filters:
+            for inc in self._filter.include:
                 if inc not in new_tokens:
                     new_line += f" {inc}"
 
@@ -199,19 +497,31 @@ class TodoTxtListEntity(TodoListEntity):
             new_task.creation_date = original_task.creation_date
             new_task.priority = new_task.priority or original_task.priority
             new_task.is_completed = (item.status == TodoItemStatus.COMPLETED)
+            today = dt_util.now().date()
             if new_task.is_completed:
-                new_task.completion_date = original_task.completion_date or datetime.date.today()
+                new_task.completion_date = original_task.completion_date or today
             else:
                 new_task.completion_date = None
 
-            self._todotxt.tasks[idx] = new_task
-            await self.hass.async_add_executor_job(self._write_file)
-            await self.async_update()
+            self._store.replace_task(original_task, new_task)
+            if new_task.is_completed and not original_task.is_completed:
+                # The next occurrence goes out in the same write as the completion
+                self._store.recur([original_task], today)
+            await self._store.async_save()
 
     async def async_delete_todo_items(self, uids: list[str]) -> None:
-        indices = sorted([int(uid) for uid in uids], reverse=True)
-        for idx in indices:
-            if 0 <= idx < len(self._todotxt.tasks):
-                self._todotxt.tasks.pop(idx)
-        await self.hass.async_add_executor_job(self._write_file)
-        await self.async_update()
+        await self._store.async_ready()
+        tasks = [self._store.get_task(uid) for uid in uids]
+        self._store.remove_tasks([task for task in tasks if task is not None])
+        await self._store.async_save()
+
+    async def async_remove_completed(self) -> dict[str, Any]:
+        """Delete every completed task matching our filter, including ones not shown."""
+        await self._store.async_ready()
+        info = self._store.info
+        today = dt_util.now().date()
+        done = [task for task in self._filter.select(self._store.index, info, today) if info(task).is_completed]
+        if done:
+            self._store.remove_tasks(done)
+            await self._store.async_save()
+        return {"removed": len(done)}
@@ -0,0 +1,63 @@
+from bisect import bisect_left
+
+from pytodotxt import Task
+
+
+class SortedView:
+    """The tasks of one list in display order, updated one task at a time.
+
+    Keys are (TaskInfo.sort_key, TaskInfo.seq): the packed status, priority,
+    due and created key, with the order tasks were read or last edited as the
+    tie-break. A change is a binary search plus a list insert or delete, so
+    ticking off one item in a large list does not sort anything.
+    """
+
+    def __init__(self) -> None:
+        self._keys: list[tuple[int, int]] = []
+        self._tasks: list[Task] = []
+        self._members: dict[Task, tuple[int, int]] = {}
+        # Open tasks sort before completed ones, so they are the first open_count
+        self.open_count = 0
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task: Task) -> bool:
+        return task in self._members
+
+    def rebuild(self, entries: list[tuple[tuple[int, int], Task, bool]]) -> None:
+        """Replace the contents with (key, task, is_open) entries, sorted once."""
+        entries.sort(key=lambda entry: entry[0])
+        self._keys = [key for key, _task, _is_open in entries]
+        self._tasks = [task for _key, task, _is_open in entries]
+        self._members = {task: key for key, task, _is_open in entries}
+        self.open_count = sum(1 for _key, _task, is_open in entries if is_open)
+
+    def add(self, key: tuple[int, int], task: Task, is_open: bool) -> None:
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._tasks.insert(position, task)
+        self._members[task] = key
+        if is_open:
+            self.open_count += 1
+
+    def discard(self, task: Task) -> bool:
+        """Remove task if it is in the view; returns whether it was."""
+        key = self._members.pop(task, None)
+        if key is None:
+            return False
+        position = bisect_left(self._keys, key)
+        # Tasks from different files can share a key; find this one among them
+        while self._tasks[position] is not task:
+            position += 1
+        del self._keys[position]
+        del self._tasks[position]
+        if position < self.open_count:
+            self.open_count -= 1
+        return True
+
+    def tasks(self, completed_limit: int | None = None) -> list[Task]:
+        """Open tasks, then at most completed_limit completed ones."""
+        if completed_limit is None:
+            return list(self._tasks)
+        return self._tasks[:self.open_count + completed_limit]
@@ -0,0 +1,188 @@
+import ctypes
+import ctypes.util
+import datetime
+import logging
+import os
+import struct
+import sys
+from typing import Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import FALLBACK_SCAN_INTERVAL, SAFETY_SCAN_INTERVAL, WATCH_DEBOUNCE
+
+_LOGGER = logging.getLogger(__name__)
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+# We watch the directory rather than the file itself: Syncthing and most
+# editors save by writing a temp file and renaming it over the original,
+# which would silently drop a watch placed on the old inode.
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def stat_signature(file_path: str):
+    """Cheap change fingerprint of a file, or None if it cannot be stat'ed."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class Inotify:
+    """Minimal non-blocking inotify binding on top of libc."""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("libc has no inotify support")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def read_events(self) -> list[tuple[int, str]]:
+        """Drain pending events as (mask, name) pairs without blocking."""
+        events = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append((mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class TodoTxtFileWatcher:
+    """Signals when a todo.txt file changes on disk.
+
+    Uses inotify on the directory of the real file (so a symlinked file is
+    watched where it is written) where available, and falls back to comparing
+    (mtime, size, inode) on a fixed interval otherwise. With inotify, the same
+    comparison still runs every few minutes for mounts that never report.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        file_path: str,
+        on_change: Callable[[], Awaitable[None]],
+        scan_interval: int = FALLBACK_SCAN_INTERVAL,
+    ) -> None:
+        self.hass = hass
+        self.file_path = os.path.realpath(file_path)
+        self._on_change = on_change
+        self._scan_interval = scan_interval
+        self._inotify: Inotify | None = None
+        self._cancel_poll = None
+        self._cancel_debounce = None
+        self._signature = None
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def async_start(self) -> None:
+        try:
+            inotify = Inotify()
+        except OSError as err:
+            _LOGGER.debug("inotify unavailable (%s), polling %s instead", err, self.file_path)
+        else:
+            try:
+                inotify.add_watch(os.path.dirname(self.file_path), WATCH_MASK)
+                self.hass.loop.add_reader(inotify.fd, self._handle_inotify)
+            except OSError as err:
+                _LOGGER.debug("Cannot watch %s (%s), polling instead", self.file_path, err)
+                inotify.close()
+            else:
+                self._inotify = inotify
+                self._async_start_polling(SAFETY_SCAN_INTERVAL)
+                return
+        self._async_start_polling(self._scan_interval)
+
+    def async_stop(self) -> None:
+        if self._inotify is not None:
+            self.hass.loop.remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+        if self._cancel_poll is not None:
+            self._cancel_poll()
+            self._cancel_poll = None
+        if self._cancel_debounce is not None:
+            self._cancel_debounce()
+            self._cancel_debounce = None
+
+    def _async_start_polling(self, interval: int) -> None:
+        if self._cancel_poll is not None:
+            self._cancel_poll()
+        self._signature = stat_signature(self.file_path)
+        self._cancel_poll = async_track_time_interval(
+            self.hass, self._async_poll, datetime.timedelta(seconds=interval)
+        )
+
+    async def _async_poll(self, _now=None) -> None:
+        signature = await self.hass.async_add_executor_job(stat_signature, self.file_path)
+        if signature == self._signature:
+            return
+        self._signature = signature
+        await self._on_change()
+
+    def _handle_inotify(self) -> None:
+        basename = os.path.basename(self.file_path)
+        changed = False
+        for mask, name in self._inotify.read_events():
+            if mask & IN_IGNORED:
+                # The directory itself went away, inotify cannot follow it
+                self.hass.loop.remove_reader(self._inotify.fd)
+                self._inotify.close()
+                self._inotify = None
+                self._async_start_polling(self._scan_interval)
+                return
+            if mask & IN_Q_OVERFLOW or name == basename:
+                changed = True
+        if changed:
+            # A single save emits a burst of events; only react to the last one
+            if self._cancel_debounce is not None:
+                self._cancel_debounce()
+            self._cancel_debounce = async_call_later(self.hass, WATCH_DEBOUNCE, self._async_debounced)
+
+    async def _async_debounced(self, _now=None) -> None:
+        self._cancel_debounce = None
+        # Keep the safety check from reporting the same change again
+        self._signature = await self.hass.async_add_executor_job(stat_signature, self.file_path)
+        await self._on_change()
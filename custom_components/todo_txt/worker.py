@@ -0,0 +1,33 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class FileWorker:
+    """A single I/O thread per file.
+
+    Every read, write and archive append of one file runs here, one at a
+    time and in the order it was queued, instead of on Home Assistant's
+    shared executor. That makes write ordering deterministic and keeps our
+    latency independent of how busy other integrations keep the shared pool.
+
+    Jobs must not touch state the event loop reads: they return their
+    results, and the caller applies them back on the loop.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"todo_txt_{os.path.basename(file_path)}"
+        )
+
+    async def async_run(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> None:
+        """Queue a job without waiting for it; it must handle its own errors."""
+        self._executor.submit(func, *args)
+
+    def shutdown(self) -> None:
+        """Stop the thread once the jobs already queued are done."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,81 @@
+import contextlib
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+
+class StaleOffsetError(Exception):
+    """The bytes on disk are not what we expected to overwrite."""
+
+
+@contextlib.contextmanager
+def file_lock(file_path: str, exclusive: bool = True):
+    """Hold an advisory flock on the file for cooperating writers, where supported."""
+    if fcntl is None:
+        yield
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        # Nothing to lock yet; the file is about to be created
+        yield
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)
+
+
+def append_bytes(file_path: str, data: bytes, sync: bool = False) -> None:
+    """Append data with a single O_APPEND write, optionally fsync'ing it."""
+    fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        if sync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_at(file_path: str, offset: int, expected: bytes, data: bytes) -> None:
+    """Overwrite expected with data (same length) at offset, leaving the rest of the file untouched."""
+    if len(expected) != len(data):
+        raise ValueError("in-place writes must not change the length")
+    fd = os.open(file_path, os.O_RDWR)
+    try:
+        if os.pread(fd, len(expected), offset) != expected:
+            raise StaleOffsetError(f"{file_path} changed at offset {offset}")
+        os.pwrite(fd, data, offset)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(file_path: str, data: bytes) -> None:
+    """Replace the whole file via a temp file in the same folder and a rename."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp", suffix="~")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = os.stat(file_path).st_mode & 0o7777
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
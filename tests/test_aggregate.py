@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+import asyncio
+import sys
+import datetime
+import os
+import tempfile
+
+# Mock Home Assistant modules
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.const'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+sys.modules['homeassistant.helpers'] = MagicMock()
+sys.modules['homeassistant.helpers.event'] = MagicMock()
+# Dates are Home Assistant's local dates
+sys.modules['homeassistant.util'] = MagicMock(dt=MagicMock(now=datetime.datetime.now))
+
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.aggregate import AggregateStore, resolve_paths, split_paths
+from custom_components.todo_txt.store import TodoTxtFileStore
+
+
+class FakeTask:
+    def __init__(self, line):
+        self.line = line
+        self.is_completed = False
+        self.priority = None
+        self.creation_date = None
+        self.completion_date = None
+        self.description = line
+
+    def __str__(self):
+        return self.line
+
+
+class TestPaths(unittest.TestCase):
+    def test_split_paths(self):
+        self.assertEqual(split_paths(" a.txt, b/*.txt\nc.txt ,"), ["a.txt", "b/*.txt", "c.txt"])
+        self.assertEqual(split_paths(None), [])
+
+    def test_resolve_globs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("todo.txt", "bob.txt", "alice.txt", "notes.md", "done.txt"):
+                open(os.path.join(tmpdir, name), "w").close()
+            primary = os.path.join(tmpdir, "todo.txt")
+            missing = os.path.join(tmpdir, "later.txt")
+            paths = resolve_paths(f"{tmpdir}/*.txt, {missing}, {tmpdir}/bob.txt", primary)
+        # Sorted glob matches without the primary file or done.txt, plain paths kept, no duplicates
+        self.assertEqual(paths, [os.path.join(tmpdir, "alice.txt"), os.path.join(tmpdir, "bob.txt"), missing])
+
+
+class TestAggregateStore(unittest.TestCase):
+    def setUp(self):
+        self.first = TodoTxtFileStore("a/todo.txt")
+        self.second = TodoTxtFileStore("b/todo.txt")
+        self.first.set_tasks([FakeTask("Task A"), FakeTask("Shared")])
+        self.second.set_tasks([FakeTask("Task B"), FakeTask("Shared")])
+        self.store = AggregateStore([self.first, self.second])
+
+    def test_uids_route_to_their_file(self):
+        shared_first, shared_second = self.first.tasks[1], self.second.tasks[1]
+        first_uid, second_uid = self.store.uid(shared_first), self.store.uid(shared_second)
+        # The primary file keeps its own uids; the others are prefixed per file
+        self.assertEqual(first_uid, self.first.info(shared_first).uid)
+        self.assertNotEqual(first_uid, second_uid)
+        self.assertIs(self.store.get_task(first_uid), shared_first)
+        self.assertIs(self.store.get_task(second_uid), shared_second)
+        self.assertIsNone(self.store.get_task("unknown"))
+
+    def test_changes_only_come_from_changed_files(self):
+        position = self.store.journal_position
+        self.assertEqual(self.store.changes_since(position), [])
+        task = FakeTask("Task C")
+        self.store.append_task(task)
+        self.store.remove_tasks([self.second.tasks[0]])
+        removed = [change for change in self.store.changes_since(position) if not change[0]]
+        self.assertEqual(len(self.store.changes_since(position)), 2)
+        self.assertEqual(len(removed), 1)
+        self.assertIn(task, self.first.tasks)
+        self.assertEqual(len(self.second.tasks), 1)
+        # A file that lost track of its changes forces a rebuild
+        self.second.set_tasks([])
+        self.assertIsNone(self.store.changes_since(position))
+
+    def test_shared_archive_read_once(self):
+        third = TodoTxtFileStore("b/other.txt")
+        store = AggregateStore([self.first, self.second, third])
+        for each in store.stores:
+            each.async_load_archive = AsyncMock(return_value=[each.file_path])
+        archived = asyncio.run(store.async_load_archive())
+        # b/todo.txt and b/other.txt share b/done.txt
+        self.assertEqual(archived, ["a/todo.txt", "b/todo.txt"])
+        third.async_load_archive.assert_not_called()
+
+    def test_index_spans_files(self):
+        self.assertEqual(len(self.store.index.tasks_with("Shared")), 2)
+        self.assertEqual(len(self.store.index.indexed_tasks()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
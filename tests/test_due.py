@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock Home Assistant modules (imported by the package __init__)
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.due import DUE, OVERDUE, DueIndex
+
+
+class TestDueIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = DueIndex()
+        self.index.add("late", 99, 100)
+        self.index.add("today", 100, 100)
+        self.index.add("soon", 102, 100)
+
+    def test_counts_current_stages(self):
+        self.assertEqual((self.index.due_today, self.index.overdue), (1, 1))
+        self.assertEqual(self.index.next_day(), 101)
+
+    def test_advance(self):
+        self.assertEqual(self.index.advance(100), [])
+        self.assertEqual(self.index.advance(101), [(OVERDUE, "today")])
+        self.assertEqual(self.index.next_day(), 102)
+        self.assertEqual(self.index.advance(102), [(DUE, "soon")])
+        self.assertEqual((self.index.due_today, self.index.overdue), (1, 2))
+        self.assertEqual(self.index.next_day(), 103)
+
+    def test_missed_days_fire_both_stages(self):
+        self.assertEqual(self.index.advance(110), [(OVERDUE, "today"), (DUE, "soon"), (OVERDUE, "soon")])
+        self.assertIsNone(self.index.next_day())
+
+    def test_removed_and_moved_tasks_are_skipped(self):
+        self.index.discard("today")
+        self.index.add("soon", 105, 100)
+        self.assertEqual((self.index.due_today, self.index.overdue), (0, 1))
+        self.assertEqual(self.index.next_day(), 105)
+        self.assertEqual(self.index.advance(105), [(DUE, "soon")])
+        self.assertEqual(len(self.index), 2)
+
+    def test_heap_stays_in_proportion(self):
+        for day in range(1000):
+            self.index.add("soon", 200 + day, 100)
+        self.assertLess(len(self.index._heap), 100)
+        self.assertEqual(self.index.advance(1198), [(OVERDUE, "today")])
+        self.assertEqual(self.index.next_day(), 1199)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock Home Assistant modules (imported by the package __init__)
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.filters import TaskFilter, TokenIndex, task_tokens
+
+
+class FakeTask:
+    def __init__(self, line):
+        self.line = line
+
+    def __str__(self):
+        return self.line
+
+
+class FakeInfo:
+    def __init__(self, task):
+        self.tokens = task_tokens(task)
+
+
+class TestFilters(unittest.TestCase):
+    def setUp(self):
+        self.tasks = [
+            FakeTask("Call mum @phone."),
+            FakeTask("Fix bike +garage @home"),
+            FakeTask("Pay rent +home @home"),
+            FakeTask("Plan trip +garage @weekend"),
+            FakeTask("   "),
+        ]
+        self.index = TokenIndex()
+        self.index.rebuild(self.tasks)
+
+    def select(self, filter_tag):
+        selected = TaskFilter(filter_tag).select(self.index)
+        return [task.line for task in self.tasks if task in selected]
+
+    def test_task_tokens_strip_punctuation(self):
+        tokens = task_tokens(FakeTask("Call mum @phone."))
+        self.assertIn("@phone.", tokens)
+        self.assertIn("@phone", tokens)
+
+    def test_include_and_exclude(self):
+        self.assertEqual(self.select("+garage"), ["Fix bike +garage @home", "Plan trip +garage @weekend"])
+        self.assertEqual(self.select("+garage -@weekend"), ["Fix bike +garage @home"])
+        self.assertEqual(self.select("@home +garage"), ["Fix bike +garage @home"])
+        self.assertEqual(self.select("@phone"), ["Call mum @phone."])
+        self.assertEqual(self.select("+missing"), [])
+
+    def test_empty_filter_skips_blank_tasks(self):
+        self.assertEqual(len(self.select(None)), 4)
+        self.assertEqual(len(self.select("-@home")), 2)
+
+    def test_index_tracks_changes(self):
+        self.index.remove(self.tasks[1])
+        new_task = FakeTask("Oil chain +garage")
+        self.index.add(new_task)
+        selected = TaskFilter("+garage").select(self.index)
+        self.assertEqual(selected, {self.tasks[3], new_task})
+        # Selecting must never mutate the shared postings
+        self.assertEqual(len(self.index.tasks_with("+garage")), 2)
+        # Tokens are not kept per task; removal finds them from the line again
+        self.index.remove(self.tasks[0])
+        self.index.remove(self.tasks[4])
+        self.assertEqual(self.index.tasks_with("@phone"), set())
+        self.assertNotIn("@phone", self.index._postings)
+        self.assertEqual(len(self.index), 3)
+
+    def test_matches(self):
+        task_filter = TaskFilter("+garage -@weekend")
+        self.assertTrue(task_filter.matches(self.tasks[1], FakeInfo(self.tasks[1])))
+        self.assertFalse(task_filter.matches(self.tasks[3], FakeInfo(self.tasks[3])))
+        self.assertFalse(TaskFilter().matches(self.tasks[4], FakeInfo(self.tasks[4])))
+
+if __name__ == '__main__':
+    unittest.main()
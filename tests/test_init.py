@@ -3,21 +3,32 @@ from unittest.mock import MagicMock, patch, AsyncMock
 import sys
 import os
 import asyncio
+import tempfile
 
 # Mock Home Assistant modules
 mock_hass = MagicMock()
 sys.modules['homeassistant'] = mock_hass
 sys.modules['homeassistant.config_entries'] = MagicMock()
 sys.modules['homeassistant.core'] = MagicMock()
+sys.modules['homeassistant.components'] = MagicMock()
+sys.modules['homeassistant.components.todo'] = MagicMock()
+sys.modules['homeassistant.const'] = MagicMock()
+sys.modules['homeassistant.helpers'] = MagicMock()
+sys.modules['homeassistant.helpers.event'] = MagicMock()
+sys.modules['homeassistant.helpers.storage'] = MagicMock()
+sys.modules['homeassistant.util'] = MagicMock()
 
-# Mock the constants
-sys.modules['custom_components.todo_txt.const'] = MagicMock()
-sys.modules['custom_components.todo_txt.const'].DOMAIN = "todo_txt"
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
 
 # Add path
 sys.path.append(os.getcwd())
 
-from custom_components.todo_txt import async_setup_entry, async_unload_entry, async_reload_entry
+from custom_components.todo_txt import async_setup_entry, async_unload_entry, async_reload_entry, async_remove_entry
+from custom_components.todo_txt.store import cache_path
 
 class TestInit(unittest.TestCase):
     def setUp(self):
@@ -68,5 +79,32 @@ class TestInit(unittest.TestCase):
         
         self.hass.config_entries.async_reload.assert_awaited_with(self.entry.entry_id)
 
+    def test_remove_entry_drops_unshared_caches(self):
+        """Removing a list drops the parse cache of files no other list reads."""
+        with tempfile.TemporaryDirectory() as tmp:
+            os.mkdir(os.path.join(tmp, ".storage"))
+            self.hass.config.path = lambda *parts: os.path.join(tmp, *parts)
+            self.hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+            shared, own = os.path.join(tmp, "shared.txt"), os.path.join(tmp, "own.txt")
+            self.entry.data = {"file_path": own, "extra_files": shared}
+            other = MagicMock(entry_id="other_entry_id", data={"file_path": shared})
+            self.hass.config_entries.async_entries.return_value = [self.entry, other]
+            for path in (shared, own):
+                open(cache_path(self.hass, os.path.realpath(path)), "wb").close()
+            workers = {os.path.realpath(path): MagicMock(async_run=AsyncMock(side_effect=lambda func: func())) for path in (shared, own)}
+            self.hass.data = {"todo_txt": {"workers": dict(workers)}}
+
+            with patch("custom_components.todo_txt.snapshot.snapshot_store") as mock_snapshot_store:
+                mock_snapshot_store.return_value.async_remove = AsyncMock()
+                asyncio.run(async_remove_entry(self.hass, self.entry))
+
+            mock_snapshot_store.return_value.async_remove.assert_awaited_once()
+            self.assertTrue(os.path.exists(cache_path(self.hass, os.path.realpath(shared))))
+            self.assertFalse(os.path.exists(cache_path(self.hass, os.path.realpath(own))))
+            # The worker of the removed list's own file is shut down after removing its cache
+            workers[os.path.realpath(own)].shutdown.assert_called_once()
+            workers[os.path.realpath(shared)].shutdown.assert_not_called()
+            self.assertEqual(list(self.hass.data["todo_txt"]["workers"]), [os.path.realpath(shared)])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock Home Assistant modules (imported by the package __init__)
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.merge import merge_lines
+
+
+def lines(text):
+    return [line.encode() for line in text.split()]
+
+
+class TestMergeLines(unittest.TestCase):
+    def setUp(self):
+        self.base = lines("a b c d")
+
+    def test_independent_changes_combine(self):
+        merged, conflicts = merge_lines(self.base, lines("a B c d e"), lines("a b C d f"))
+        self.assertEqual(merged, lines("a B C d f e"))
+        self.assertEqual(conflicts, 0)
+
+    def test_both_append(self):
+        merged, conflicts = merge_lines(self.base, lines("a b c d e"), lines("a b c d f"))
+        self.assertEqual(merged, lines("a b c d f e"))
+        self.assertEqual(conflicts, 0)
+
+    def test_their_delete_is_kept(self):
+        merged, conflicts = merge_lines(self.base, lines("a b c d e"), lines("a c d"))
+        self.assertEqual(merged, lines("a c d e"))
+        self.assertEqual(conflicts, 0)
+
+    def test_same_change_on_both_sides(self):
+        merged, conflicts = merge_lines(self.base, lines("a B c d"), lines("a B c d"))
+        self.assertEqual(merged, lines("a B c d"))
+        self.assertEqual(conflicts, 0)
+
+    def test_conflict_keeps_both_versions(self):
+        merged, conflicts = merge_lines(self.base, lines("a B1 c d"), lines("a B2 c d"))
+        self.assertEqual(merged, lines("a B2 B1 c d"))
+        self.assertEqual(conflicts, 1)
+
+    def test_edit_of_deleted_line_is_not_lost(self):
+        merged, conflicts = merge_lines(self.base, lines("a B c d"), lines("a c d"))
+        self.assertEqual(merged, lines("a B c d"))
+        self.assertEqual(conflicts, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
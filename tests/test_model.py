@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import datetime
+import sys
+import os
+
+# Mock Home Assistant modules (imported by the package __init__)
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.model import LazyTask, TaskInfo
+
+
+class FakeTask:
+    def __init__(self, line, priority=None, creation_date=None, is_completed=False):
+        self.line = line
+        self.priority = priority
+        self.creation_date = creation_date
+        self.is_completed = is_completed
+        self.str_calls = 0
+
+    def __str__(self):
+        self.str_calls += 1
+        return self.line
+
+
+class TestTaskInfo(unittest.TestCase):
+    def test_due_date(self):
+        info = TaskInfo(FakeTask("Pay rent due:2026-03-01"))
+        self.assertEqual(info.due, datetime.date(2026, 3, 1))
+
+    def test_invalid_due_date_sorts_as_undated(self):
+        info = TaskInfo(FakeTask("Broken due:2026-13-45"))
+        self.assertIsNone(info.due)
+        self.assertEqual(info.sort_key, TaskInfo(FakeTask("Plain task")).sort_key)
+
+    def test_sort_key_order(self):
+        """Open before done, then priority, then due (undated last), then created (undated first)."""
+        keys = [
+            TaskInfo(FakeTask("A", priority="A")).sort_key,
+            TaskInfo(FakeTask("B soon due:2026-01-01", priority="B")).sort_key,
+            TaskInfo(FakeTask("B later due:2026-02-01", priority="B")).sort_key,
+            TaskInfo(FakeTask("B undated", priority="B")).sort_key,
+            TaskInfo(FakeTask("B created", priority="B", creation_date=datetime.date(2026, 1, 2))).sort_key,
+            TaskInfo(FakeTask("none")).sort_key,
+            TaskInfo(FakeTask("x (A) Done", priority="A", is_completed=True)).sort_key,
+        ]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_tokens(self):
+        info = TaskInfo(FakeTask("x Done +home"))
+        self.assertIn("Done", info.tokens)
+        self.assertIn("+home", info.tokens)
+
+    def test_stringifies_once(self):
+        task = FakeTask("Pay rent +home due:2026-03-01")
+        TaskInfo(task)
+        self.assertEqual(task.str_calls, 1)
+
+
+class TestLazyTask(unittest.TestCase):
+    def test_header_without_pytodotxt(self):
+        """Fields used for sorting and display are read from the line; no Task is built."""
+        with patch('custom_components.todo_txt.model.Task') as mock_task_cls:
+            task = LazyTask("(A) 2024-01-05 Call mom +family @phone due:2024-02-01")
+            self.assertFalse(task.is_completed)
+            self.assertEqual(task.priority, "A")
+            self.assertEqual(task.creation_date, datetime.date(2024, 1, 5))
+            self.assertIsNone(task.completion_date)
+            self.assertEqual(task.description, "Call mom +family @phone due:2024-02-01")
+            self.assertEqual(task.projects, ["family"])
+            self.assertEqual(task.contexts, ["phone"])
+            self.assertEqual(str(task), "(A) 2024-01-05 Call mom +family @phone due:2024-02-01")
+            mock_task_cls.assert_not_called()
+
+    def test_completed_header(self):
+        task = LazyTask("x 2024-03-01 2024-01-05 Done thing")
+        self.assertTrue(task.is_completed)
+        self.assertEqual(task.completion_date, datetime.date(2024, 3, 1))
+        self.assertEqual(task.creation_date, datetime.date(2024, 1, 5))
+        self.assertEqual(task.description, "Done thing")
+        self.assertFalse(LazyTask("xylophone lesson").is_completed)
+        self.assertEqual(LazyTask("xylophone lesson").description, "xylophone lesson")
+
+    def test_other_attributes_parsed_on_demand(self):
+        """Anything else is answered by a pytodotxt Task built once, on first use."""
+        with patch('custom_components.todo_txt.model.Task') as mock_task_cls:
+            mock_task_cls.return_value.attributes = {"due": ["2024-02-01"]}
+            task = LazyTask("Call mom due:2024-02-01")
+            self.assertEqual(task.attributes, {"due": ["2024-02-01"]})
+            self.assertEqual(task.attributes, {"due": ["2024-02-01"]})
+            mock_task_cls.assert_called_once_with("Call mom due:2024-02-01")
+
+
+if __name__ == '__main__':
+    unittest.main()
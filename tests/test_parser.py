@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Mock Home Assistant modules (imported by the package __init__)
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.parser import IncrementalParser
+
+
+class FakeTask:
+    def __init__(self, line):
+        self.line = line
+        self.linenr = None
+
+    def __str__(self):
+        return self.line
+
+
+@patch('custom_components.todo_txt.parser.LazyTask', side_effect=FakeTask)
+class TestIncrementalParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = IncrementalParser()
+
+    def lines(self):
+        return [task.line for task in self.parser.tasks]
+
+    def test_initial_parse(self, mock_task_cls):
+        delta = self.parser.parse(b"Task A\n\nTask B\n")
+        self.assertEqual(self.lines(), ["Task A", "Task B"])
+        self.assertEqual([t.line for t in delta.added], ["Task A", "Task B"])
+        self.assertEqual([t.linenr for t in self.parser.tasks], [0, 1])
+
+    def test_append_parses_only_new_line(self, mock_task_cls):
+        self.parser.parse(b"Task A\nTask B\n")
+        first = list(self.parser.tasks)
+        mock_task_cls.reset_mock()
+
+        delta = self.parser.parse(b"Task A\nTask B\nTask C\n")
+
+        mock_task_cls.assert_called_once_with("Task C")
+        self.assertEqual(self.parser.tasks[:2], first)
+        self.assertEqual([t.line for t in delta.added], ["Task C"])
+        self.assertEqual(delta.removed, [])
+        self.assertEqual(delta.modified, [])
+
+    def test_modify_and_remove(self, mock_task_cls):
+        self.parser.parse(b"Task A\nTask B\nTask C\nTask D\n")
+        task_b, task_c = self.parser.tasks[1:3]
+
+        delta = self.parser.parse(b"Task A\nTask B edited\nTask D\n")
+
+        self.assertEqual(self.lines(), ["Task A", "Task B edited", "Task D"])
+        self.assertEqual(len(delta.modified), 1)
+        self.assertIs(delta.modified[0][0], task_b)
+        self.assertEqual(delta.modified[0][1].line, "Task B edited")
+        self.assertEqual(delta.removed, [task_c])
+        self.assertEqual(delta.added, [])
+        self.assertEqual(self.parser.tasks[2].linenr, 2)
+
+    def test_moved_lines_are_reused(self, mock_task_cls):
+        self.parser.parse(b"Task A\nTask B\nTask C\n")
+        task_a, task_b, task_c = self.parser.tasks
+        mock_task_cls.reset_mock()
+
+        delta = self.parser.parse(b"Task C\nTask A\nTask B\n")
+
+        mock_task_cls.assert_not_called()
+        self.assertEqual(self.parser.tasks, [task_c, task_a, task_b])
+        self.assertTrue(delta.reordered)
+        self.assertEqual(delta.added, [])
+        self.assertEqual(delta.removed, [])
+
+    def test_unchanged_text_is_no_change(self, mock_task_cls):
+        self.parser.parse(b"Task A\nTask B\n")
+        self.assertFalse(self.parser.parse(b"Task A\nTask B\n"))
+
+    def test_crlf(self, mock_task_cls):
+        self.parser.parse(b"Task A\r\nTask B\r\n")
+        self.assertEqual(self.parser.linesep, "\r\n")
+        self.assertEqual(self.lines(), ["Task A", "Task B"])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
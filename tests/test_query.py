@@ -0,0 +1,98 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock Home Assistant modules (imported by the package __init__)
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.filters import TaskFilter, TokenIndex, task_tokens
+from custom_components.todo_txt.query import QueryError, parse_query
+
+TODAY = datetime.date(2026, 3, 10)
+
+
+class FakeTask:
+    def __init__(self, line, priority=None, created=None, due=None, done=False):
+        self.line = line
+        self.priority = priority
+        self.creation_date = created
+        self.info = MagicMock(tokens=task_tokens(self), due=due, is_completed=done)
+
+    def __str__(self):
+        return self.line
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.tasks = [
+            FakeTask("(A) Deploy +Work @office due:2026-03-12", "A", TODAY, datetime.date(2026, 3, 12)),
+            FakeTask("(C) Pager drill +Oncall", "C", datetime.date(2026, 1, 1)),
+            FakeTask("Buy milk @store due:2026-03-01", None, TODAY, datetime.date(2026, 3, 1)),
+            FakeTask("x Review +Work status:blocked", None, None, None, True),
+            FakeTask("(B) Book flights +Trip due:2026-04-30", "B", TODAY, datetime.date(2026, 4, 30)),
+        ]
+        self.index = TokenIndex()
+        self.index.rebuild(self.tasks)
+
+    def select(self, text):
+        task_filter = TaskFilter(text)
+        selected = task_filter.select(self.index, lambda task: task.info, TODAY)
+        # The predicate path must agree with the index plan
+        matched = {task for task in self.tasks if task_filter.matches(task, task.info, TODAY)}
+        self.assertEqual(selected, matched, text)
+        return [self.tasks.index(task) for task in sorted(selected, key=self.tasks.index)]
+
+    def test_or_and_grouping(self):
+        self.assertEqual(self.select("+Work or +Oncall"), [0, 1, 3])
+        self.assertEqual(self.select("+Work | @store"), [0, 2, 3])
+        self.assertEqual(self.select("(+Work or +Oncall) @office"), [0])
+        # and binds tighter than or
+        self.assertEqual(self.select("+Work @office or +Trip"), [0, 4])
+        self.assertEqual(self.select("not (+Work or +Oncall)"), [2, 4])
+
+    def test_priority(self):
+        self.assertEqual(self.select("pri:A"), [0])
+        self.assertEqual(self.select("pri:a-b"), [0, 4])
+        self.assertEqual(self.select("pri:C-A"), [0, 1, 4])
+        self.assertEqual(self.select("-pri:A-C"), [2, 3])
+
+    def test_due_dates(self):
+        self.assertEqual(self.select("due<today"), [2])
+        self.assertEqual(self.select("due<7d"), [0, 2])
+        self.assertEqual(self.select("due>=2026-04-01"), [4])
+        self.assertEqual(self.select("due=2d"), [0])
+        self.assertEqual(self.select("created<-2w"), [1])
+        self.assertTrue(TaskFilter("due<7d").uses_today)
+        self.assertFalse(TaskFilter("due<2026-01-01 +Work").uses_today)
+
+    def test_status_and_literal_tokens(self):
+        self.assertEqual(self.select("is:done"), [3])
+        self.assertEqual(self.select("+Work is:open"), [0])
+        self.assertEqual(self.select("status:blocked"), [3])
+
+    def test_include_exclude_from_top_level(self):
+        task_filter = TaskFilter("+Work -@home due<7d")
+        self.assertEqual(task_filter.include, ["+Work"])
+        self.assertEqual(task_filter.exclude, ["@home"])
+        self.assertEqual(TaskFilter("+Work or +Oncall").include, [])
+
+    def test_invalid_queries(self):
+        for text in ("(+Work", "+Work )", "+Work or", "pri:AB", "due<soon", "not", "( )"):
+            with self.assertRaises(QueryError, msg=text):
+                parse_query(text)
+        self.assertIsNone(parse_query(""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock Home Assistant modules (imported by the package __init__)
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.model import LazyTask, TaskInfo
+from custom_components.todo_txt.recurrence import add_interval, next_line, parse_rule, series_key
+
+TODAY = datetime.date(2026, 3, 10)
+
+
+def next_of(line):
+    task = LazyTask(line)
+    info = TaskInfo(task)
+    return next_line(task, parse_rule(info.recurrence), info.due, TODAY)
+
+
+class TestRecurrence(unittest.TestCase):
+    def test_parse_rule(self):
+        self.assertEqual(parse_rule("1w"), (False, 1, "w"))
+        self.assertEqual(parse_rule("+3d"), (True, 3, "d"))
+        for value in (None, "", "0d", "1x", "w", "-1d"):
+            self.assertIsNone(parse_rule(value), value)
+
+    def test_add_interval(self):
+        self.assertEqual(add_interval(datetime.date(2026, 1, 31), 1, "m"), datetime.date(2026, 2, 28))
+        self.assertEqual(add_interval(datetime.date(2024, 2, 29), 1, "y"), datetime.date(2025, 2, 28))
+        self.assertEqual(add_interval(datetime.date(2026, 11, 15), 3, "m"), datetime.date(2027, 2, 15))
+        # Friday plus one business day is Monday
+        self.assertEqual(add_interval(datetime.date(2026, 3, 13), 1, "b"), datetime.date(2026, 3, 16))
+        self.assertEqual(add_interval(TODAY, 2, "w"), datetime.date(2026, 3, 24))
+
+    def test_next_from_completion_day(self):
+        self.assertEqual(
+            next_of("(B) 2026-01-01 Water plants @home due:2026-03-01 rec:1w"),
+            "(B) 2026-03-10 Water plants @home due:2026-03-17 rec:1w",
+        )
+
+    def test_strict_keeps_schedule(self):
+        self.assertEqual(
+            next_of("2026-01-01 Pay rent t:2026-02-25 due:2026-03-01 rec:+1m"),
+            "2026-03-10 Pay rent t:2026-03-28 due:2026-04-01 rec:+1m",
+        )
+
+    def test_without_dates(self):
+        self.assertEqual(next_of("Stretch rec:1d"), "2026-03-10 Stretch rec:1d")
+        self.assertEqual(next_of("Bins t:2026-03-02 rec:+1w"), "2026-03-10 Bins t:2026-03-09 rec:+1w")
+
+    def test_series_key_ignores_dates(self):
+        self.assertEqual(
+            series_key(LazyTask("x 2026-03-10 2026-01-01 Bins due:2026-03-01 rec:1w")),
+            series_key(LazyTask("2026-03-10 Bins due:2026-03-17 rec:1w")),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Mock Home Assistant modules (imported by the package __init__)
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.stats import StoreStats
+
+
+class TestStoreStats(unittest.TestCase):
+    def test_counters(self):
+        stats = StoreStats()
+        stats.record_parse(0.0125, 3)
+        stats.record_write(0.002, 100)
+        stats.record_write(0.001, 20)
+        self.assertEqual(stats.last_parse_ms, 12.5)
+        self.assertEqual(stats.last_parse_lines, 3)
+        self.assertEqual(stats.writes, 2)
+        self.assertEqual(stats.bytes_written, 120)
+        self.assertEqual(stats.as_dict()["writes_per_minute"], 2)
+
+    def test_restores_are_not_parses(self):
+        stats = StoreStats()
+        stats.record_restore(0.004)
+        self.assertEqual(stats.restores, 1)
+        self.assertEqual(stats.last_restore_ms, 4.0)
+        self.assertEqual(stats.parses, 0)
+        self.assertIsNone(stats.last_parse_ms)
+
+    def test_writes_per_minute_window(self):
+        stats = StoreStats()
+        with patch('custom_components.todo_txt.stats.time.monotonic', return_value=1000.0):
+            stats.record_write(0.001, 1)
+        with patch('custom_components.todo_txt.stats.time.monotonic', return_value=1030.0):
+            stats.record_write(0.001, 1)
+            self.assertEqual(stats.writes_per_minute, 2)
+        with patch('custom_components.todo_txt.stats.time.monotonic', return_value=1070.0):
+            self.assertEqual(stats.writes_per_minute, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,658 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import asyncio
+import datetime
+import tempfile
+
+# Mock Home Assistant modules
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.const'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+sys.modules['homeassistant.helpers'] = MagicMock()
+sys.modules['homeassistant.helpers.event'] = MagicMock()
+# Dates are Home Assistant's local dates
+sys.modules['homeassistant.util'] = MagicMock(dt=MagicMock(now=datetime.datetime.now))
+
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt import store as store_module
+from custom_components.todo_txt.cache import ParseCache
+from custom_components.todo_txt.const import DATA_WORKERS, DOMAIN
+from custom_components.todo_txt.model import LazyTask
+from custom_components.todo_txt.writer import file_lock
+from custom_components.todo_txt.store import (
+    TodoTxtFileStore,
+    async_get_store,
+    async_release_store,
+)
+
+
+class FakeTask:
+    def __init__(self, line):
+        self.line = line
+        self.linenr = None
+        self.is_completed = line.startswith("x ")
+        self.priority = None
+        self.creation_date = None
+        self.completion_date = None
+        if self.is_completed:
+            try:
+                self.completion_date = datetime.date.fromisoformat(line.split()[1])
+            except (IndexError, ValueError):
+                pass
+
+    def __str__(self):
+        return self.line
+
+
+@patch('custom_components.todo_txt.parser.LazyTask', side_effect=FakeTask)
+class TestFileStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmpdir.name, "todo.txt")
+        with open(self.file_path, "w") as f:
+            f.write("Task A\n")
+        self.hass = MagicMock()
+        self.hass.data = {}
+
+        async def mock_executor(func, *args):
+            return func(*args)
+        self.hass.async_add_executor_job = mock_executor
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def content(self):
+        with open(self.file_path, "rb") as f:
+            return f.read()
+
+    def inode(self):
+        return os.stat(self.file_path).st_ino
+
+    def test_shared_store_per_file(self, mock_task_cls):
+        """Entities on the same physical file get the same store."""
+        store = async_get_store(self.hass, self.file_path)
+        same = async_get_store(self.hass, os.path.join(self.tmpdir.name, ".", "todo.txt"))
+        other = async_get_store(self.hass, os.path.join(self.tmpdir.name, "other.txt"))
+        self.assertIs(store, same)
+        self.assertIsNot(store, other)
+
+    def test_release_store(self, mock_task_cls):
+        """The store is dropped once its last listener is gone; its worker is kept for the next one."""
+        store = async_get_store(self.hass, self.file_path)
+        remove = store.async_add_listener(MagicMock())
+        async_release_store(self.hass, store)
+        self.assertIs(async_get_store(self.hass, self.file_path), store)
+
+        remove()
+        async_release_store(self.hass, store)
+        reloaded = async_get_store(self.hass, self.file_path)
+        self.assertIsNot(reloaded, store)
+        self.assertIs(reloaded.worker, store.worker)
+        self.assertIs(self.hass.data[DOMAIN][DATA_WORKERS][os.path.realpath(self.file_path)], store.worker)
+
+    def test_parse_once_per_change(self, mock_task_cls):
+        """Repeated reads of an unchanged file only parse it once."""
+        store = TodoTxtFileStore(self.file_path)
+
+        self.assertTrue(store.read())
+        self.assertFalse(store.read())
+        self.assertEqual(mock_task_cls.call_count, 1)
+
+        with open(self.file_path, "a") as f:
+            f.write("Task B\n")
+        self.assertTrue(store.read())
+        self.assertEqual(mock_task_cls.call_count, 2)
+        self.assertEqual(len(store.tasks), 2)
+
+    def test_save_notifies_all_listeners(self, mock_task_cls):
+        """A write from one entity refreshes every sibling without a re-parse."""
+        store = TodoTxtFileStore(self.file_path)
+        store.write_delay = 0
+        store.read()
+
+        listeners = [MagicMock(), MagicMock()]
+        for listener in listeners:
+            store.async_add_listener(listener)
+
+        store.hass = self.hass
+        store.append_task(FakeTask("Task B"))
+        asyncio.run(store.async_save())
+
+        self.assertEqual(self.content(), b"Task A\nTask B\n")
+        for listener in listeners:
+            listener.assert_called_once()
+        self.assertFalse(store.read())
+        self.assertEqual(mock_task_cls.call_count, 1)
+
+    def test_append_uses_single_append_write(self, mock_task_cls):
+        """New tasks are appended, never rewriting the existing bytes."""
+        with open(self.file_path, "wb") as f:
+            f.write(b"Task A\r\nTask B")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        inode = self.inode()
+
+        with patch.object(store_module, "write_atomic") as atomic:
+            store.append_task(FakeTask("Task C"))
+            store.append_task(FakeTask("Task D"))
+            store.write()
+        atomic.assert_not_called()
+
+        self.assertEqual(self.content(), b"Task A\r\nTask B\r\nTask C\r\nTask D\r\n")
+        self.assertEqual(self.inode(), inode)
+        self.assertFalse(store.read())
+
+    def test_same_length_edit_in_place(self, mock_task_cls):
+        """An edit that keeps the line length only rewrites those bytes."""
+        with open(self.file_path, "wb") as f:
+            f.write(b"Task A\nTask B\nTask C\n")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        inode = self.inode()
+
+        with patch.object(store_module, "write_atomic") as atomic:
+            store.replace_task(store.tasks[1], FakeTask("Task X"))
+            store.write()
+        atomic.assert_not_called()
+
+        self.assertEqual(self.content(), b"Task A\nTask X\nTask C\n")
+        self.assertEqual(self.inode(), inode)
+
+        # A second edit of the same line still finds the right bytes
+        store.replace_task(store.tasks[1], FakeTask("Task Y"))
+        store.write()
+        self.assertEqual(self.content(), b"Task A\nTask Y\nTask C\n")
+
+    def test_length_change_rewrites_atomically(self, mock_task_cls):
+        """Edits that change the length and deletes go through temp file + rename."""
+        with open(self.file_path, "wb") as f:
+            f.write(b"Task A\nTask B\nTask C\n")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        inode = self.inode()
+
+        store.replace_task(store.tasks[0], FakeTask("x Task A"))
+        store.remove_tasks([store.tasks[2]])
+        store.write()
+
+        self.assertEqual(self.content(), b"x Task A\nTask B\n")
+        self.assertNotEqual(self.inode(), inode)
+        self.assertEqual(os.listdir(self.tmpdir.name), ["todo.txt"])
+        self.assertFalse(store.read())
+
+        # The byte offsets are rebuilt, so a later in-place edit is still correct
+        store.replace_task(store.tasks[1], FakeTask("Task Z"))
+        store.write()
+        self.assertEqual(self.content(), b"x Task A\nTask Z\n")
+
+    def test_writes_are_coalesced(self, mock_task_cls):
+        """Bursts of edits are visible at once but committed in one write."""
+        store = TodoTxtFileStore(self.file_path, self.hass)
+        store.read()
+        listener = MagicMock()
+        store.async_add_listener(listener)
+
+        async def burst():
+            for name in ("Task B", "Task C", "Task D"):
+                store.append_task(FakeTask(name))
+                await store.async_save()
+
+        with patch.object(store_module, "async_call_later") as call_later, \
+                patch.object(store, "_commit", wraps=store._commit) as write:
+            asyncio.run(burst())
+            # Read-your-writes: every save refreshed the entities right away
+            self.assertEqual(listener.call_count, 3)
+            self.assertEqual(len(store.tasks), 4)
+            write.assert_not_called()
+            call_later.assert_called_once()
+            self.assertTrue(store.has_pending_write)
+
+            # The window elapses: one commit with all three tasks
+            asyncio.run(call_later.call_args[0][2]())
+            write.assert_called_once()
+        self.assertFalse(store.has_pending_write)
+        self.assertEqual(self.content(), b"Task A\nTask B\nTask C\nTask D\n")
+
+    def test_load_flushes_pending_writes(self, mock_task_cls):
+        """Re-reading the file never drops edits that are still queued."""
+        store = TodoTxtFileStore(self.file_path, self.hass)
+        store.read()
+        with patch.object(store_module, "async_call_later") as call_later:
+            store.append_task(FakeTask("Task B"))
+            asyncio.run(store.async_save())
+            asyncio.run(store.async_load())
+        call_later.return_value.assert_called_once()
+        self.assertFalse(store.has_pending_write)
+        self.assertEqual(self.content(), b"Task A\nTask B\n")
+        self.assertEqual([task.line for task in store.tasks], ["Task A", "Task B"])
+
+    def test_external_edit_is_merged_not_overwritten(self, mock_task_cls):
+        """Changes synced in after our last parse survive our next write."""
+        with open(self.file_path, "wb") as f:
+            f.write(b"Task A\nTask B\nTask C\n")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        task_b = store.tasks[1]
+        uid_c = store.info(store.tasks[2]).uid
+
+        # We complete Task A and add Task E ...
+        store.replace_task(store.tasks[0], FakeTask("x Task A"))
+        store.append_task(FakeTask("Task E"))
+        # ... while the phone edits Task C and adds Task D
+        with open(self.file_path, "wb") as f:
+            f.write(b"Task A\nTask B\nTask C edited\nTask D\n")
+        os.utime(self.file_path, ns=(1, 1))
+
+        delta = store.write()
+
+        self.assertEqual(self.content(), b"x Task A\nTask B\nTask C edited\nTask D\nTask E\n")
+        self.assertEqual([t.line for t in store.tasks], ["x Task A", "Task B", "Task C edited", "Task D", "Task E"])
+        self.assertIs(store.tasks[1], task_b)
+        # Their edit is a modification of the line we knew, so the uid carries over
+        self.assertEqual(store.info(store.tasks[2]).uid, uid_c)
+        self.assertEqual([t.line for t in delta.added], ["Task D"])
+        self.assertFalse(store.read())
+
+    def test_replaced_line_gets_new_uid(self, mock_task_cls):
+        """A task deleted elsewhere does not hand its uid to an unrelated new line."""
+        with open(self.file_path, "wb") as f:
+            f.write(b"Task A\n2026-03-01 Buy milk\n")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        uid_milk = store.info(store.tasks[1]).uid
+
+        with open(self.file_path, "wb") as f:
+            f.write(b"Task A\nCall mom\n")
+        os.utime(self.file_path, ns=(1, 1))
+        store.read()
+        self.assertNotEqual(store.info(store.tasks[1]).uid, uid_milk)
+        self.assertIsNone(store.get_task(uid_milk))
+
+        # Ticking a task off or rescheduling it keeps its uid
+        uid_mom = store.info(store.tasks[1]).uid
+        with open(self.file_path, "wb") as f:
+            f.write(b"Task A\nx 2026-03-02 Call mom due:2026-03-05\n")
+        os.utime(self.file_path, ns=(2, 2))
+        store.read()
+        self.assertEqual(store.info(store.tasks[1]).uid, uid_mom)
+
+    def test_touched_file_still_patched_in_place(self, mock_task_cls):
+        """A changed mtime with unchanged content is not treated as a conflict."""
+        with open(self.file_path, "wb") as f:
+            f.write(b"Task A\nTask B\n")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        os.utime(self.file_path, ns=(1, 1))
+        inode = self.inode()
+
+        store.replace_task(store.tasks[1], FakeTask("Task X"))
+        self.assertIsNone(store.write())
+        self.assertEqual(self.content(), b"Task A\nTask X\n")
+        self.assertEqual(self.inode(), inode)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "flock is POSIX only")
+    def test_file_lock_is_exclusive(self, mock_task_cls):
+        """Writes hold an advisory lock other cooperating writers respect."""
+        import fcntl
+        with file_lock(self.file_path):
+            fd = os.open(self.file_path, os.O_RDONLY)
+            try:
+                with self.assertRaises(BlockingIOError):
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            finally:
+                os.close(fd)
+
+    def test_archive_moves_old_completed_tasks(self, mock_task_cls):
+        """Old completed tasks go to done.txt; open, recent and undated ones stay."""
+        with open(self.file_path, "w") as f:
+            f.write("Task A\nx 2024-01-01 Old\nx 2024-03-10 Recent\nx Undated\n")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+
+        archived = store.archive_completed(7, today=datetime.date(2024, 3, 12))
+        self.assertEqual(archived, 1)
+        store.write()
+
+        self.assertEqual(self.content(), b"Task A\nx 2024-03-10 Recent\nx Undated\n")
+        with open(os.path.join(self.tmpdir.name, "done.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"x 2024-01-01 Old\n")
+
+    def test_archive_written_before_todo(self, mock_task_cls):
+        """done.txt is committed first, so a failed todo.txt write cannot lose a task."""
+        with open(self.file_path, "w") as f:
+            f.write("Task A\nx 2024-01-01 Old\n")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        store.archive_completed(0, today=datetime.date(2024, 3, 12))
+
+        with patch.object(store_module, "write_atomic", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                store.write()
+
+        self.assertEqual(self.content(), b"Task A\nx 2024-01-01 Old\n")
+        with open(os.path.join(self.tmpdir.name, "done.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"x 2024-01-01 Old\n")
+
+    def test_archive_disabled_by_default(self, mock_task_cls):
+        with open(self.file_path, "w") as f:
+            f.write("x 2024-01-01 Old\n")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        self.assertEqual(asyncio.run(store.async_archive()), 0)
+        self.assertEqual(len(store.tasks), 1)
+
+    def test_archive_loaded_lazily(self, mock_task_cls):
+        """done.txt is parsed on demand and only again after it changes."""
+        store = TodoTxtFileStore(self.file_path)
+        self.assertEqual(store.archive.load(), [])
+
+        with patch('custom_components.todo_txt.archive.LazyTask', side_effect=FakeTask) as archive_task:
+            store.archive.append([b"x 2024-01-01 Old"], "\n")
+            self.assertEqual([str(t) for t in store.archive.load()], ["x 2024-01-01 Old"])
+            store.archive.load()
+            self.assertEqual(archive_task.call_count, 1)
+
+
+    def test_stats_recorded(self, mock_task_cls):
+        """Parses and writes are timed, and the bytes put on disk are counted."""
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        self.assertEqual(store.stats.parses, 1)
+        self.assertEqual(store.stats.last_parse_lines, 1)
+
+        store.append_task(FakeTask("Task B"))
+        store.write()
+        self.assertEqual(store.stats.writes, 1)
+        self.assertEqual(store.stats.bytes_written, len(b"Task B\n"))
+
+    def test_slow_parse_warns(self, mock_task_cls):
+        store = TodoTxtFileStore(self.file_path)
+        store.parse_budget = 50
+        with patch.object(store_module.time, "perf_counter", side_effect=[0.0, 0.2]), \
+             self.assertLogs(store_module._LOGGER, "WARNING") as logs:
+            store.read()
+        self.assertIn("200 ms", logs.output[0])
+
+
+    def test_update_tasks_in_one_pass(self, mock_task_cls):
+        """Edits and deletes are applied together, keeping uids, without per-task lookups."""
+        with open(self.file_path, "w") as f:
+            f.write("".join(f"Task {i}\n" for i in range(10)))
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        tasks = list(store.tasks)
+        uid = store.info(tasks[5]).uid
+        edited = FakeTask("Task 5 edited")
+
+        with patch.object(store, "_position", side_effect=AssertionError("per-task lookup")):
+            store.update_tasks({tasks[1]: None, tasks[5]: edited, tasks[8]: None})
+
+        self.assertEqual(len(store.tasks), 8)
+        self.assertIs(store.get_task(uid), edited)
+        self.assertEqual([task.linenr for task in store.tasks], list(range(8)))
+        store.write()
+        self.assertEqual(self.content().count(b"\n"), 8)
+        self.assertNotIn(b"Task 1\n", self.content())
+        self.assertIn(b"Task 5 edited\n", self.content())
+
+    def test_io_runs_on_the_file_worker(self, mock_task_cls):
+        """Reads and commits use the file's own thread, never the shared executor."""
+        self.hass.async_add_executor_job = MagicMock(side_effect=AssertionError("shared executor"))
+        store = TodoTxtFileStore(self.file_path, self.hass)
+        store.write_delay = 0
+        threads = []
+        parse_file = store._parse_file
+
+        def record_thread():
+            threads.append(threading.current_thread().name)
+            return parse_file()
+        store._parse_file = record_thread
+
+        async def run():
+            await store.async_load()
+            store.append_task(FakeTask("Task B"))
+            await store.async_save()
+            return await store.async_load_archive()
+
+        self.assertEqual(asyncio.run(run()), [])
+        self.assertTrue(threads[0].startswith("todo_txt_todo.txt"))
+        self.assertEqual(self.content(), b"Task A\nTask B\n")
+        store.worker.shutdown()
+
+    def test_parse_racing_local_edit_is_folded(self, mock_task_cls):
+        """An edit made while a parse was in flight survives it."""
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        with open(self.file_path, "a") as f:
+            f.write("Task B\n")
+
+        before = list(store.tasks)
+        parsed = store._parse_file()
+        store.append_task(FakeTask("Task C"))
+        store._apply_parse(before, parsed)
+
+        self.assertEqual([task.line for task in store.tasks], ["Task A", "Task C", "Task B"])
+        store.write()
+        self.assertEqual(self.content(), b"Task A\nTask C\nTask B\n")
+
+    def test_commit_queued_behind_parse(self, mock_task_cls):
+        """A commit taken before a parse ran is not applied to the re-parsed file."""
+        with open(self.file_path, "w") as f:
+            f.write("aaa\nbbb\n")
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        with open(self.file_path, "w") as f:
+            f.write("BBB\naaa\nbbb\n")
+        gate = threading.Event()
+
+        async def run():
+            # Hold the worker so the parse and the commit queue up behind each other
+            store.worker.submit(gate.wait)
+            load = asyncio.ensure_future(store.async_load())
+            await asyncio.sleep(0)
+            store.replace_task(store.tasks[0], FakeTask("new"))
+            store.append_task(FakeTask("ccc"))
+            commit = asyncio.ensure_future(store._async_commit())
+            await asyncio.sleep(0)
+            gate.set()
+            await asyncio.gather(load, commit)
+
+        asyncio.run(run())
+        # Nothing is lost or written over; lines added elsewhere are folded in after ours
+        self.assertEqual(self.content(), b"new\nbbb\nccc\nBBB\n")
+        self.assertEqual([task.line for task in store.tasks], ["new", "bbb", "ccc", "BBB"])
+        self.assertFalse(store._needs_rewrite)
+        store.worker.shutdown()
+
+    def test_external_completion_recurs_once(self, mock_task_cls):
+        """A rec: task ticked off elsewhere gets its next occurrence, unless the other app added it."""
+        mock_task_cls.side_effect = LazyTask
+        with open(self.file_path, "w") as f:
+            f.write("Task A\n2026-01-01 Bins @home due:2026-03-01 rec:1w\n")
+        store = TodoTxtFileStore(self.file_path, self.hass)
+        store.write_delay = 0
+        store.read()
+        self.assertEqual(len(store.recurring), 1)
+
+        with open(self.file_path, "w") as f:
+            f.write("Task A\nx 2026-03-02 2026-01-01 Bins @home due:2026-03-01 rec:1w\n")
+        asyncio.run(store.async_reload())
+        lines = self.content().decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].startswith(datetime.date.today().isoformat() + " Bins @home due:"))
+        self.assertEqual(len(store.recurring), 2)
+
+        # Completing the new one together with its successor (as a phone app does) adds nothing
+        with open(self.file_path, "w") as f:
+            f.write("\n".join(lines[:2] + ["x 2026-03-09 " + lines[2], "2026-03-09 Bins @home due:2026-03-16 rec:1w"]) + "\n")
+        asyncio.run(store.async_reload())
+        self.assertEqual(len(self.content().decode().splitlines()), 4)
+        store.worker.shutdown()
+
+    def test_change_journal(self, mock_task_cls):
+        """Entities can catch up on tracked and dropped tasks, until the journal overflows."""
+        store = TodoTxtFileStore(self.file_path)
+        store.read()
+        position = store.journal_position
+        task_a = store.tasks[0]
+        task_b = FakeTask("Task B")
+        store.append_task(task_b)
+        store.remove_tasks([task_a])
+        self.assertEqual(store.changes_since(position), [(True, task_b), (False, task_a)])
+        self.assertIsNone(store.changes_since(None))
+
+        with patch.object(store_module, "JOURNAL_LIMIT", 3):
+            for name in ("Task C", "Task D"):
+                store.append_task(FakeTask(name))
+        self.assertIsNone(store.changes_since(position))
+        self.assertEqual(store.changes_since(store.journal_position), [])
+
+    def test_reload_after_edit_restores_from_cache(self, mock_task_cls):
+        """A list reloaded right after an edit loads from the cache its old store saved."""
+        mock_task_cls.side_effect = LazyTask
+        os.mkdir(os.path.join(self.tmpdir.name, ".storage"))
+        self.hass.config.path = lambda *parts: os.path.join(self.tmpdir.name, *parts)
+        self.hass.async_create_background_task = MagicMock(
+            side_effect=lambda coro, name: asyncio.get_running_loop().create_task(coro)
+        )
+
+        async def run():
+            store = async_get_store(self.hass, self.file_path, write_delay=0)
+            await store.async_ready()
+            store.append_task(LazyTask("Task B"))
+            await store.async_save()
+            async_release_store(self.hass, store)
+            reloaded = async_get_store(self.hass, self.file_path)
+            await reloaded.async_ready()
+            return reloaded
+
+        save = ParseCache.save
+
+        def slow_save(cache, *args):
+            time.sleep(0.05)
+            save(cache, *args)
+
+        # The old store's cache save is still running when the reloaded list loads
+        with patch.object(ParseCache, "save", slow_save):
+            reloaded = asyncio.run(run())
+        self.assertTrue(reloaded.restored_from_cache)
+        self.assertEqual([str(task) for task in reloaded.tasks], ["Task A", "Task B"])
+        reloaded.worker.shutdown()
+
+    def test_initial_load_shared_in_background(self, mock_task_cls):
+        """One background parse serves every list, and edits wait for it."""
+        store = TodoTxtFileStore(self.file_path, self.hass)
+        listener = MagicMock()
+        store._listeners.append(listener)
+        self.hass.async_create_background_task = MagicMock(
+            side_effect=lambda coro, name: asyncio.get_running_loop().create_task(coro)
+        )
+
+        async def run():
+            task = store.async_start_load()
+            self.assertIs(store.async_start_load(), task)
+            self.assertFalse(store.loaded)
+            await store.async_ready()
+
+        asyncio.run(run())
+        self.hass.async_create_background_task.assert_called_once()
+        self.assertTrue(store.loaded)
+        self.assertEqual([task.line for task in store.tasks], ["Task A"])
+        listener.assert_called_once()
+        store.worker.shutdown()
+
+    def test_failed_initial_load_is_retried(self, mock_task_cls):
+        """A first load that failed is not cached; the next async_ready reads again."""
+        store = TodoTxtFileStore(self.file_path, self.hass)
+        self.hass.async_create_background_task = MagicMock(
+            side_effect=lambda coro, name: asyncio.get_running_loop().create_task(coro)
+        )
+        load = store.async_load
+
+        async def run():
+            with patch.object(store, "async_load", side_effect=OSError("unreachable")):
+                with self.assertRaises(OSError):
+                    await store.async_ready()
+            with patch.object(store, "async_load", side_effect=load):
+                await store.async_ready()
+
+        asyncio.run(run())
+        self.assertTrue(store.loaded)
+        self.assertEqual([task.line for task in store.tasks], ["Task A"])
+        store.worker.shutdown()
+
+    def make_cached_store(self):
+        store = TodoTxtFileStore(self.file_path)
+        store.cache = ParseCache(os.path.join(self.tmpdir.name, ".storage", "todo_txt.cache"))
+        return store
+
+    def save_cache(self, store):
+        store._save_cache(list(store.tasks), [store.info(task) for task in store.tasks])
+
+    def test_parse_cache_round_trip(self, mock_task_cls):
+        """An unchanged file comes back from the cache with the same tasks, uids and index."""
+        mock_task_cls.side_effect = LazyTask
+        with open(self.file_path, "w") as f:
+            f.write("(A) 2026-01-01 Call mum @phone id:mum\nx 2026-02-01 Pay rent +home\nBins rec:1w due:2026-03-01\n")
+        store = self.make_cached_store()
+        store.read()
+        self.assertFalse(store.restored_from_cache)
+        self.save_cache(store)
+
+        cached = self.make_cached_store()
+        with patch.object(store_module.TaskInfo, "__init__", side_effect=AssertionError("re-parsed")):
+            self.assertTrue(cached.read())
+        self.assertTrue(cached.restored_from_cache)
+        self.assertEqual((cached.stats.restores, cached.stats.parses), (1, 0))
+        self.assertEqual([str(task) for task in cached.tasks], [str(task) for task in store.tasks])
+        for old, new in zip(store.tasks, cached.tasks):
+            self.assertEqual(store.info(old).uid, cached.info(new).uid)
+            self.assertEqual(store.info(old).sort_key, cached.info(new).sort_key)
+            self.assertEqual(old.creation_date, new.creation_date)
+        self.assertEqual(cached.index.tasks_with("@phone"), {cached.tasks[0]})
+        self.assertEqual(cached.recurring, {cached.tasks[2]})
+        self.assertIs(cached.get_task("mum"), cached.tasks[0])
+
+        # Incremental parses and new tasks carry on from the restored state
+        with open(self.file_path, "a") as f:
+            f.write("New task @phone\n")
+        self.assertTrue(cached.read())
+        self.assertEqual(len(cached.index.tasks_with("@phone")), 2)
+        cached.remove_tasks([cached.tasks[0]])
+        self.assertEqual(cached.index.tasks_with("@phone"), {cached.tasks[-1]})
+        self.assertEqual(cached.index.tasks_with("id:mum"), set())
+        self.assertEqual(len(cached.index), len(cached.tasks))
+
+    def test_parse_cache_misses(self, mock_task_cls):
+        """A changed file or an unreadable cache falls back to parsing."""
+        store = self.make_cached_store()
+        store.read()
+        self.save_cache(store)
+        with open(self.file_path, "w") as f:
+            f.write("Task A edited\n")
+        changed = self.make_cached_store()
+        changed.read()
+        self.assertFalse(changed.restored_from_cache)
+        self.assertEqual([task.line for task in changed.tasks], ["Task A edited"])
+
+        with open(changed.cache.path, "wb") as f:
+            f.write(b"not a cache")
+        corrupt = self.make_cached_store()
+        corrupt.read()
+        self.assertFalse(corrupt.restored_from_cache)
+        self.assertEqual(len(corrupt.tasks), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import AsyncMock, MagicMock, patch, call
 import datetime
 import sys
 import os
@@ -16,11 +16,12 @@ class MockTodoListEntity:
         pass
 
 class MockTodoItem:
-    def __init__(self, summary, uid=None, status=None, due=None):
+    def __init__(self, summary, uid=None, status=None, due=None, description=None):
         self.summary = summary
         self.uid = uid
         self.status = status
         self.due = due
+        self.description = description
 
 class MockTodoItemStatus:
     COMPLETED = "completed"
@@ -46,9 +47,23 @@ mock_todo_module.TodoListEntityFeature = MockTodoListEntityFeature
 sys.modules['homeassistant.components.todo'] = mock_todo_module
 
 sys.modules['homeassistant.config_entries'] = MagicMock()
-sys.modules['homeassistant.core'] = MagicMock()
+sys.modules['homeassistant.const'] = MagicMock()
+# Event loop callbacks are plain functions here
+sys.modules['homeassistant.core'] = MagicMock(callback=lambda func: func)
 sys.modules['homeassistant.helpers'] = MagicMock()
 sys.modules['homeassistant.helpers.entity_platform'] = MagicMock()
+sys.modules['homeassistant.helpers.event'] = MagicMock()
+sys.modules['homeassistant.helpers.storage'] = MagicMock()
+
+class MockHomeAssistantError(Exception):
+    pass
+
+sys.modules['homeassistant.exceptions'] = MagicMock(HomeAssistantError=MockHomeAssistantError)
+# Due dates are compared with Home Assistant's local date
+mock_dt_util = MagicMock()
+mock_dt_util.now = datetime.datetime.now
+sys.modules['homeassistant.util'] = MagicMock(dt=mock_dt_util)
+sys.modules['homeassistant.util.dt'] = mock_dt_util
 
 # Mock pytodotxt if not available
 try:
@@ -57,9 +72,17 @@ except ImportError:
     mock_py = MagicMock()
     sys.modules['pytodotxt'] = mock_py
 
+try:
+    import voluptuous
+except ImportError:
+    sys.modules['voluptuous'] = MagicMock()
+
 # Import the class we want to test
 sys.path.append(os.getcwd())
+from custom_components.todo_txt.aggregate import AggregateStore
+from custom_components.todo_txt.store import TodoTxtFileStore
 from custom_components.todo_txt.todo import TodoTxtListEntity
+from custom_components.todo_txt.snapshot import items_from_snapshot, items_to_snapshot
 
 class MockTask:
     """A mock Task object that behaves like pytodotxt.Task."""
@@ -93,13 +116,38 @@ class TestTodoTxtLogic(unittest.TestCase):
         async def mock_executor(func, *args):
             return func(*args)
         entity.hass.async_add_executor_job = mock_executor
+        entity._store.hass = entity.hass
+        # Commit writes immediately instead of batching them
+        entity._store.write_delay = 0
+        # Tasks are set directly rather than loaded from the file
+        entity._store.loaded = True
+        return entity
+
+    def get_aggregate_entity(self, filter_tag=None):
+        """An entity merging mock.txt with other.txt, whose commits are mocked."""
+        entity = self.get_entity(filter_tag)
+        other = TodoTxtFileStore("other.txt", entity.hass)
+        other.write_delay = 0
+        other.loaded = True
+        for store in (entity._store, other):
+            store._commit = MagicMock(return_value=None)
+        entity._store = AggregateStore([entity._store, other])
         return entity
 
     def test_filter_parsing(self):
         """Test that the filter string is parsed correctly into includes and excludes."""
         entity = self.get_entity("+home -@weekend -+personal +urgent")
-        self.assertEqual(entity._include_filters, ["+home", "+urgent"])
-        self.assertEqual(entity._exclude_filters, ["@weekend", "+personal"])
+        self.assertEqual(entity._filter.include, ["+home", "+urgent"])
+        self.assertEqual(entity._filter.exclude, ["@weekend", "+personal"])
+
+    def test_filter_saved_before_queries(self):
+        """A filter that is not a valid query still loads, matched word by word."""
+        entity = self.get_entity("+a or pri:high -")
+        self.assertEqual(entity._filter.include, ["+a", "or", "pri:high"])
+        tasks = [MockTask("Task +a or pri:high"), MockTask("Task +a")]
+        entity._store.set_tasks(tasks)
+        entity._refresh_view()
+        self.assertEqual(entity._filtered_tasks, [tasks[0]])
 
     def test_filtering_logic(self):
         """Test the full filtering logic (Inclusions AND NOT Exclusions)."""
@@ -110,19 +158,19 @@ class TestTodoTxtLogic(unittest.TestCase):
             MockTask("Task with +ha +per"),          # Should HIDE (has exclude)
             MockTask("Task with +ha +personal"),      # Should SHOW (exact match protection)
             MockTask("Task with only +personal"),    # Should HIDE (missing include)
+            MockTask("Task with (+ha), in parens"),  # Should SHOW (punctuation stripped)
         ]
         
-        entity._todotxt = MagicMock()
-        entity._todotxt.tasks = tasks
+        entity._store.set_tasks(tasks)
         
-        with patch('os.path.exists', return_value=True):
-             entity._read_file()
+        entity._refresh_view()
         
-        results = [t.line for idx, t in entity._filtered_tasks]
+        results = [t.line for t in entity._filtered_tasks]
         self.assertIn("Task with +ha", results)
         self.assertIn("Task with +ha +personal", results)
         self.assertNotIn("Task with +ha +per", results)
         self.assertNotIn("Task with only +personal", results)
+        self.assertIn("Task with (+ha), in parens", results)
 
     def test_sorting_logic(self):
         """Test that tasks are sorted by completion, then priority, then due date."""
@@ -139,25 +187,106 @@ class TestTodoTxtLogic(unittest.TestCase):
             MockTask("Due tomorrow due:" + tomorrow.isoformat()),
         ]
         
-        entity._todotxt = MagicMock()
-        entity._todotxt.tasks = tasks
+        entity._store.set_tasks(tasks)
         
-        with patch('os.path.exists', return_value=True):
-            entity._read_file()
+        entity._refresh_view()
         
-        results = [t.line for idx, t in entity._filtered_tasks]
+        results = [t.line for t in entity._filtered_tasks]
         self.assertEqual(results[0], "A task")
         self.assertEqual(results[1], "B task")
         self.assertEqual(results[2], "Due today due:" + today.isoformat())
         self.assertEqual(results[3], "Due tomorrow due:" + tomorrow.isoformat())
         self.assertEqual(results[4], "Done task")
 
+    def test_completed_limit(self):
+        """Only the top completed tasks are kept, after every open one."""
+        entity = self.get_entity()
+        entity._completed_limit = 2
+        tasks = [
+            MockTask("Done C", is_completed=True),
+            MockTask("Open B", priority="B"),
+            MockTask("Done A", priority="A", is_completed=True),
+            MockTask("Open A", priority="A"),
+            MockTask("Done B", priority="B", is_completed=True),
+        ]
+        entity._store.set_tasks(tasks)
+
+        entity._refresh_view()
+
+        results = [t.line for t in entity._filtered_tasks]
+        self.assertEqual(results, ["Open A", "Open B", "Done A", "Done B"])
+
+    def test_view_updates_incrementally(self):
+        """Single changes are applied to the sorted view without re-filtering, in the same order a rebuild gives."""
+        entity = self.get_entity("+home")
+        entity._completed_limit = 1
+        tasks = [
+            MockTask("Done C +home", is_completed=True),
+            MockTask("Open B +home", priority="B"),
+            MockTask("Work A +work", priority="A"),
+            MockTask("Open A +home", priority="A"),
+            MockTask("Done A +home", priority="A", is_completed=True),
+        ]
+        entity._store.set_tasks(tasks)
+        entity._refresh_view()
+
+        store = entity._store
+        with patch.object(entity._filter, "select", side_effect=AssertionError("full re-filter")):
+            store.append_task(MockTask("New A +home", priority="A"))
+            store.replace_task(tasks[1], MockTask("Open B done +home", priority="B", is_completed=True))
+            store.remove_tasks([tasks[3]])
+            store.append_task(MockTask("New work +work"))
+            self.assertTrue(entity._refresh_view())
+            self.assertFalse(entity._refresh_view())
+
+        results = [t.line for t in entity._filtered_tasks]
+        self.assertEqual(results, ["New A +home", "Done A +home"])
+        entity._journal_position = None
+        entity._refresh_view()
+        self.assertEqual([t.line for t in entity._filtered_tasks], results)
+
+    def test_sort_and_items_use_cached_attributes(self):
+        """Tasks are stringified once when indexed, not on every sort or read."""
+        entity = self.get_entity()
+        tasks = [
+            MockTask("Later due:2026-03-01"),
+            MockTask("Sooner due:2026-02-01"),
+        ]
+        entity._store.set_tasks(tasks)
+
+        with patch.object(MockTask, '__str__', side_effect=AssertionError("stringified")):
+            entity._refresh_view()
+            items = entity.todo_items
+            items = entity.todo_items
+
+        self.assertEqual([item.due for item in items], [datetime.date(2026, 2, 1), datetime.date(2026, 3, 1)])
+
+    def test_todo_items_memoized(self):
+        """todo_items is only re-projected when the view changes, reusing unchanged items."""
+        entity = self.get_entity()
+        tasks = [MockTask("Task A"), MockTask("Task B")]
+        entity._store.set_tasks(tasks)
+        self.assertTrue(entity._refresh_view())
+
+        items = entity.todo_items
+        self.assertIs(entity.todo_items, items)
+
+        # Nothing changed: the view and the projected list stay the same
+        self.assertFalse(entity._refresh_view())
+        self.assertIs(entity.todo_items, items)
+
+        # Appending a task keeps the existing TodoItem objects
+        entity._store.append_task(MockTask("Task C"))
+        self.assertTrue(entity._refresh_view())
+        new_items = entity.todo_items
+        self.assertEqual(len(new_items), 3)
+        self.assertIs(new_items[0], items[0])
+        self.assertIs(new_items[1], items[1])
+
     def test_create_task(self):
         """Test creating a task with filters and due date."""
         entity = self.get_entity(filter_tag="+work")
-        entity._todotxt = MagicMock()
-        entity._todotxt.tasks = []
-        entity._todotxt.save = MagicMock()
+        entity._store._commit = MagicMock(return_value=None)
 
         # Mock pytodotxt.Task to use our MockTask
         with patch('custom_components.todo_txt.todo.Task', side_effect=MockTask) as mock_task_cls:
@@ -167,8 +296,8 @@ class TestTodoTxtLogic(unittest.TestCase):
             asyncio.run(entity.async_create_todo_item(item))
             
             # Check if task was added
-            self.assertEqual(len(entity._todotxt.tasks), 1)
-            created_task = entity._todotxt.tasks[0]
+            self.assertEqual(len(entity._store.tasks), 1)
+            created_task = entity._store.tasks[0]
             
             # Verify content
             today = datetime.date.today().isoformat()
@@ -177,90 +306,385 @@ class TestTodoTxtLogic(unittest.TestCase):
             self.assertIn("+work", created_task.line) # Auto-appended filter
             self.assertIn("due:2026-01-30", created_task.line) # Due date
             
-            # Verify save called
-            entity._todotxt.save.assert_called_once()
+            # Verify the write was issued
+            entity._store._commit.assert_called_once()
 
     def test_update_task(self):
         """Test updating a task's summary and due date."""
         entity = self.get_entity()
-        entity._todotxt = MagicMock()
         
         # Original task
         original_task = MockTask("2026-01-01 Original task +tag")
         original_task.creation_date = datetime.date(2026, 1, 1)
-        entity._todotxt.tasks = [original_task]
-        entity._todotxt.save = MagicMock()
+        entity._store.set_tasks([original_task])
+        entity._store._commit = MagicMock(return_value=None)
+        uid = entity._store.info(original_task).uid
 
         with patch('custom_components.todo_txt.todo.Task', side_effect=MockTask):
             # Update to new summary and add due date
             item = MockTodoItem(
                 summary="Updated task +tag", 
-                uid="0", 
+                uid=uid, 
                 status=MockTodoItemStatus.NEEDS_ACTION,
                 due=datetime.date(2026, 2, 1)
             )
             
             asyncio.run(entity.async_update_todo_item(item))
             
-            updated_task = entity._todotxt.tasks[0]
+            updated_task = entity._store.tasks[0]
             self.assertIn("Updated task", updated_task.line)
             self.assertIn("due:2026-02-01", updated_task.line)
             # Should preserve creation date (MockTask implementation dependent, logic copies it)
             self.assertEqual(updated_task.creation_date, original_task.creation_date)
+            # The edited task keeps its uid
+            self.assertIs(entity._store.get_task(uid), updated_task)
+
+    def test_update_of_task_changed_elsewhere(self):
+        """An edit made against what the list showed does not overwrite a newer version."""
+        entity = self.get_entity()
+        entity._store.set_tasks([MockTask("Buy milk")])
+        entity._store._commit = MagicMock(return_value=None)
+        entity._refresh_view()
+        shown = entity.todo_items[0]
+
+        # Another app renames the task (keeping its uid) after the list was shown...
+        with patch.object(entity, '_shown_item', return_value=shown):
+            entity._store.replace_task(entity._store.tasks[0], MockTask("Buy oat milk"))
+            item = MockTodoItem(summary="Buy milk", uid=shown.uid, status=MockTodoItemStatus.COMPLETED)
+            with self.assertRaises(MockHomeAssistantError):
+                asyncio.run(entity.async_update_todo_item(item))
+        self.assertEqual(str(entity._store.tasks[0]), "Buy oat milk")
+        entity._store._commit.assert_not_called()
 
     def test_delete_task(self):
-        """Test deleting tasks by index."""
+        """Test deleting tasks by uid."""
         entity = self.get_entity()
-        entity._todotxt = MagicMock()
-        entity._todotxt.tasks = [
+        tasks = [
             MockTask("Task 0"),
             MockTask("Task 1"),
             MockTask("Task 2")
         ]
-        entity._todotxt.save = MagicMock()
+        entity._store.set_tasks(tasks)
+        entity._store._commit = MagicMock(return_value=None)
         
-        # Delete index 0 and 2
-        asyncio.run(entity.async_delete_todo_items(["0", "2"]))
+        # Delete tasks 0 and 2 (plus an unknown uid, which is ignored)
+        uids = [entity._store.info(tasks[0]).uid, entity._store.info(tasks[2]).uid, "gone"]
+        asyncio.run(entity.async_delete_todo_items(uids))
         
-        self.assertEqual(len(entity._todotxt.tasks), 1)
-        self.assertEqual(entity._todotxt.tasks[0].line, "Task 1")
-        entity._todotxt.save.assert_called_once()
+        self.assertEqual(len(entity._store.tasks), 1)
+        self.assertEqual(entity._store.tasks[0].line, "Task 1")
+        entity._store._commit.assert_called_once()
     
+    def test_remove_completed(self):
+        """All completed tasks in the list go in one save, hidden ones included."""
+        entity = self.get_entity("+home")
+        entity._completed_limit = 1
+        tasks = [
+            MockTask("Open +home"),
+            MockTask("Done one +home", is_completed=True),
+            MockTask("Done two +home", is_completed=True),
+            MockTask("Done elsewhere +work", is_completed=True),
+        ]
+        entity._store.set_tasks(tasks)
+        entity._store._commit = MagicMock(return_value=None)
+
+        result = asyncio.run(entity.async_remove_completed())
+
+        self.assertEqual(result, {"removed": 2})
+        self.assertEqual([t.line for t in entity._store.tasks], ["Open +home", "Done elsewhere +work"])
+        entity._store._commit.assert_called_once()
+
+    def test_add_items_single_write(self):
+        """Bulk adds get the list's tags and go out in one write."""
+        entity = self.get_entity("+shop")
+        entity._store._commit = MagicMock(return_value=None)
+
+        result = asyncio.run(entity.async_add_items(["Milk", " ", "Bread"], datetime.date(2026, 1, 30)))
+
+        self.assertEqual(result, {"added": 2})
+        lines = [str(t) for t in entity._store.tasks]
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(all("+shop" in line and "due:2026-01-30" in line for line in lines))
+        entity._store._commit.assert_called_once()
+
+    def test_import_lines(self):
+        entity = self.get_entity()
+        entity._store._commit = MagicMock(return_value=None)
+
+        result = asyncio.run(entity.async_import_lines(["(A) Call mom\n\nx 2026-01-02 Pay rent", "Water plants"]))
+
+        self.assertEqual(result, {"imported": 3})
+        self.assertEqual(
+            [str(t) for t in entity._store.tasks], ["(A) Call mom", "x 2026-01-02 Pay rent", "Water plants"]
+        )
+        self.assertTrue(entity._store.info(entity._store.tasks[1]).is_completed)
+        entity._store._commit.assert_called_once()
+
+    def test_complete_matching(self):
+        """Only open tasks matching both filters are completed, in one write."""
+        entity = self.get_entity("+home")
+        tasks = [
+            MockTask("Buy milk +home @shop"),
+            MockTask("Buy bread +home @shop"),
+            MockTask("Clean +home"),
+            MockTask("Buy tools +work @shop"),
+        ]
+        entity._store.set_tasks(tasks)
+        entity._store._commit = MagicMock(return_value=None)
+        uid = entity._store.info(tasks[0]).uid
+
+        result = asyncio.run(entity.async_complete_matching("@shop -bread"))
+
+        self.assertEqual(result, {"completed": 1})
+        done = entity._store.get_task(uid)
+        self.assertTrue(str(done).startswith(f"x {datetime.date.today().isoformat()} Buy milk"))
+        self.assertTrue(entity._store.info(done).is_completed)
+        self.assertEqual([str(t) for t in entity._store.tasks[1:]], ["Buy bread +home @shop", "Clean +home", "Buy tools +work @shop"])
+        entity._store._commit.assert_called_once()
+
+    def test_completing_recurring_task(self):
+        """The next occurrence is appended in the same write as the completion."""
+        entity = self.get_entity()
+        original_task = MockTask("Water plants due:2026-03-01 rec:1w")
+        original_task.completion_date = None
+        entity._store.set_tasks([original_task])
+        entity._store._commit = MagicMock(return_value=None)
+        uid = entity._store.info(original_task).uid
+
+        with patch('custom_components.todo_txt.todo.Task', side_effect=MockTask):
+            item = MockTodoItem(summary="Water plants rec:1w", uid=uid, status=MockTodoItemStatus.COMPLETED)
+            asyncio.run(entity.async_update_todo_item(item))
+
+        self.assertEqual(len(entity._store.tasks), 2)
+        self.assertTrue(entity._store.tasks[0].is_completed)
+        self.assertIn("Water plants due:", str(entity._store.tasks[1]))
+        self.assertIn(entity._store.tasks[1], entity._store.recurring)
+        entity._store._commit.assert_called_once()
+
+    def test_startup_shows_snapshot_until_parsed(self):
+        """Lists start from their saved items; the file is parsed once, in the background, for all of them."""
+        first = self.get_entity()
+        second = TodoTxtListEntity("Other", self.file_path, "other_entry", "+home", first._store)
+        second.hass = first.hass
+        store = first._store
+        store.loaded = False
+        store.async_start_load = MagicMock()
+        saved = items_to_snapshot([MockTodoItem("Saved", uid="abc", status=MockTodoItemStatus.COMPLETED)])
+        snapshots = MagicMock()
+        snapshots.async_load = AsyncMock(return_value=saved)
+
+        with patch("custom_components.todo_txt.todo.snapshot_store", return_value=snapshots):
+            asyncio.run(first.async_added_to_hass())
+            asyncio.run(second.async_added_to_hass())
+
+        self.assertEqual([item.summary for item in first.todo_items], ["Saved"])
+        self.assertEqual(first.todo_items[0].status, MockTodoItemStatus.COMPLETED)
+        self.assertEqual(store.async_start_load.call_count, 2)
+        self.assertEqual(len(store._listeners), 2)
+
+        # The background parse finishes and notifies every list
+        first.async_write_ha_state = MagicMock()
+        second.async_write_ha_state = MagicMock()
+        store.set_tasks([MockTask("Real task")])
+        store.async_notify()
+        self.assertEqual([item.summary for item in first.todo_items], ["Real task"])
+        first.async_write_ha_state.assert_called_once()
+        snapshots.async_delay_save.assert_called()
+        self.assertEqual(second.todo_items, [])
+
+    def test_load_finished_while_snapshot_loads(self):
+        """A list whose file was parsed while its snapshot loaded shows the real items."""
+        entity = self.get_entity()
+        store = entity._store
+        store.loaded = False
+        store.async_start_load = MagicMock()
+
+        async def load_snapshot():
+            # Another list's background parse finishes meanwhile
+            store.set_tasks([MockTask("Real task")])
+            return items_to_snapshot([MockTodoItem("Stale item from last run", uid="abc", status=MockTodoItemStatus.NEEDS_ACTION)])
+
+        snapshots = MagicMock()
+        snapshots.async_load = AsyncMock(side_effect=load_snapshot)
+        with patch("custom_components.todo_txt.todo.snapshot_store", return_value=snapshots):
+            asyncio.run(entity.async_added_to_hass())
+
+        self.assertEqual([item.summary for item in entity.todo_items], ["Real task"])
+        store.async_start_load.assert_not_called()
+
+    def test_snapshot_round_trip(self):
+        items = [
+            MockTodoItem("Open", uid="a", status=MockTodoItemStatus.NEEDS_ACTION, due=datetime.date(2026, 3, 1)),
+            MockTodoItem("Done", uid="b", status=MockTodoItemStatus.COMPLETED),
+        ]
+        restored = items_from_snapshot(items_to_snapshot(items))
+        self.assertEqual([(i.uid, i.summary, i.status, i.due) for i in restored], [(i.uid, i.summary, i.status, i.due) for i in items])
+        self.assertIsNone(items_from_snapshot(None))
+        self.assertIsNone(items_from_snapshot({"items": [["too", "short"]]}))
+
     def test_file_reload(self):
         """Test that calling async_update reloads tasks from the file."""
         entity = self.get_entity()
-        entity._todotxt = MagicMock()
-        
-        # 1. Initial State
-        entity._todotxt.tasks = [MockTask("Task A")]
-        
-        # Simulate parse() doing nothing (since we set tasks manually above)
-        entity._todotxt.parse = MagicMock()
+        entity._store._read_bytes = MagicMock(return_value=b"Task A\n")
+        entity._store._stat_signature = MagicMock(return_value=(1, 10, 1))
         
         # Run update
-        with patch('os.path.exists', return_value=True):
+        with patch('os.path.exists', return_value=True), \
+             patch('custom_components.todo_txt.parser.LazyTask', side_effect=MockTask):
             asyncio.run(entity.async_update())
             
         # Verify filtering happened and we see Task A
         self.assertEqual(len(entity._filtered_tasks), 1)
-        self.assertEqual(entity._filtered_tasks[0][1].line, "Task A")
-        
-        # 2. Simulate File Change (Syncthing updates the file)
-        # In a real scenario, .parse() would read the new file content.
-        # Here we mock .parse() to update the tasks list to mimic reading a new file.
-        def mock_parse_side_effect():
-            entity._todotxt.tasks = [MockTask("Task A"), MockTask("Task B (New)")]
+        task_a = entity._filtered_tasks[0]
+        self.assertEqual(task_a.line, "Task A")
         
-        entity._todotxt.parse = MagicMock(side_effect=mock_parse_side_effect)
+        # 2. Simulate File Change (Syncthing appends a line)
+        entity._store._read_bytes.return_value = b"Task A\nTask B (New)\n"
+        entity._store._stat_signature.return_value = (2, 20, 1)
         
         # Run update again
-        with patch('os.path.exists', return_value=True):
+        with patch('os.path.exists', return_value=True), \
+             patch('custom_components.todo_txt.parser.LazyTask', side_effect=MockTask) as mock_task_cls:
             asyncio.run(entity.async_update())
             
-        # Verify that .parse() was called and the list is updated
-        entity._todotxt.parse.assert_called()
+        # Verify that only the new line was parsed and the list is updated
+        mock_task_cls.assert_called_once_with("Task B (New)")
         self.assertEqual(len(entity._filtered_tasks), 2)
-        self.assertEqual(entity._filtered_tasks[1][1].line, "Task B (New)")
+        self.assertIs(entity._filtered_tasks[0], task_a)
+        self.assertEqual(entity._filtered_tasks[1].line, "Task B (New)")
+
+    def test_update_refreshes_lists_on_the_same_file(self):
+        """update_entity on one list re-reads the file for every list on it."""
+        entity = self.get_entity()
+        shop = TodoTxtListEntity("Shop", self.file_path, "shop_entry", "+shop", entity._store)
+        shop.hass = entity.hass
+        shop.async_write_ha_state = MagicMock()
+        entity._store._listeners.append(shop._handle_store_update)
+        entity._store._read_bytes = MagicMock(return_value=b"Task A\nbuy eggs +shop\n")
+        entity._store._stat_signature = MagicMock(return_value=(1, 10, 1))
+
+        with patch('os.path.exists', return_value=True), \
+             patch('custom_components.todo_txt.parser.LazyTask', side_effect=MockTask):
+            asyncio.run(entity.async_update())
+
+        self.assertEqual([item.summary for item in shop.todo_items], ["buy eggs +shop"])
+        shop.async_write_ha_state.assert_called_once()
+
+    def test_stable_uids(self):
+        """Uids follow the task, not its position, and survive external inserts."""
+        entity = self.get_entity()
+        entity._store._read_bytes = MagicMock(return_value=b"Task A\nTask B\nTask B\nTask C id:chore-1\n")
+        entity._store._stat_signature = MagicMock(return_value=(1, 10, 1))
+        with patch('os.path.exists', return_value=True), \
+             patch('custom_components.todo_txt.parser.LazyTask', side_effect=MockTask):
+            asyncio.run(entity.async_update())
+        uids = {item.summary: item.uid for item in entity.todo_items}
+        self.assertEqual(len({item.uid for item in entity.todo_items}), 4)
+        self.assertEqual(uids["Task C id:chore-1"], "chore-1")
+
+        # A line inserted at the top of the file does not shift anyone's uid
+        entity._store._read_bytes.return_value = b"Task Z\nTask A\nTask B\nTask B\nTask C id:chore-1\n"
+        entity._store._stat_signature.return_value = (2, 20, 1)
+        with patch('os.path.exists', return_value=True), \
+             patch('custom_components.todo_txt.parser.LazyTask', side_effect=MockTask):
+            asyncio.run(entity.async_update())
+        new_uids = {item.uid: item.summary for item in entity.todo_items}
+        self.assertEqual(new_uids[uids["Task A"]], "Task A")
+        self.assertEqual(new_uids[uids["Task C id:chore-1"]], "Task C id:chore-1")
+        self.assertEqual(entity._store.get_task(uids["Task A"]).line, "Task A")
+
+    def test_aggregated_list_merges_files(self):
+        """Tasks of all files are sorted together and tagged with their file."""
+        entity = self.get_aggregate_entity()
+        primary, other = entity._store.stores
+        primary.set_tasks([MockTask("Mine", priority="B"), MockTask("Same")])
+        other.set_tasks([MockTask("Theirs", priority="A"), MockTask("Same")])
+        entity._refresh_view()
+
+        items = entity.todo_items
+        self.assertEqual([item.summary for item in items][:2], ["(A) Theirs", "(B) Mine"])
+        self.assertEqual([item.description for item in items][:2], ["other.txt", "mock.txt"])
+        # The same line in two files still gives two items with their own uids
+        self.assertEqual(len({item.uid for item in items}), 4)
+        self.assertEqual(items[1].uid, primary.info(primary.tasks[0]).uid)
+
+        # A change to one file moves only that file's task in the view
+        other.remove_tasks([other.tasks[1]])
+        self.assertTrue(entity._refresh_view())
+        self.assertEqual(len(entity.todo_items), 3)
+
+    def test_aggregated_writes_go_to_their_file(self):
+        """Edits are written to the file the task came from; new tasks to the first one."""
+        entity = self.get_aggregate_entity()
+        primary, other = entity._store.stores
+        primary.set_tasks([MockTask("Mine")])
+        other.set_tasks([MockTask("Theirs rec:1d due:2026-03-01"), MockTask("Old")])
+        other.tasks[0].completion_date = None
+        entity._refresh_view()
+        uids = {item.summary: item.uid for item in entity.todo_items}
+
+        with patch('custom_components.todo_txt.todo.Task', side_effect=MockTask):
+            item = MockTodoItem(summary="Theirs rec:1d", uid=uids["Theirs rec:1d due:2026-03-01"],
+                                status=MockTodoItemStatus.COMPLETED)
+            asyncio.run(entity.async_update_todo_item(item))
+        # The completion and the next occurrence both went to other.txt, in one write
+        self.assertTrue(other.tasks[0].is_completed)
+        self.assertEqual(len(other.tasks), 3)
+        self.assertEqual(len(primary.tasks), 1)
+        other._commit.assert_called_once()
+        primary._commit.assert_not_called()
+
+        with patch('custom_components.todo_txt.todo.Task', side_effect=MockTask):
+            asyncio.run(entity.async_create_todo_item(MockTodoItem(summary="New")))
+        self.assertEqual(len(primary.tasks), 2)
+        primary._commit.assert_called_once()
+
+        asyncio.run(entity.async_delete_todo_items([uids["Mine"], uids["Old"]]))
+        self.assertEqual([str(task) for task in primary.tasks], [str(primary.tasks[0])])
+        self.assertNotIn("Old", [str(task) for task in other.tasks])
+        self.assertEqual(other._commit.call_count, 2)
+
+    def test_due_events(self):
+        """One timer, set for the next day a task becomes due, fires the events."""
+        entity = self.get_entity("+home")
+        entity.entity_id = "todo.test_list"
+        entity.async_write_ha_state = MagicMock()
+        today = datetime.date.today()
+        tomorrow = (today + datetime.timedelta(days=1)).isoformat()
+        yesterday = (today - datetime.timedelta(days=1)).isoformat()
+        entity._store.set_tasks([
+            MockTask(f"Late +home due:{yesterday}"),
+            MockTask(f"Today +home due:{today.isoformat()}"),
+            MockTask(f"Soon +home due:{tomorrow}"),
+            MockTask(f"Elsewhere +work due:{yesterday}"),
+            MockTask(f"x Done +home due:{yesterday}", is_completed=True),
+        ])
+        with patch('custom_components.todo_txt.todo.async_track_point_in_time') as track:
+            entity._refresh_view()
+            # Tasks already due or overdue are counted, without events
+            self.assertEqual(entity.extra_state_attributes, {"due_today": 1, "overdue": 1})
+            track.assert_called_once()
+            mock_dt_util.start_of_local_day.assert_called_with(today + datetime.timedelta(days=1))
+
+            # At midnight today's task becomes overdue and tomorrow's due
+            entity._due.clear()
+            entity._journal_position = None
+            entity._refresh_view()
+            next_day = today + datetime.timedelta(days=1)
+            with patch.object(mock_dt_util, 'now', return_value=datetime.datetime.combine(next_day, datetime.time())):
+                entity._handle_due_timer(None)
+        fired = [(call.args[0], call.args[1]["summary"]) for call in entity.hass.bus.async_fire.call_args_list]
+        self.assertEqual(sorted(fired), [
+            ("todo_txt_task_due", f"Soon +home due:{tomorrow}"),
+            ("todo_txt_task_overdue", f"Today +home due:{today.isoformat()}"),
+        ])
+        self.assertEqual(entity.extra_state_attributes, {"due_today": 1, "overdue": 2})
+        self.assertEqual(entity.hass.bus.async_fire.call_args_list[0].args[1]["entity_id"], "todo.test_list")
+
+        # Completing a task takes it out of the counts
+        entity._store.replace_task(entity._store.tasks[0], MockTask(f"x Late +home due:{yesterday}", is_completed=True))
+        entity._refresh_view()
+        self.assertEqual(entity.extra_state_attributes, {"due_today": 1, "overdue": 1})
 
 if __name__ == '__main__':
     unittest.main()
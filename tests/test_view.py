@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock Home Assistant modules (imported by the package __init__)
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+
+# Mock pytodotxt if not available
+try:
+    import pytodotxt
+except ImportError:
+    sys.modules['pytodotxt'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt.view import SortedView
+
+
+class TestSortedView(unittest.TestCase):
+    def setUp(self):
+        self.view = SortedView()
+        # Keys of open tasks are below those of completed ones, as in TaskInfo.sort_key
+        self.view.rebuild([((30, 1), "open c", True), ((900, 2), "done a", False), ((10, 3), "open a", True)])
+
+    def test_rebuild_sorts(self):
+        self.assertEqual(self.view.tasks(), ["open a", "open c", "done a"])
+        self.assertEqual(self.view.open_count, 2)
+
+    def test_add_and_discard(self):
+        self.view.add((20, 4), "open b", True)
+        self.view.add((800, 5), "done b", False)
+        self.assertEqual(self.view.tasks(), ["open a", "open b", "open c", "done b", "done a"])
+        self.assertTrue(self.view.discard("open a"))
+        self.assertFalse(self.view.discard("open a"))
+        self.assertTrue(self.view.discard("done a"))
+        self.assertEqual(self.view.tasks(), ["open b", "open c", "done b"])
+        self.assertEqual(self.view.open_count, 2)
+
+    def test_completed_limit(self):
+        self.view.add((800, 5), "done b", False)
+        self.assertEqual(self.view.tasks(1), ["open a", "open c", "done b"])
+        self.assertEqual(self.view.tasks(0), ["open a", "open c"])
+
+    def test_discard_with_duplicate_key(self):
+        # Tasks of different files can have the same sort key and seq
+        self.view.add((30, 1), "open c elsewhere", True)
+        self.assertTrue(self.view.discard("open c elsewhere"))
+        self.assertEqual(self.view.tasks(), ["open a", "open c", "done a"])
+        self.view.add((30, 1), "open c elsewhere", True)
+        self.assertTrue(self.view.discard("open c"))
+        self.assertEqual(self.view.tasks(), ["open a", "open c elsewhere", "done a"])
+
+    def test_equal_sort_keys_use_seq(self):
+        self.view.add((30, 0), "open c before", True)
+        self.view.add((30, 9), "open c after", True)
+        self.assertEqual(self.view.tasks()[1:4], ["open c before", "open c", "open c after"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+import sys
+import os
+import asyncio
+import tempfile
+
+# Mock Home Assistant modules
+sys.modules['homeassistant'] = MagicMock()
+sys.modules['homeassistant.config_entries'] = MagicMock()
+sys.modules['homeassistant.core'] = MagicMock()
+sys.modules['homeassistant.helpers'] = MagicMock()
+sys.modules['homeassistant.helpers.event'] = MagicMock()
+
+sys.path.append(os.getcwd())
+from custom_components.todo_txt import watcher
+from custom_components.todo_txt.watcher import Inotify, TodoTxtFileWatcher, WATCH_MASK
+
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmpdir.name, "todo.txt")
+        with open(self.file_path, "w") as f:
+            f.write("Task A\n")
+        self.hass = MagicMock()
+
+        async def mock_executor(func, *args):
+            return func(*args)
+        self.hass.async_add_executor_job = mock_executor
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_sees_replace(self):
+        """Atomic rename-over saves (Syncthing, editors) are reported."""
+        inotify = Inotify()
+        try:
+            inotify.add_watch(self.tmpdir.name, WATCH_MASK)
+            tmp = os.path.join(self.tmpdir.name, ".todo.txt.tmp")
+            with open(tmp, "w") as f:
+                f.write("Task B\n")
+            os.replace(tmp, self.file_path)
+            names = [name for _mask, name in inotify.read_events()]
+        finally:
+            inotify.close()
+        self.assertIn("todo.txt", names)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_debounces_events(self):
+        """A burst of events for our file schedules a single re-check."""
+        on_change = AsyncMock()
+        file_watcher = TodoTxtFileWatcher(self.hass, self.file_path, on_change)
+        with patch.object(watcher, "async_call_later") as call_later:
+            file_watcher.async_start()
+            self.assertTrue(file_watcher.uses_inotify)
+            with open(self.file_path, "a") as f:
+                f.write("Task B\n")
+            with open(os.path.join(self.tmpdir.name, "unrelated.txt"), "w") as f:
+                f.write("noise\n")
+            file_watcher._handle_inotify()
+            file_watcher.async_stop()
+
+        call_later.assert_called_once()
+        asyncio.run(call_later.call_args[0][2]())
+        on_change.assert_awaited_once()
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_follows_symlink(self):
+        """A file symlinked in from another folder is watched where it is written."""
+        os.mkdir(os.path.join(self.tmpdir.name, "config"))
+        link = os.path.join(self.tmpdir.name, "config", "todo.txt")
+        os.symlink(self.file_path, link)
+        on_change = AsyncMock()
+        file_watcher = TodoTxtFileWatcher(self.hass, link, on_change)
+        with patch.object(watcher, "async_call_later") as call_later, \
+                patch.object(watcher, "async_track_time_interval") as track:
+            file_watcher.async_start()
+            with open(self.file_path, "a") as f:
+                f.write("Task B\n")
+            file_watcher._handle_inotify()
+            file_watcher.async_stop()
+
+        call_later.assert_called_once()
+        # Mounts that never deliver inotify events are still checked now and then
+        track.assert_called_once()
+        self.assertEqual(track.call_args[0][2].total_seconds(), watcher.SAFETY_SCAN_INTERVAL)
+
+    def test_polling_fallback(self):
+        """Without inotify, only a changed (mtime, size, inode) triggers a reload."""
+        on_change = AsyncMock()
+        file_watcher = TodoTxtFileWatcher(self.hass, self.file_path, on_change)
+        with patch.object(watcher, "Inotify", side_effect=OSError("no inotify")), \
+                patch.object(watcher, "async_track_time_interval") as track:
+            file_watcher.async_start()
+        self.assertFalse(file_watcher.uses_inotify)
+        track.assert_called_once()
+
+        asyncio.run(file_watcher._async_poll())
+        on_change.assert_not_awaited()
+
+        with open(self.file_path, "a") as f:
+            f.write("Task B\n")
+        asyncio.run(file_watcher._async_poll())
+        on_change.assert_awaited_once()
+
+
+if __name__ == '__main__':
+    unittest.main()